@@ -0,0 +1,75 @@
+"""
+Benchmark for columnar prompt rendering.
+Compares PromptBatch.render() with building and rendering one prompt per row.
+
+Run from the repository root:
+
+    python benchmarks/prompt_batch.py [--rows 1000000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from prompt_generator.models.prompt import PersonaPrompt  # noqa: E402
+from prompt_generator.models.prompt_batch import PromptBatch, np  # noqa: E402
+
+
+def make_columns(fields, rows):
+    """Build a column of distinct values for each field."""
+    return {field: [f"{field} {i}" for i in range(rows)] for field in fields}
+
+
+def per_object(prompt_class, columns, rows):
+    """Render rows the usual way: one prompt object per row."""
+    names = list(columns)
+    texts = []
+    for i in range(rows):
+        prompt = prompt_class()
+        for name in names:
+            setattr(prompt, name, columns[name][i])
+        texts.append(prompt.generate_text())
+    return texts
+
+
+def timed(func):
+    """Run a function once and get its result and duration in seconds."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark columnar prompt rendering.")
+    parser.add_argument("--rows", type=int, default=1000000, help="Number of rows to render")
+    args = parser.parse_args()
+
+    prompt_class = PersonaPrompt
+    fields = [field for field in prompt_class.field_names
+              if field not in ("type", "created_at", "updated_at")]
+    columns = make_columns(fields, args.rows)
+
+    expected, object_time = timed(lambda: per_object(prompt_class, columns, args.rows))
+    print(f"per-object loop      {object_time:8.2f} s")
+
+    batch = PromptBatch(prompt_class, columns)
+    texts, batch_time = timed(batch.render)
+    assert texts == expected
+    print(f"PromptBatch.render   {batch_time:8.2f} s  ({object_time / batch_time:.1f}x)")
+
+    if np is not None:
+        array_batch = PromptBatch(prompt_class, {
+            field: np.array(column, dtype=str) for field, column in columns.items()
+        })
+        array, array_time = timed(array_batch.render_array)
+        assert array.tolist() == expected
+        print(f"PromptBatch.render_array {array_time:4.2f} s  ({object_time / array_time:.1f}x)")
+    else:
+        print("NumPy not installed; skipping render_array")
+
+
+if __name__ == "__main__":
+    main()
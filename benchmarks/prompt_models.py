@@ -0,0 +1,156 @@
+"""
+Benchmark for the prompt models.
+Measures to_dict/from_dict speed and per-instance memory of loaded prompts,
+next to the hand-written classes the field schema replaced.
+
+Run from the repository root of a git checkout:
+
+    python benchmarks/prompt_models.py [--count 100000] [--baseline REV]
+
+The baseline classes are read from prompt.py as of REV, by default the
+revision before the field schema was introduced.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from prompt_generator.models.prompt import (  # noqa: E402
+    ChainOfThoughtPrompt,
+    TreeOfThoughtsPrompt,
+    ActivePrompt,
+    PersonaPrompt
+)
+
+
+PROMPT_CLASSES = (ChainOfThoughtPrompt, TreeOfThoughtsPrompt, ActivePrompt, PersonaPrompt)
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PROMPT_MODULE = "src/prompt_generator/models/prompt.py"
+
+
+def git(*args):
+    """Run a git command in the repository and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=ROOT_DIR, stdout=subprocess.PIPE,
+        check=True, universal_newlines=True
+    ).stdout
+
+
+def load_baseline(revision=None):
+    """Load the prompt module as of a git revision.
+
+    Args:
+        revision: Git revision, or None for the one before PromptSchema
+
+    Returns:
+        The module, or None if it cannot be read from git
+    """
+    try:
+        if revision is None:
+            introduced = git("log", "--reverse", "--format=%H", "-S", "PromptSchema",
+                             "--", PROMPT_MODULE).split()
+            revision = f"{introduced[0]}^" if introduced else "HEAD"
+        source = git("show", f"{revision}:{PROMPT_MODULE}")
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error loading baseline prompt models: {e}", file=sys.stderr)
+        return None
+
+    module = types.ModuleType("baseline_prompt")
+    exec(compile(source, f"{revision}:{PROMPT_MODULE}", "exec"), module.__dict__)
+    return module
+
+
+def sample_prompt(cls, index):
+    """Build a prompt with every field filled in."""
+    prompt = cls(f"Prompt {index}")
+    for name, value in prompt.to_dict().items():
+        if value == "":
+            setattr(prompt, name, f"{name} {index}")
+    return prompt
+
+
+def time_per_call(func, number):
+    """Get the best time for one call of a function, in microseconds."""
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def measure_memory(cls, count):
+    """Get the bytes allocated per prompt when loading count prompts."""
+    data = [sample_prompt(cls, i).to_dict() for i in range(count)]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    prompts = [cls.from_dict(item) for item in data]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Field strings are shared with the source dicts, so this is the cost
+    # of the prompt objects themselves plus their parsed timestamps
+    return (after - before) / len(prompts)
+
+
+def measure(cls, number, count):
+    """Get to_dict, loaded to_dict, create-and-save and from_dict times
+    and bytes per prompt."""
+    prompt = sample_prompt(cls, 0)
+    data = prompt.to_dict()
+    loaded = cls.from_dict(data)
+
+    to_dict = time_per_call(prompt.to_dict, number)
+    # Saving a prompt that was loaded and never had its timestamps read
+    loaded_to_dict = time_per_call(loaded.to_dict, number)
+    # A new prompt serialized once, so work moved into __init__ counts too
+    create_to_dict = time_per_call(lambda: cls("New").to_dict(), number)
+    from_dict = time_per_call(lambda: cls.from_dict(data), number)
+    memory = measure_memory(cls, count)
+    return to_dict, loaded_to_dict, create_to_dict, from_dict, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the prompt models.")
+    parser.add_argument("--count", type=int, default=100000,
+                        help="Number of prompts loaded for the memory measurement")
+    parser.add_argument("--number", type=int, default=20000,
+                        help="Calls per timing run")
+    parser.add_argument("--baseline", metavar="REV",
+                        help="git revision of the baseline prompt models "
+                             "(default: the one before the field schema)")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    columns = ("to_dict us", "loaded us", "new+save us", "from_dict us", "bytes/prompt")
+
+    header = f"{'model':<24}" + "".join(f"{column:>14}" for column in columns)
+    if baseline is not None:
+        # Speedup for the timings, reduction factor for the memory
+        header += "".join(f"{column:>12}" for column in ("x to_dict", "x loaded", "x new+save", "x from_dict", "x bytes"))
+    print(header)
+
+    for cls in PROMPT_CLASSES:
+        results = measure(cls, args.number, args.count)
+        row = f"{cls.__name__:<24}" + "".join(
+            f"{value:>14.2f}" if index < 4 else f"{value:>14.0f}"
+            for index, value in enumerate(results)
+        )
+        if baseline is not None:
+            base_results = measure(getattr(baseline, cls.__name__), args.number, args.count)
+            row += "".join(f"{base / value:>12.2f}" for base, value in zip(base_results, results))
+        print(row)
+
+        if baseline is not None:
+            print(f"{'  baseline':<24}" + "".join(
+                f"{value:>14.2f}" if index < 4 else f"{value:>14.0f}"
+                for index, value in enumerate(base_results)
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,11 @@ setup(
     entry_points={
         "console_scripts": [
             "prompt_generator=prompt_generator:run_application",
+            "prompt-generator=prompt_generator.cli:main",
         ],
     },
     author="Prompt Generator Team",
     description="Advanced Prompt Generator for L&D Professionals",
     keywords="prompt, generator, education, learning, development",
-    python_requires=">=3.6",
+    python_requires=">=3.7",
 )
@@ -1,10 +1,19 @@
 """
 Advanced Prompt Generator for L&D Professionals
 A tool for creating effective prompts for AI-assisted content creation.
+
+The GUI is only imported when run_application is first accessed, so the
+models and the command-line tools can be used without loading PyQt5.
 """
 
+from . import _lazy
+
 __version__ = "1.0.0"
 
-from .app import run_application
+# Public name -> module that defines it
+_lazy_imports = {
+    "run_application": "app"
+}
 
-__all__ = ["run_application"]
+__all__ = list(_lazy_imports)
+__getattr__, __dir__ = _lazy.attach(__name__, _lazy_imports)
@@ -0,0 +1,35 @@
+"""
+Lazy imports for the Prompt Generator package __init__ modules.
+"""
+
+import sys
+from importlib import import_module
+
+
+def attach(package, lazy_imports):
+    """Create the module __getattr__ and __dir__ of a package (PEP 562).
+
+    Names are imported from their modules on first access and then cached
+    in the package, so later lookups do not come back to __getattr__.
+
+    Args:
+        package: Name of the package, i.e. its __name__
+        lazy_imports: Mapping of public name to the submodule defining it
+
+    Returns:
+        (__getattr__, __dir__) tuple to assign in the package
+    """
+    namespace = vars(sys.modules[package])
+
+    def __getattr__(name):
+        module = lazy_imports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(f".{module}", package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(namespace) | set(lazy_imports))
+
+    return __getattr__, __dir__
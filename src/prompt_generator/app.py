@@ -20,7 +20,7 @@ from .models import (
     ChainOfThoughtPrompt, TreeOfThoughtsPrompt,
     ActivePrompt, PersonaPrompt
 )
-from .utils.settings import Settings
+from .utils.settings import get_settings
 
 
 class PromptGeneratorApp(QMainWindow):
@@ -28,7 +28,7 @@ class PromptGeneratorApp(QMainWindow):
     
     def __init__(self):
         super().__init__()
-        self.settings = Settings()
+        self.settings = get_settings()
         self.setWindowTitle("Advanced Prompt Generator for L&D Professionals")
         self.setMinimumSize(*self.settings.get("window_size"))
         
@@ -110,7 +110,7 @@ class PromptGeneratorApp(QMainWindow):
     
     def update_preview(self, prompt):
         """Update the preview area with generated prompt text."""
-        self.content.update_preview(prompt.generate_text())
+        self.content.update_preview(prompt)
     
     def save_prompt(self):
         """Save the current prompt."""
@@ -0,0 +1,264 @@
+"""
+Command-line interface for the Prompt Generator application.
+Generates, lists, searches, exports and imports prompts without the GUI,
+and renders prompts in bulk from CSV or JSONL files.
+
+Nothing here imports PyQt5: settings are kept in a JSON file next to the
+prompt library. Only the prompt models are imported up front; the library,
+storage and export modules are imported by the subcommands that need them,
+so that each invocation starts quickly.
+"""
+
+import argparse
+import os
+import sys
+
+from .models.prompt import PROMPT_TYPES
+
+
+def default_base_dir():
+    """Get the default prompt library directory."""
+    return os.path.join(os.path.expanduser("~"), "PromptGenerator")
+
+
+def parse_assignments(pairs):
+    """Parse FIELD=VALUE command-line pairs into a dictionary."""
+    values = {}
+    for pair in pairs:
+        field, sep, value = pair.partition("=")
+        if not sep or not field:
+            raise ValueError(f"expected FIELD=VALUE, got {pair!r}")
+        values[field] = value
+    return values
+
+
+def prompt_filename(name):
+    """Get the storage filename for a prompt name given on the command line."""
+    if not name.endswith(".json"):
+        name = f"{name.replace(' ', '_')}.json"
+    return name
+
+
+class CommandLine:
+    """Runs one command-line invocation against a prompt library."""
+
+    def __init__(self, args):
+        """Initialize the command line.
+
+        Args:
+            args: Parsed command-line arguments
+        """
+        self.args = args
+        self.base_dir = args.base_dir or default_base_dir()
+        self._prompt_manager = None
+        self._settings = None
+
+    @property
+    def prompt_manager(self):
+        """Get the prompt manager, opening the library on first use."""
+        if self._prompt_manager is None:
+            from .models.prompt_manager import PromptManager
+
+            self._prompt_manager = PromptManager(self.base_dir, storage=self.args.storage)
+        return self._prompt_manager
+
+    @property
+    def settings(self):
+        """Get the settings, kept in a JSON file beside the library."""
+        if self._settings is None:
+            from .utils.settings import JSONSettingsStore, init_settings
+
+            path = self.args.settings or os.path.join(self.base_dir, "settings.json")
+            self._settings = init_settings(JSONSettingsStore(path))
+        return self._settings
+
+    def close(self):
+        """Write pending settings and close the library."""
+        if self._settings is not None:
+            self._settings.flush()
+        if self._prompt_manager is not None:
+            self._prompt_manager.close()
+
+    def load(self, name, from_template=False):
+        """Load a saved prompt by name, reporting it if it is missing."""
+        prompt = self.prompt_manager.load_prompt(prompt_filename(name), from_template)
+        if prompt is None:
+            kind = "template" if from_template else "prompt"
+            raise LookupError(f"no saved {kind} named {name!r}")
+        return prompt
+
+    @staticmethod
+    def print_entries(entries):
+        """Print listing entries, one per line."""
+        for entry in entries:
+            print(f"{entry.get('filename', '')}\t{entry.get('type', '')}\t{entry.get('title', '')}")
+
+    def generate(self):
+        """Print the text of a new or saved prompt."""
+        args = self.args
+        values = parse_assignments(args.set)
+
+        if args.load:
+            prompt = self.load(args.load, args.template)
+        else:
+            if args.type is None:
+                raise ValueError("give a prompt type or --load NAME")
+            prompt = PROMPT_TYPES[args.type](args.title or "")
+
+        for field, value in values.items():
+            if field not in prompt.field_names or field in ("type", "created_at", "updated_at"):
+                raise ValueError(f"{type(prompt).__name__} has no field {field!r}")
+            setattr(prompt, field, value)
+        if args.title:
+            prompt.title = args.title
+
+        print(prompt.generate_text())
+
+        if args.save:
+            location = self.prompt_manager.save_prompt(prompt)
+            if not location:
+                raise OSError("the prompt could not be saved")
+            print(f"Saved to {location}", file=sys.stderr)
+        return 0
+
+    def list_(self):
+        """Print the saved prompts or templates."""
+        import itertools
+
+        args = self.args
+        if args.templates:
+            entries = self.prompt_manager.iter_templates(args.type, args.sort or "title", args.reverse)
+        else:
+            entries = self.prompt_manager.iter_prompts(
+                args.type, args.sort or "updated_at", not args.reverse
+            )
+        if args.limit is not None:
+            entries = itertools.islice(entries, args.limit)
+
+        self.print_entries(entries)
+        return 0
+
+    def search(self):
+        """Print the saved prompts matching a query."""
+        args = self.args
+        results = self.prompt_manager.search(args.query, args.type, limit=args.limit)
+        self.print_entries(results)
+        return 0 if results else 1
+
+    def export(self):
+        """Export a saved prompt as text, Markdown, HTML or JSON."""
+        from .utils.export_renderers import RENDERERS
+
+        args = self.args
+        format_type = args.format or self.settings.get("default_export_format")
+        if format_type not in RENDERERS:
+            raise ValueError(f"export format must be one of {', '.join(RENDERERS)}")
+
+        prompt = self.load(args.name, args.template)
+        renderer = RENDERERS[format_type]
+        if args.output is None or args.output == "-":
+            renderer.write(prompt, sys.stdout)
+        else:
+            renderer.write_file(prompt, args.output)
+            print(f"Exported to {args.output}", file=sys.stderr)
+        return 0
+
+    def import_(self):
+        """Import a directory or zip archive of JSON prompts."""
+        args = self.args
+        report = self.prompt_manager.import_prompts(
+            args.source, as_template=args.templates,
+            on_conflict=args.on_conflict, workers=args.workers
+        )
+        for name, error in report.errors:
+            print(f"{name}: {error}", file=sys.stderr)
+        print(report.summary())
+        return 1 if report.errors else 0
+
+    def batch(self):
+        """Generate one prompt per row of a CSV or JSONL file."""
+        from .models.batch_generate import run_command
+
+        return run_command(self.args)
+
+
+def build_parser():
+    """Build the argument parser for the command line."""
+    # Light to import: it only loads multiprocessing when rendering in parallel
+    from .models import batch_generate
+
+    prompt_types = sorted(PROMPT_TYPES)
+
+    parser = argparse.ArgumentParser(
+        prog="prompt-generator",
+        description="Generate and manage prompts from the command line."
+    )
+    parser.add_argument("--base-dir", help="prompt library directory (default: ~/PromptGenerator)")
+    parser.add_argument("--storage", choices=("json", "sqlite"), default="json",
+                        help="storage backend of the library")
+    parser.add_argument("--settings", help="settings file (default: settings.json in the library)")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    commands.required = True
+
+    generate = commands.add_parser("generate", help="print the text of a prompt")
+    generate.add_argument("type", nargs="?", choices=prompt_types, help="type of a new prompt")
+    generate.add_argument("--load", metavar="NAME", help="start from a saved prompt")
+    generate.add_argument("--template", action="store_true", help="load a template instead")
+    generate.add_argument("--title", help="prompt title")
+    generate.add_argument("--set", action="append", default=[], metavar="FIELD=VALUE",
+                          help="set a prompt field; may be repeated")
+    generate.add_argument("--save", action="store_true", help="save the prompt to the library")
+    generate.set_defaults(handler=CommandLine.generate)
+
+    list_ = commands.add_parser("list", help="list saved prompts")
+    list_.add_argument("--templates", action="store_true", help="list templates instead")
+    list_.add_argument("--type", choices=prompt_types, help="only list this prompt type")
+    list_.add_argument("--sort", help="field to sort by (default: updated_at, or title for templates)")
+    list_.add_argument("--reverse", action="store_true", help="reverse the default order")
+    list_.add_argument("--limit", type=int, help="maximum number of entries")
+    list_.set_defaults(handler=CommandLine.list_)
+
+    search = commands.add_parser("search", help="search saved prompts")
+    search.add_argument("query", help="query, e.g. 'topic:python OR audience:managers'")
+    search.add_argument("--type", choices=prompt_types, help="only return this prompt type")
+    search.add_argument("--limit", type=int, help="maximum number of results")
+    search.set_defaults(handler=CommandLine.search)
+
+    export = commands.add_parser("export", help="export a saved prompt")
+    export.add_argument("name", help="saved prompt name or filename")
+    export.add_argument("--template", action="store_true", help="export a template instead")
+    export.add_argument("--format", choices=("txt", "md", "html", "json"),
+                        help="export format (default: from the settings)")
+    export.add_argument("-o", "--output", help="output file (default: standard output)")
+    export.set_defaults(handler=CommandLine.export)
+
+    import_ = commands.add_parser("import", help="import a directory or zip archive of prompts")
+    import_.add_argument("source", help="directory or zip archive to import")
+    import_.add_argument("--templates", action="store_true", help="import as templates")
+    import_.add_argument("--on-conflict", choices=("rename", "skip", "overwrite"), default="rename",
+                         help="what to do when a title is already taken")
+    import_.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    import_.set_defaults(handler=CommandLine.import_)
+
+    batch = commands.add_parser("batch", help="generate one prompt per row of a CSV or JSONL file")
+    batch_generate.add_arguments(batch)
+    batch.set_defaults(handler=CommandLine.batch)
+
+    return parser
+
+
+def main(argv=None):
+    """Command-line entry point."""
+    args = build_parser().parse_args(argv)
+    command_line = CommandLine(args)
+    try:
+        return args.handler(command_line)
+    except (LookupError, OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        command_line.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
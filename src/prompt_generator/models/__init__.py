@@ -1,21 +1,24 @@
 """
 Model classes for the Prompt Generator application.
+
+Classes are imported from their modules on first access, so importing one
+model module does not load the storage backends and everything else.
 """
 
-from .prompt import (
-    BasePrompt,
-    ChainOfThoughtPrompt,
-    TreeOfThoughtsPrompt,
-    ActivePrompt,
-    PersonaPrompt
-)
-from .prompt_manager import PromptManager
+from .. import _lazy
+
+# Public name -> module that defines it
+_lazy_imports = {
+    'BasePrompt': 'prompt',
+    'ChainOfThoughtPrompt': 'prompt',
+    'TreeOfThoughtsPrompt': 'prompt',
+    'ActivePrompt': 'prompt',
+    'PersonaPrompt': 'prompt',
+    'PromptManager': 'prompt_manager',
+    'StorageBackend': 'storage',
+    'JSONFileStorage': 'storage',
+    'SQLiteStorage': 'storage'
+}
 
-__all__ = [
-    'BasePrompt',
-    'ChainOfThoughtPrompt',
-    'TreeOfThoughtsPrompt',
-    'ActivePrompt',
-    'PersonaPrompt',
-    'PromptManager'
-]
+__all__ = list(_lazy_imports)
+__getattr__, __dir__ = _lazy.attach(__name__, _lazy_imports)
@@ -0,0 +1,355 @@
+"""
+Library archives for the Prompt Generator application.
+Streams a whole prompt library into a zip or tar archive and reads it back.
+"""
+
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from typing import Dict, Any, Optional, Iterator, Tuple
+
+from .storage import StorageBackend, PROMPTS, TEMPLATES, COLLECTIONS
+
+
+MANIFEST_NAME = "manifest.jsonl"
+ARCHIVE_FORMAT = "prompt_generator_library"
+ARCHIVE_VERSION = 1
+HISTORY = "history"
+
+# Archive formats keyed by file extension
+FORMATS = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz"
+}
+
+
+def archive_format(path: str) -> str:
+    """Get the archive format implied by a file name."""
+    lower = path.lower()
+    for extension, fmt in FORMATS.items():
+        if lower.endswith(extension):
+            return fmt
+    raise ValueError(f"Unsupported archive type: {path}")
+
+
+class _ZipWriter:
+    """Writes archive members into a zip file one at a time."""
+
+    def __init__(self, path: str):
+        self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+
+    def add(self, name: str, payload: bytes) -> None:
+        self.archive.writestr(name, payload)
+
+    def add_file(self, name: str, fileobj) -> None:
+        with self.archive.open(name, 'w', force_zip64=True) as dst:
+            shutil.copyfileobj(fileobj, dst)
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+class _TarWriter:
+    """Writes archive members into a (possibly gzipped) tar file."""
+
+    def __init__(self, path: str, fmt: str):
+        self.archive = tarfile.open(path, "w:gz" if fmt == "tar.gz" else "w")
+        self.mtime = time.time()
+
+    def _info(self, name: str, size: int) -> tarfile.TarInfo:
+        info = tarfile.TarInfo(name)
+        info.size = size
+        info.mtime = self.mtime
+        return info
+
+    def add(self, name: str, payload: bytes) -> None:
+        self.archive.addfile(self._info(name, len(payload)), io.BytesIO(payload))
+        # tarfile remembers every member it writes; nothing reads them back
+        self.archive.members = []
+
+    def add_file(self, name: str, fileobj) -> None:
+        fileobj.seek(0, io.SEEK_END)
+        size = fileobj.tell()
+        fileobj.seek(0)
+        self.archive.addfile(self._info(name, size), fileobj)
+        self.archive.members = []
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def export_archive(storage: StorageBackend, path: str) -> Dict[str, int]:
+    """Write every prompt, template and history entry into an archive.
+
+    Entries are read from storage and written one at a time, and the
+    manifest describing them is spooled to a temporary file and appended
+    last, so memory use does not grow with the size of the library.
+
+    Args:
+        storage: Storage backend to export
+        path: Archive path; .zip, .tar, .tar.gz or .tgz
+
+    Returns:
+        Number of entries written per collection
+    """
+    fmt = archive_format(path)
+    writer = _ZipWriter(path) if fmt == "zip" else _TarWriter(path, fmt)
+    counts = {PROMPTS: 0, TEMPLATES: 0, HISTORY: 0}
+
+    with tempfile.TemporaryFile() as manifest:
+        def add(collection, name, data, extra=None):
+            writer.add(name, json.dumps(data, indent=4).encode("utf-8"))
+            record = {
+                "collection": collection,
+                "name": name,
+                "title": data.get("title", ""),
+                "type": data.get("type", ""),
+                "updated_at": data.get("updated_at", "")
+            }
+            if extra:
+                record.update(extra)
+            manifest.write(json.dumps(record).encode("utf-8") + b"\n")
+            counts[collection] += 1
+
+        try:
+            for collection in COLLECTIONS:
+                for filename, data in storage.iter_items(collection):
+                    add(collection, f"{collection}/{filename}", data,
+                        {"filename": filename})
+
+            # History is written oldest first so a restore replays it in order
+            for number, (filename, data) in enumerate(storage.iter_history(), 1):
+                add(HISTORY, f"{HISTORY}/{number:06d}_{filename}", data,
+                    {"filename": filename})
+
+            header = {
+                "format": ARCHIVE_FORMAT,
+                "version": ARCHIVE_VERSION,
+                "counts": counts
+            }
+            manifest.write(json.dumps(header).encode("utf-8") + b"\n")
+            manifest.seek(0)
+            writer.add_file(MANIFEST_NAME, manifest)
+        finally:
+            writer.close()
+
+    return counts
+
+
+class ArchiveReader:
+    """Reads entries from a library archive without extracting it.
+
+    The manifest is streamed line by line and each entry is decompressed
+    only when it is read. A tar archive is walked front to back as a
+    stream on every pass, so a compressed tar is decompressed once per
+    pass and memory use does not grow with the number of members.
+    """
+
+    def __init__(self, path: str):
+        """Open an archive written by export_archive."""
+        self.path = path
+        self.format = "zip" if zipfile.is_zipfile(path) else "tar"
+        self.archive = zipfile.ZipFile(path) if self.format == "zip" else None
+
+    def _members(self) -> Iterator[Tuple[tarfile.TarFile, tarfile.TarInfo]]:
+        """Yield (tar file, member) pairs of a tar archive in archive order.
+
+        A member can only be read until the next one is yielded.
+        """
+        with tarfile.open(self.path, "r|*") as archive:
+            while True:
+                member = archive.next()
+                if member is None:
+                    return
+                yield archive, member
+                # tarfile remembers every member it reads; nothing looks them up
+                archive.members = []
+
+    def _manifest(self) -> Iterator[Dict[str, Any]]:
+        """Yield the manifest records, including the trailing header."""
+        if self.format == "zip":
+            with self.archive.open(MANIFEST_NAME) as f:
+                for line in f:
+                    yield json.loads(line)
+            return
+
+        for archive, member in self._members():
+            if member.name == MANIFEST_NAME:
+                with archive.extractfile(member) as f:
+                    for line in f:
+                        yield json.loads(line)
+                return
+        raise KeyError(MANIFEST_NAME)
+
+    def header(self) -> Dict[str, Any]:
+        """Get the archive header with its format, version and counts."""
+        header = {}
+        try:
+            for record in self._manifest():
+                if "format" in record:
+                    header = record
+        except (KeyError, tarfile.TarError, ValueError):
+            header = {}
+        if header.get("format") != ARCHIVE_FORMAT:
+            raise ValueError(f"{self.path} is not a prompt library archive")
+        return header
+
+    def entries(self, collection: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the manifest records of the archived entries.
+
+        Args:
+            collection: Only yield entries of "prompts", "templates" or "history"
+        """
+        for record in self._manifest():
+            if "format" in record:
+                continue
+            if collection is None or record["collection"] == collection:
+                yield record
+
+    def read(self, name: str) -> Dict[str, Any]:
+        """Read the data of a single archived entry."""
+        if self.format == "zip":
+            with self.archive.open(name) as f:
+                return json.load(f)
+
+        for archive, member in self._members():
+            if member.name == name:
+                with archive.extractfile(member) as f:
+                    return json.load(f)
+        raise KeyError(name)
+
+    def iter_items(self, collection: Optional[str] = None) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Yield (entry record, data) pairs in archive order.
+
+        Entries come in the order export_archive writes them: prompts,
+        then templates, then history from oldest to newest.
+
+        Args:
+            collection: Only yield entries of "prompts", "templates" or "history"
+        """
+        if self.format == "zip":
+            for record in self.entries(collection):
+                yield record, self.read(record["name"])
+            return
+
+        # A compressed tar can only be read forwards cheaply, so walk the
+        # members in order instead of jumping back and forth to the manifest
+        for archive, member in self._members():
+            member_collection, _, filename = member.name.partition("/")
+            if not member.isfile() or not filename:
+                continue
+            if member_collection not in (PROMPTS, TEMPLATES, HISTORY):
+                continue
+            if collection is not None and member_collection != collection:
+                continue
+
+            if member_collection == HISTORY:
+                filename = filename.split("_", 1)[-1]
+            with archive.extractfile(member) as f:
+                data = json.load(f)
+            record = {"collection": member_collection, "name": member.name, "filename": filename}
+            yield record, data
+
+    def close(self) -> None:
+        """Close the archive."""
+        if self.archive is not None:
+            self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def safe_filename(filename: Any) -> bool:
+    """Check that an archived filename stays inside its library directory.
+
+    The name comes from the archive, so anything with a directory part,
+    a leading dot or a parent reference is refused.
+    """
+    return (
+        isinstance(filename, str) and bool(filename)
+        and os.path.basename(filename) == filename
+        and not filename.startswith(".")
+        and ".." not in filename
+    )
+
+
+def restore_archive(prompt_manager, path: str, overwrite: bool = False,
+                    include_history: bool = True, batch_size: int = 200) -> Dict[str, int]:
+    """Restore a library archive into a prompt library.
+
+    The archive is read in a single pass after its header is checked.
+    Entries whose filename would leave the library directory are not
+    written; they are reported and counted under "errors".
+
+    Args:
+        prompt_manager: PromptManager owning the target library
+        path: Archive written by export_archive
+        overwrite: Replace prompts that already exist instead of keeping them
+        include_history: Replay the archived history as well
+        batch_size: Number of prompts written to storage at a time
+
+    Returns:
+        Number of entries restored per collection, and of entries rejected
+    """
+    storage = prompt_manager.storage
+    counts = {PROMPTS: 0, TEMPLATES: 0, HISTORY: 0, "errors": 0}
+
+    batch = []
+    batch_collection = None
+
+    def flush():
+        if batch:
+            prompt_manager.save_many(batch, as_template=batch_collection == TEMPLATES)
+            counts[batch_collection] += len(batch)
+            batch.clear()
+
+    with ArchiveReader(path) as reader:
+        reader.header()
+
+        existing = {collection: set() for collection in COLLECTIONS}
+        if not overwrite:
+            for collection in COLLECTIONS:
+                existing[collection] = {entry["filename"] for entry in storage.iter_entries(collection)}
+
+        for record, data in reader.iter_items():
+            collection = record["collection"]
+            filename = record.get("filename")
+            if collection != batch_collection:
+                flush()
+                batch_collection = collection
+            # History is archived last, after every prompt and template
+            if collection == HISTORY and not include_history:
+                break
+
+            if not safe_filename(filename):
+                print(f"Error restoring {record['name']}: unsafe filename {filename!r}")
+                counts["errors"] += 1
+                continue
+
+            if collection == HISTORY:
+                if storage.add_history(filename, data):
+                    counts[HISTORY] += 1
+                continue
+
+            if filename in existing[collection]:
+                continue
+            batch.append((filename, data))
+            if len(batch) >= batch_size:
+                flush()
+
+        flush()
+
+    if include_history:
+        storage.prune_history(prompt_manager.max_history_entries)
+
+    return counts
@@ -0,0 +1,354 @@
+"""
+Batch generation for the Prompt Generator application.
+Renders one prompt per row of a CSV or JSONL file, mail-merge style.
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+from collections import deque
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Tuple, Type, TextIO
+
+from .prompt import BasePrompt, PROMPT_TYPES, TIMESTAMP_FIELDS
+
+
+# Supported input formats
+INPUT_FORMATS = ("csv", "jsonl")
+
+# Output formats: prompt texts between separators, or one JSON object per line
+OUTPUT_FORMATS = ("text", "jsonl")
+
+# Written between prompts in text output
+DEFAULT_SEPARATOR = "\n\n---\n\n"
+
+# Buffer size for the output file
+WRITE_BUFFER_SIZE = 64 * 1024
+
+
+def detect_format(path: str) -> str:
+    """Guess the input format of a file from its extension."""
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson"):
+        return "jsonl"
+    return "csv"
+
+
+def iter_rows(f: TextIO, input_format: str) -> Iterator[Tuple[int, Any]]:
+    """Stream the rows of an open CSV or JSONL file.
+
+    Args:
+        f: Text file to read
+        input_format: "csv" or "jsonl"
+
+    Yields:
+        (row number, row) tuples; for JSONL the row is the unparsed line,
+        so malformed lines are reported by the renderer instead of ending
+        the run
+    """
+    if input_format == "csv":
+        # The header is line 1, so data rows start at 2
+        for number, row in enumerate(csv.DictReader(f), start=2):
+            yield number, row
+    elif input_format == "jsonl":
+        for number, line in enumerate(f, start=1):
+            if line.strip():
+                yield number, line
+    else:
+        raise ValueError(f"input format must be one of {', '.join(INPUT_FORMATS)}")
+
+
+def render_rows(prompt_class: Type[BasePrompt], columns: List[Tuple[str, str]],
+                rows: List[Tuple[int, Any]]) -> List[Tuple[int, Optional[str], Optional[str], Optional[str]]]:
+    """Render a chunk of rows as prompts.
+
+    This runs in a worker process, so it only receives picklable arguments.
+
+    Args:
+        prompt_class: Prompt class to render
+        columns: (column, field) pairs to copy from each row
+        rows: (row number, row) tuples from iter_rows
+
+    Returns:
+        List of (row number, title, text, error) tuples; text is None if
+        the row failed
+    """
+    results = []
+    for number, row in rows:
+        try:
+            if isinstance(row, str):
+                row = json.loads(row)
+                if not isinstance(row, dict):
+                    raise ValueError("not a JSON object")
+
+            # Rows have no type column; every row is of the generator's type
+            data = {"type": prompt_class.prompt_type}
+            for column, field in columns:
+                value = row.get(column)
+                if value is not None:
+                    data[field] = value
+
+            prompt = prompt_class.from_dict(data)
+            results.append((number, prompt.title, prompt.generate_text(), None))
+        except Exception as e:
+            results.append((number, None, None, str(e)))
+    return results
+
+
+class BatchReport:
+    """Outcome of a batch generation run."""
+
+    def __init__(self):
+        self.generated = 0
+        self.errors = []        # (row number, error message)
+
+    def summary(self) -> str:
+        """Get a one-line description of the outcome."""
+        return f"{self.generated} prompts generated, {len(self.errors)} rows failed"
+
+
+class BatchGenerator:
+    """Generates one prompt per input row.
+
+    Each row's columns are mapped onto the fields of a single prompt type,
+    and the prompt's text is rendered with generate_text(). Rows are read,
+    rendered and written a chunk at a time, so memory use does not depend
+    on the size of the input. With more than one worker, chunks are
+    rendered across a process pool; only a few chunks are in flight at a
+    time and results are written in input order.
+
+    Only the model classes are used, so no Qt application is needed.
+    """
+
+    # Rows handed to a worker at a time
+    chunk_size = 1000
+
+    # Chunks in flight per worker process
+    pending_per_worker = 2
+
+    def __init__(self, prompt_type: str, mapping: Optional[Dict[str, str]] = None,
+                 workers: Optional[int] = 1):
+        """Initialize the generator.
+
+        Args:
+            prompt_type: Prompt type from PROMPT_TYPES
+            mapping: Mapping of column name to prompt field; columns named
+                after a field are used for it unless mapped elsewhere
+            workers: Number of worker processes, None for one per CPU
+                or 1 to render in this process
+        """
+        if prompt_type not in PROMPT_TYPES:
+            raise ValueError(f"prompt type must be one of {', '.join(PROMPT_TYPES)}")
+
+        self.prompt_class = PROMPT_TYPES[prompt_type]
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.columns = self._map_columns(mapping or {})
+
+    def _map_columns(self, mapping: Dict[str, str]) -> List[Tuple[str, str]]:
+        """Work out which column fills each prompt field."""
+        fields = self.fields
+        for column, field in mapping.items():
+            if field not in fields:
+                raise ValueError(
+                    f"cannot map column {column!r} to {field!r}; "
+                    f"fields are {', '.join(fields)}"
+                )
+
+        mapped = set(mapping.values())
+        columns = list(mapping.items())
+        columns.extend(
+            (field, field) for field in fields
+            if field not in mapped and field not in mapping
+        )
+        return columns
+
+    @property
+    def fields(self) -> List[str]:
+        """Get the prompt fields that rows can fill."""
+        return [
+            field for field in self.prompt_class.field_names
+            if field != "type" and field not in TIMESTAMP_FIELDS
+        ]
+
+    def _chunks(self, rows: Iterable[Tuple[int, Any]]) -> Iterator[List[Tuple[int, Any]]]:
+        """Split rows into chunks without reading ahead."""
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def generate(self, rows: Iterable[Tuple[int, Any]]) -> Iterator[Tuple[int, Optional[str], Optional[str], Optional[str]]]:
+        """Render rows in input order.
+
+        Args:
+            rows: (row number, row) tuples, as yielded by iter_rows; a row
+                may also be a dictionary of column values
+
+        Yields:
+            (row number, title, text, error) tuples, as from render_rows
+        """
+        chunks = self._chunks(rows)
+
+        if self.workers == 1:
+            for chunk in chunks:
+                yield from render_rows(self.prompt_class, self.columns, chunk)
+            return
+
+        # Imported here so that the command line does not load
+        # multiprocessing unless it renders in parallel
+        from concurrent.futures import ProcessPoolExecutor
+
+        max_pending = self.workers * self.pending_per_worker
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(render_rows, self.prompt_class, self.columns, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def write(self, rows: Iterable[Tuple[int, Any]], output: TextIO,
+              output_format: str = "text", separator: str = DEFAULT_SEPARATOR) -> BatchReport:
+        """Render rows and write the prompts to an open text file.
+
+        Args:
+            rows: (row number, row) tuples, as yielded by iter_rows
+            output: Text file to write to
+            output_format: "text" for prompt texts between separators, or
+                "jsonl" for one {"row", "title", "text"} object per line
+            separator: Written between prompts in text output
+
+        Returns:
+            Report of the generated prompts and failed rows
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output format must be one of {', '.join(OUTPUT_FORMATS)}")
+
+        report = BatchReport()
+        for number, title, text, error in self.generate(rows):
+            if text is None:
+                report.errors.append((number, error))
+                continue
+
+            if output_format == "jsonl":
+                output.write(json.dumps({"row": number, "title": title, "text": text}))
+                output.write("\n")
+            else:
+                if report.generated:
+                    output.write(separator)
+                output.write(text)
+            report.generated += 1
+
+        if output_format == "text" and report.generated:
+            output.write("\n")
+        return report
+
+    def run(self, source: str, output: Optional[str] = None,
+            input_format: Optional[str] = None, output_format: str = "text",
+            separator: str = DEFAULT_SEPARATOR) -> BatchReport:
+        """Generate prompts from a CSV or JSONL file.
+
+        Args:
+            source: Input file path, or "-" for standard input
+            output: Output file path, or None or "-" for standard output
+            input_format: "csv" or "jsonl", None to detect from the extension
+            output_format: "text" or "jsonl"
+            separator: Written between prompts in text output
+
+        Returns:
+            Report of the generated prompts and failed rows
+        """
+        if input_format is None:
+            input_format = "csv" if source == "-" else detect_format(source)
+
+        if source == "-":
+            infile = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+        else:
+            infile = open(source, 'r', encoding="utf-8", newline="")
+
+        try:
+            if output is None or output == "-":
+                return self.write(iter_rows(infile, input_format), sys.stdout,
+                                  output_format, separator)
+
+            with open(output, 'w', encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as outfile:
+                return self.write(iter_rows(infile, input_format), outfile,
+                                  output_format, separator)
+        finally:
+            if source == "-":
+                # Leave standard input open for the caller
+                infile.detach()
+            else:
+                infile.close()
+
+
+def parse_mapping(pairs: List[str]) -> Dict[str, str]:
+    """Parse COLUMN=FIELD command-line pairs into a mapping."""
+    mapping = {}
+    for pair in pairs:
+        column, sep, field = pair.partition("=")
+        if not sep or not column or not field:
+            raise ValueError(f"expected COLUMN=FIELD, got {pair!r}")
+        mapping[column] = field
+    return mapping
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the batch generation arguments to a parser or subcommand parser."""
+    parser.add_argument("source", help="CSV or JSONL file, or - for standard input")
+    parser.add_argument("--type", required=True, choices=sorted(PROMPT_TYPES),
+                        help="prompt type to generate")
+    parser.add_argument("--map", action="append", default=[], metavar="COLUMN=FIELD",
+                        help="fill a prompt field from a differently named column")
+    parser.add_argument("-o", "--output", help="output file (default: standard output)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS,
+                        help="input format (default: from the file extension)")
+    parser.add_argument("--output-format", choices=OUTPUT_FORMATS, default="text",
+                        help="prompt texts between separators, or JSON lines")
+    parser.add_argument("--separator", default=DEFAULT_SEPARATOR,
+                        help="text written between prompts in text output")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes, 0 for one per CPU")
+
+
+def run_command(args: argparse.Namespace) -> int:
+    """Run batch generation for parsed command-line arguments.
+
+    Returns:
+        Exit code: 0 on success, 1 if some rows failed, 2 on errors
+    """
+    try:
+        generator = BatchGenerator(
+            args.type, parse_mapping(args.map), workers=args.workers or None
+        )
+        report = generator.run(
+            args.source, args.output, input_format=args.input_format,
+            output_format=args.output_format, separator=args.separator
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    for number, error in report.errors:
+        print(f"row {number}: {error}", file=sys.stderr)
+    print(report.summary(), file=sys.stderr)
+    return 1 if report.errors else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for batch generation."""
+    parser = argparse.ArgumentParser(
+        description="Generate one prompt per row of a CSV or JSONL file."
+    )
+    add_arguments(parser)
+    return run_command(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,323 @@
+"""
+Bulk import for the Prompt Generator application.
+Imports a directory or zip archive of JSON prompts into a prompt library.
+"""
+
+import argparse
+import json
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple, Type
+
+from .prompt import BasePrompt
+from .storage import PROMPTS, TEMPLATES
+
+
+# Ways of handling an imported prompt whose title is already taken
+ON_CONFLICT = ("rename", "skip", "overwrite")
+
+# Path separators and other characters that are unsafe in a filename
+_UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+def title_filename(title: str) -> Optional[str]:
+    """Get the storage filename for an imported prompt title.
+
+    Spaces become underscores as in PromptManager.save_prompt. Since the
+    title comes from the imported file, path separators and other unsafe
+    characters are replaced as well and leading dots are dropped, so the
+    file cannot end up outside the library or hidden.
+
+    Returns:
+        The filename, or None if nothing usable is left of the title
+    """
+    name = _UNSAFE_CHARS.sub("_", title.replace(" ", "_")).lstrip(".")
+    if not name.strip("_"):
+        return None
+    return f"{name}.json"
+
+
+def _open_source(source: str, name: str, archive: Optional[zipfile.ZipFile]):
+    """Open a file of the import source for reading."""
+    if archive is not None:
+        return archive.open(name)
+    return open(os.path.join(source, name), 'rb')
+
+
+def parse_files(source: str, names: List[str],
+                prompt_types: Dict[str, Type[BasePrompt]]) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+    """Parse and validate a chunk of prompt files.
+
+    This runs in a worker process, so it only receives picklable arguments
+    and opens the source itself.
+
+    Args:
+        source: Directory or zip archive path
+        names: Paths of the files to parse, relative to the source
+        prompt_types: Mapping of prompt type to prompt class
+
+    Returns:
+        List of (name, data, error) tuples; data is None if the file failed
+    """
+    archive = zipfile.ZipFile(source) if zipfile.is_zipfile(source) else None
+    results = []
+    try:
+        for name in names:
+            try:
+                with _open_source(source, name, archive) as f:
+                    data = json.loads(f.read().decode("utf-8"))
+
+                if not isinstance(data, dict):
+                    raise ValueError("not a JSON object")
+
+                prompt_type = data.get("type")
+                if prompt_type not in prompt_types:
+                    raise ValueError(f"unknown prompt type {prompt_type!r}")
+
+                # Round-trip through the prompt class to normalize the fields
+                prompt = prompt_types[prompt_type].from_dict(data)
+                results.append((name, prompt.to_dict(), None))
+            except Exception as e:
+                results.append((name, None, str(e)))
+    finally:
+        if archive is not None:
+            archive.close()
+    return results
+
+
+def list_source(source: str) -> List[str]:
+    """List the JSON files of a directory tree or zip archive."""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            names = [
+                info.filename for info in archive.infolist()
+                if not info.is_dir() and info.filename.endswith('.json')
+            ]
+    else:
+        names = []
+        for root, dirs, files in os.walk(source):
+            dirs[:] = [name for name in dirs if not name.startswith('.')]
+            for filename in files:
+                if filename.endswith('.json') and not filename.startswith('.'):
+                    names.append(os.path.relpath(os.path.join(root, filename), source))
+
+    names.sort()
+    return names
+
+
+class ImportReport:
+    """Outcome of a bulk import."""
+
+    def __init__(self, total: int = 0):
+        self.total = total
+        self.imported = []      # (source name, stored filename)
+        self.skipped = []       # source names left out because of a conflict
+        self.errors = []        # (source name, error message)
+
+    @property
+    def processed(self) -> int:
+        """Get the number of files handled so far."""
+        return len(self.imported) + len(self.skipped) + len(self.errors)
+
+    def summary(self) -> str:
+        """Get a one-line description of the outcome."""
+        return (
+            f"{len(self.imported)} imported, {len(self.skipped)} skipped, "
+            f"{len(self.errors)} failed of {self.total} files"
+        )
+
+
+class BulkImporter:
+    """Imports many prompt files into a prompt library.
+
+    Files are parsed and validated across a process pool in chunks, then
+    committed to the storage backend in batches from the calling process,
+    so only one process ever writes to the library. A file that fails to
+    parse is reported and skipped without aborting the run.
+    """
+
+    # Files handed to a worker at a time
+    chunk_size = 64
+
+    # Prompts written to storage per batch
+    batch_size = 200
+
+    def __init__(self, prompt_manager, as_template: bool = False,
+                 on_conflict: str = "rename", workers: Optional[int] = None):
+        """Initialize the importer.
+
+        Args:
+            prompt_manager: PromptManager owning the target library
+            as_template: Import into the templates instead of the prompts
+            on_conflict: "rename", "skip" or "overwrite" for taken titles
+            workers: Number of worker processes, None for one per CPU
+                or 1 to parse in this process
+        """
+        if on_conflict not in ON_CONFLICT:
+            raise ValueError(f"on_conflict must be one of {', '.join(ON_CONFLICT)}")
+
+        self.prompt_manager = prompt_manager
+        self.collection = TEMPLATES if as_template else PROMPTS
+        self.on_conflict = on_conflict
+        self.workers = workers
+
+    def _parse(self, source: str, names: List[str]) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Yield parse results in source order."""
+        prompt_types = self.prompt_manager.prompt_types
+        chunks = [
+            names[start:start + self.chunk_size]
+            for start in range(0, len(names), self.chunk_size)
+        ]
+
+        if self.workers == 1 or len(chunks) <= 1:
+            for chunk in chunks:
+                yield from parse_files(source, chunk, prompt_types)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            results = executor.map(
+                parse_files,
+                [source] * len(chunks), chunks, [prompt_types] * len(chunks)
+            )
+            for chunk_results in results:
+                yield from chunk_results
+
+    def _resolve(self, data: Dict[str, Any], taken: Dict[str, str]) -> Optional[str]:
+        """Pick the filename for an imported prompt, renaming it if needed.
+
+        Args:
+            data: Prompt data; its title is updated when renamed
+            taken: Mapping of used filenames to their titles, updated in place
+
+        Returns:
+            The filename to store the prompt under, or None to skip it
+        """
+        title = data.get("title")
+        filename = title_filename(title) if isinstance(title, str) else None
+        if filename is None:
+            title = f"{data['type'].upper()}_import"
+            filename = title_filename(title)
+
+        if filename in taken:
+            if self.on_conflict == "skip":
+                return None
+            if self.on_conflict == "rename":
+                base_title = title
+                counter = 2
+                while filename in taken:
+                    title = f"{base_title} ({counter})"
+                    filename = title_filename(title)
+                    counter += 1
+
+        data["title"] = title
+        taken[filename] = title
+        return filename
+
+    def run(self, source: str,
+            progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+        """Import every JSON file of a directory or zip archive.
+
+        Args:
+            source: Directory or zip archive path
+            progress: Called with the report after each committed batch
+
+        Returns:
+            Report of the imported, skipped and failed files
+        """
+        if not os.path.isdir(source) and not zipfile.is_zipfile(source):
+            raise ValueError(f"{source} is not a directory or zip archive")
+
+        names = list_source(source)
+        report = ImportReport(len(names))
+        storage = self.prompt_manager.storage
+        taken = {
+            entry["filename"]: entry["title"]
+            for entry in storage.iter_entries(self.collection)
+        }
+
+        batch = []
+        for name, data, error in self._parse(source, names):
+            if data is None:
+                report.errors.append((name, error))
+                continue
+
+            filename = self._resolve(data, taken)
+            if filename is None:
+                report.skipped.append(name)
+                continue
+
+            batch.append((name, filename, data))
+            if len(batch) >= self.batch_size:
+                self._commit(batch, report)
+                if progress:
+                    progress(report)
+                batch = []
+
+        if batch:
+            self._commit(batch, report)
+        if progress:
+            progress(report)
+
+        return report
+
+    def _commit(self, batch: List[Tuple[str, str, Dict[str, Any]]], report: ImportReport) -> None:
+        """Write a batch of prompts to storage."""
+        try:
+            self.prompt_manager.save_many(
+                [(filename, data) for _, filename, data in batch],
+                as_template=self.collection == TEMPLATES
+            )
+        except Exception as e:
+            report.errors.extend((name, f"Error saving prompt: {e}") for name, _, _ in batch)
+            return
+
+        report.imported.extend((name, filename) for name, filename, _ in batch)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for bulk imports."""
+    from .prompt_manager import PromptManager
+
+    parser = argparse.ArgumentParser(
+        description="Import a directory or zip archive of JSON prompts."
+    )
+    parser.add_argument("source", help="directory or zip archive to import")
+    parser.add_argument("--base-dir", help="prompt library directory")
+    parser.add_argument("--storage", choices=("json", "sqlite"), default="json",
+                        help="storage backend of the library")
+    parser.add_argument("--templates", action="store_true",
+                        help="import as templates instead of prompts")
+    parser.add_argument("--on-conflict", choices=ON_CONFLICT, default="rename",
+                        help="what to do when a title is already taken")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    prompt_manager = PromptManager(args.base_dir, storage=args.storage)
+    importer = BulkImporter(
+        prompt_manager, as_template=args.templates,
+        on_conflict=args.on_conflict, workers=args.workers
+    )
+
+    def show_progress(report):
+        print(f"\r{report.processed}/{report.total}", end="", flush=True)
+
+    try:
+        report = importer.run(args.source, progress=show_progress)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    finally:
+        prompt_manager.close()
+
+    print()
+    for name, error in report.errors:
+        print(f"{name}: {error}")
+    print(report.summary())
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,46 @@
+"""
+Content addressing for the Prompt Generator application.
+Identifies prompt revisions by a hash of their content.
+"""
+
+import hashlib
+import json
+from typing import Dict, Any
+
+
+# Fields that change on every save without changing the prompt itself
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def strip_timestamps(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Get a copy of prompt data without its timestamps."""
+    return {key: value for key, value in data.items() if key not in TIMESTAMP_FIELDS}
+
+
+def content_digest(data: Dict[str, Any]) -> str:
+    """Hash the content of a prompt.
+
+    Prompts that differ only in their timestamps have the same digest.
+
+    Args:
+        data: Prompt data as returned by to_dict()
+
+    Returns:
+        Hex-encoded SHA-256 digest
+    """
+    canonical = json.dumps(
+        strip_timestamps(data), sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def restore_timestamps(content: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild full prompt data from stored content and a history record."""
+    data = {
+        "title": content.get("title", ""),
+        "type": content.get("type", ""),
+        "created_at": record.get("created_at", ""),
+        "updated_at": record.get("updated_at", "")
+    }
+    data.update(content)
+    return data
@@ -0,0 +1,431 @@
+"""
+History log for the Prompt Generator application.
+Stores prompt history as an append-only, segmented JSONL log.
+"""
+
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+
+SEGMENT_PATTERN = re.compile(r"^segment_(\d+)\.jsonl$")
+
+# Lock file serializing appends between processes
+LOCK_NAME = ".lock"
+
+# Record fields kept in the in-memory offset table
+META_FIELDS = ("id", "filename", "title", "type", "created_at", "updated_at", "blob")
+
+
+class _Segment:
+    """One JSONL file of the log and its offset table."""
+
+    def __init__(self, number: int, path: str):
+        self.number = number
+        self.path = path
+        self.records = None     # [(offset, length, meta)], loaded on demand
+        self.size = 0           # end of the last complete line
+
+    def _scan(self, offset: int) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Read the complete lines from an offset to the end of the file.
+
+        A line that does not parse is skipped. A final line without a
+        newline is a torn write, or one still in progress, and is left
+        out of both the records and size.
+        """
+        records = []
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    print(f"Error reading history record at {self.path}:{offset}")
+                    offset += len(line)
+                    continue
+                meta = {key: record[key] for key in META_FIELDS if key in record}
+                records.append((offset, len(line), meta))
+                offset += len(line)
+        self.size = offset
+        return records
+
+    def load(self) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Build the offset table by scanning the segment once."""
+        if self.records is None:
+            self.records = self._scan(0)
+        return self.records
+
+    def refresh(self) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Pick up lines appended since the segment was scanned.
+
+        Returns:
+            The records that were added
+        """
+        if self.records is None:
+            return list(self.load())
+        if os.path.getsize(self.path) < self.size:
+            # Rewritten by someone else; start over
+            self.records = None
+            return list(self.load())
+
+        added = self._scan(self.size)
+        self.records.extend(added)
+        return added
+
+    def truncate_torn_tail(self) -> None:
+        """Drop a partial line left at the end of the file by a failed write.
+
+        Only safe while holding the append lock, when no other writer can
+        be in the middle of a line.
+        """
+        if os.path.getsize(self.path) > self.size:
+            with open(self.path, 'r+b') as f:
+                f.truncate(self.size)
+
+
+class HistoryLog:
+    """Append-only prompt history split into fixed-size segments.
+
+    Each line of a segment holds one history record: the listing metadata
+    of the prompt plus a payload (its data, or a reference to it). An
+    in-memory offset table maps record ids to (segment, offset, length)
+    and keeps the metadata, so a save costs one append and the
+    latest entries are read from the tail segment backwards. Retention
+    drops whole segments instead of deleting individual files.
+
+    Appends, pruning and compaction hold a lock file in the directory and
+    first pick up whatever other processes wrote, so several processes can
+    share one log.
+    """
+
+    def __init__(self, directory: str, segment_size: int = 100):
+        """Open the log in a directory.
+
+        Args:
+            directory: Directory holding the segment files
+            segment_size: Number of records per segment before rotation
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_entries = None
+        os.makedirs(directory, exist_ok=True)
+
+        self.segments = []
+        for filename in os.listdir(directory):
+            match = SEGMENT_PATTERN.match(filename)
+            if match:
+                self.segments.append(
+                    _Segment(int(match.group(1)), os.path.join(directory, filename))
+                )
+        self.segments.sort(key=lambda segment: segment.number)
+
+        self._lock_path = os.path.join(directory, LOCK_NAME)
+        self._thread_lock = threading.Lock()
+        self._latest_by_title = None    # title -> newest stored metadata
+
+    @contextmanager
+    def _locked(self):
+        """Hold the append lock, shared by every process using the directory."""
+        with self._thread_lock, open(self._lock_path, 'a+b') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _sync(self) -> None:
+        """Pick up segments and records written by other processes."""
+        on_disk = {}
+        for filename in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(filename)
+            if match:
+                on_disk[int(match.group(1))] = os.path.join(self.directory, filename)
+
+        if any(segment.number not in on_disk for segment in self.segments):
+            # Pruned or compacted elsewhere; the offset tables are stale
+            self.segments = [_Segment(number, path) for number, path in sorted(on_disk.items())]
+            self._latest_by_title = None
+            return
+
+        last = self.segments[-1].number if self.segments else 0
+        changed = self.segments[-1:]
+        for number in sorted(on_disk):
+            if number > last:
+                segment = _Segment(number, on_disk[number])
+                self.segments.append(segment)
+                changed.append(segment)
+
+        for segment in changed:
+            added = segment.refresh()
+            if self._latest_by_title is not None:
+                for _, _, meta in added:
+                    self._latest_by_title[meta.get("title", "")] = meta
+
+    def _segment_path(self, number: int) -> str:
+        """Get the path of a segment file."""
+        return os.path.join(self.directory, f"segment_{number:06d}.jsonl")
+
+    def _tail(self) -> _Segment:
+        """Get the segment new records are appended to, rotating if full."""
+        if self.segments:
+            tail = self.segments[-1]
+            if len(tail.load()) < self.segment_size:
+                return tail
+            number = tail.number + 1
+        else:
+            number = 1
+
+        segment = _Segment(number, self._segment_path(number))
+        segment.records = []
+        self.segments.append(segment)
+        return segment
+
+    def _last_id(self) -> int:
+        """Get the id of the newest record, or 0 if the log is empty."""
+        for segment in reversed(self.segments):
+            records = segment.load()
+            if records:
+                return records[-1][2]["id"]
+        return 0
+
+    def append(self, record: Dict[str, Any], payload: Dict[str, Any]) -> int:
+        """Append a record and return its id.
+
+        The id follows the newest record on disk, re-read under the
+        append lock, so processes sharing the log never hand out the same
+        id.
+
+        Args:
+            record: Metadata kept in the offset table
+            payload: Extra fields stored on disk only
+
+        Returns:
+            The id assigned to the record
+        """
+        with self._locked():
+            self._sync()
+            record = dict(record, id=self._last_id() + 1)
+            line = json.dumps(dict(record, **payload)).encode("utf-8") + b"\n"
+
+            tail = self._tail()
+            if os.path.exists(tail.path):
+                tail.truncate_torn_tail()
+            with open(tail.path, 'ab') as f:
+                f.write(line)
+            tail.records.append((tail.size, len(line), record))
+            tail.size += len(line)
+
+        if self._latest_by_title is not None:
+            self._latest_by_title[record.get("title", "")] = record
+        return record["id"]
+
+    def _iter_reversed(self) -> Iterator[Tuple[_Segment, Tuple[int, int, Dict[str, Any]]]]:
+        """Yield (segment, record) pairs from the newest record backwards."""
+        for segment in reversed(self.segments):
+            for record in reversed(segment.load()):
+                yield segment, record
+
+    def iter_entries(self, newest_first: bool = True) -> Iterator[Dict[str, Any]]:
+        """Yield the metadata of the retained records."""
+        visible = []
+        for count, (_, record) in enumerate(self._iter_reversed()):
+            if self.max_entries is not None and count >= self.max_entries:
+                break
+            if newest_first:
+                yield dict(record[2])
+            else:
+                visible.append(record[2])
+
+        for meta in reversed(visible):
+            yield dict(meta)
+
+    def latest(self, limit: Optional[int] = None,
+               before_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get the metadata of the newest records.
+
+        Args:
+            limit: Maximum number of records, or None for all retained
+            before_id: Only return records older than this id
+
+        Returns:
+            List of record metadata, newest first
+        """
+        entries = []
+        position = 0
+        for segment in reversed(self.segments):
+            records = segment.load()
+            if before_id is not None and records and records[0][2]["id"] >= before_id:
+                # The whole segment is newer than the cursor
+                position += len(records)
+                continue
+
+            for _, _, meta in reversed(records):
+                if self.max_entries is not None and position >= self.max_entries:
+                    return entries
+                position += 1
+                if before_id is not None and meta["id"] >= before_id:
+                    continue
+                if limit is not None and len(entries) >= limit:
+                    return entries
+                entries.append(dict(meta))
+        return entries
+
+    def latest_for_title(self, title: str) -> Optional[Dict[str, Any]]:
+        """Get the metadata of the newest retained record with a title.
+
+        The lookup table is built with one scan of the offset tables and
+        then kept up to date by append, so a lookup does not scan the log.
+        """
+        if self._latest_by_title is None:
+            latest = {}
+            for meta in self.iter_stored():
+                latest[meta.get("title", "")] = meta
+            self._latest_by_title = latest
+
+        meta = self._latest_by_title.get(title)
+        if meta is None:
+            return None
+        # Ids are consecutive, so the distance from the newest id is the
+        # record's position in the retention window
+        if self.max_entries is not None and self._last_id() - meta["id"] >= self.max_entries:
+            return None
+        return dict(meta)
+
+    def read(self, record_id: int) -> Optional[Dict[str, Any]]:
+        """Read a full record, including its payload."""
+        location = self._find(record_id)
+        if location is None:
+            # It may have been appended by another process
+            self._sync()
+            location = self._find(record_id)
+            if location is None:
+                return None
+        segment, offset, length = location
+        with open(segment.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def _find(self, record_id: int) -> Optional[Tuple[_Segment, int, int]]:
+        """Get the segment, offset and length of a record."""
+        for segment in reversed(self.segments):
+            records = segment.load()
+            if not records or records[0][2]["id"] > record_id:
+                continue
+
+            # Ids are normally consecutive within a segment
+            index = record_id - records[0][2]["id"]
+            if index < len(records) and records[index][2]["id"] == record_id:
+                offset, length, _ = records[index]
+                return segment, offset, length
+            break
+
+        # Gaps or repeats, e.g. from skipped corrupt lines or a log written
+        # by several processes before appends were locked
+        for segment in reversed(self.segments):
+            for offset, length, meta in reversed(segment.load()):
+                if meta["id"] == record_id:
+                    return segment, offset, length
+        return None
+
+    def prune(self, max_entries: int) -> int:
+        """Keep at least the newest max_entries records.
+
+        Whole segments are deleted once every record in them falls outside
+        the retention window; records of a partly expired segment are hidden
+        until the segment goes. That keeps fewer than one segment of hidden
+        records on disk, unless segments are larger or emptier than
+        segment_size (e.g. after segment_size or max_entries changed); the
+        log is then compacted.
+
+        Returns:
+            Number of records deleted
+        """
+        self.max_entries = max_entries
+        with self._locked():
+            self._sync()
+            return self._prune(max_entries)
+
+    def _prune(self, max_entries: int) -> int:
+        """Delete expired segments; the caller holds the append lock."""
+        removed = 0
+        total = sum(len(segment.load()) for segment in self.segments)
+        while self.segments and total - len(self.segments[0].load()) >= max_entries:
+            segment = self.segments.pop(0)
+            total -= len(segment.records)
+            removed += len(segment.records)
+            try:
+                os.remove(segment.path)
+            except Exception as e:
+                print(f"Error pruning history: {e}")
+
+        retained = min(total, max_entries)
+        needed = -(-retained // self.segment_size) + 1
+        if total - retained >= self.segment_size or len(self.segments) > needed:
+            self._compact()
+            removed += total - retained
+
+        if removed:
+            self._latest_by_title = None
+        return removed
+
+    def iter_stored(self) -> Iterator[Dict[str, Any]]:
+        """Yield the metadata of every record still on disk, hidden or not."""
+        for segment in self.segments:
+            yield from (record[2] for record in segment.load())
+
+    def compact(self) -> None:
+        """Rewrite the retained records into fresh, full segments."""
+        with self._locked():
+            self._sync()
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the retained records; the caller holds the append lock."""
+        retained = []
+        for segment, (offset, length, _) in self._iter_reversed():
+            if self.max_entries is not None and len(retained) >= self.max_entries:
+                break
+            with open(segment.path, 'rb') as f:
+                f.seek(offset)
+                retained.append(f.read(length))
+        retained.reverse()
+
+        old_segments = self.segments
+        number = old_segments[-1].number + 1 if old_segments else 1
+        self.segments = []
+
+        for start in range(0, len(retained), self.segment_size):
+            segment = _Segment(number, self._segment_path(number))
+            tmp_path = f"{segment.path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.writelines(retained[start:start + self.segment_size])
+            os.replace(tmp_path, segment.path)
+            self.segments.append(segment)
+            number += 1
+
+        for segment in old_segments:
+            try:
+                os.remove(segment.path)
+            except Exception as e:
+                print(f"Error compacting history: {e}")
+
+        self._latest_by_title = None
@@ -0,0 +1,189 @@
+"""
+Directory manifests for the Prompt Generator application.
+Caches listing metadata for a directory of JSON prompt files.
+"""
+
+import json
+import os
+from typing import Dict, Any, Optional, Callable, Iterator
+
+
+MANIFEST_NAME = ".manifest"
+MANIFEST_VERSION = 1
+
+
+def prompt_metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the listing fields from prompt data."""
+    return {
+        "title": data.get("title", ""),
+        "type": data.get("type", ""),
+        "created_at": data.get("created_at", ""),
+        "updated_at": data.get("updated_at", "")
+    }
+
+
+class DirectoryManifest:
+    """Sidecar index of the JSON files in a directory.
+
+    The manifest maps each filename to its mtime, size and listing
+    metadata. The JSON files stay the source of truth: a refresh stats
+    every file and only re-parses the ones whose mtime or size changed.
+    While a watcher reports changes file by file (see watched), listings
+    skip the refresh and rely on update() instead.
+    """
+
+    def __init__(self, directory: str,
+                 extract: Callable[[Dict[str, Any]], Dict[str, Any]] = prompt_metadata):
+        """Initialize the manifest for a directory.
+
+        Args:
+            directory: Directory containing the JSON files
+            extract: Function returning the metadata to keep for a file
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self.extract = extract
+        self.entries = None
+        self.watched = False
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest file, ignoring it if it is missing or corrupt."""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                return data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error reading manifest {self.path}: {e}")
+        return {}
+
+    def _ensure_loaded(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest on first use."""
+        if self.entries is None:
+            self.entries = self._load()
+        return self.entries
+
+    def _parse(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Read the metadata of a single file."""
+        try:
+            with open(os.path.join(self.directory, filename), 'r') as f:
+                return self.extract(json.load(f))
+        except Exception as e:
+            print(f"Error reading file {filename}: {e}")
+            return None
+
+    def refresh(self) -> None:
+        """Bring the manifest in line with the directory contents."""
+        entries = self._ensure_loaded()
+        seen = set()
+
+        with os.scandir(self.directory) as it:
+            for dir_entry in it:
+                filename = dir_entry.name
+                if not filename.endswith('.json') or filename.startswith('.'):
+                    continue
+
+                try:
+                    stat = dir_entry.stat()
+                except OSError:
+                    continue
+
+                seen.add(filename)
+                cached = entries.get(filename)
+                if (cached is not None
+                        and cached["mtime_ns"] == stat.st_mtime_ns
+                        and cached["size"] == stat.st_size):
+                    continue
+
+                meta = self._parse(filename)
+                if meta is None:
+                    if cached is not None:
+                        del entries[filename]
+                        self._dirty = True
+                    seen.discard(filename)
+                    continue
+
+                entries[filename] = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "meta": meta
+                }
+                self._dirty = True
+
+        for filename in [name for name in entries if name not in seen]:
+            del entries[filename]
+            self._dirty = True
+
+        self.flush()
+
+    def record(self, filename: str, data: Dict[str, Any]) -> None:
+        """Record a file that was just written, without re-reading it."""
+        entries = self._ensure_loaded()
+
+        try:
+            stat = os.stat(os.path.join(self.directory, filename))
+        except OSError:
+            entries.pop(filename, None)
+            self._dirty = True
+            return
+
+        entries[filename] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "meta": self.extract(data)
+        }
+        self._dirty = True
+
+    def update(self, filename: str) -> None:
+        """Re-read a single file reported as changed, or forget it if it is gone."""
+        entries = self._ensure_loaded()
+
+        try:
+            stat = os.stat(os.path.join(self.directory, filename))
+        except OSError:
+            self.discard(filename)
+            return
+
+        meta = self._parse(filename)
+        if meta is None:
+            self.discard(filename)
+            return
+
+        entries[filename] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "meta": meta
+        }
+        self._dirty = True
+
+    def discard(self, filename: str) -> None:
+        """Forget a file that was just deleted."""
+        entries = self._ensure_loaded()
+        if entries.pop(filename, None) is not None:
+            self._dirty = True
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Refresh the manifest and yield one metadata dict per file."""
+        if not self.watched or self.entries is None:
+            self.refresh()
+        for filename, entry in self.entries.items():
+            item = {"filename": filename}
+            item.update(entry["meta"])
+            yield item
+
+    def flush(self) -> None:
+        """Write the manifest to disk if it has changed."""
+        if not self._dirty or self.entries is None:
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            print(f"Error writing manifest {self.path}: {e}")
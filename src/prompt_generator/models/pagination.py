@@ -0,0 +1,68 @@
+"""
+Pagination helpers for the Prompt Generator application.
+Selects sorted pages from listing entries without sorting everything.
+"""
+
+import heapq
+from typing import List, Dict, Any, Optional, Iterable, Sequence
+
+
+SORT_KEYS = ("updated_at", "created_at", "title", "type", "filename")
+
+
+def validate_sort_key(sort_key: str) -> str:
+    """Check that a listing can be sorted by the given key."""
+    if sort_key not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort_key}")
+    return sort_key
+
+
+def page_cursor(entry: Dict[str, Any], sort_key: str,
+                id_field: str = "filename") -> List[Any]:
+    """Build the cursor that resumes a listing after the given entry."""
+    return [entry.get(sort_key) or "", entry[id_field]]
+
+
+def select_page(entries: Iterable[Dict[str, Any]], sort_key: str = "updated_at",
+                reverse: bool = True, offset: int = 0,
+                after_key: Optional[Sequence[Any]] = None,
+                limit: Optional[int] = None,
+                id_field: str = "filename") -> List[Dict[str, Any]]:
+    """Select one sorted page of entries.
+
+    Entries are ordered by (sort_key, id_field) so the order is total and
+    cursors are stable. With a limit, only the top offset + limit entries
+    are kept in memory while the input is consumed.
+
+    Args:
+        entries: Listing entries to select from, in any order
+        sort_key: Field to sort by
+        reverse: Sort in descending order
+        offset: Number of entries to skip
+        after_key: Cursor returned by page_cursor for the previous page
+        limit: Maximum number of entries to return, or None for all
+
+    Returns:
+        The selected entries in sort order
+    """
+    validate_sort_key(sort_key)
+
+    def key(entry):
+        return (entry.get(sort_key) or "", entry[id_field])
+
+    if after_key is not None:
+        after = tuple(after_key)
+        if reverse:
+            entries = (entry for entry in entries if key(entry) < after)
+        else:
+            entries = (entry for entry in entries if key(entry) > after)
+
+    if limit is None:
+        return sorted(entries, key=key, reverse=reverse)[offset:]
+
+    if reverse:
+        selected = heapq.nlargest(offset + limit, entries, key=key)
+    else:
+        selected = heapq.nsmallest(offset + limit, entries, key=key)
+
+    return selected[offset:]
@@ -5,50 +5,245 @@ Defines data structures for different prompt types.
 
 import json
 import os
+import string
 from datetime import datetime
+from operator import attrgetter
 
 
-class BasePrompt:
-    """Base class for all prompt types."""
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def _parse_timestamp(value):
+    """Parse a stored ISO timestamp, falling back to the current time."""
+    if value:
+        try:
+            return datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            pass
+    return datetime.now()
+
+
+class LazyTimestamp:
+    """Descriptor for a timestamp that is parsed on first read.
     
-    def __init__(self, title="", prompt_type=""):
-        self.title = title
-        self.type = prompt_type
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
-    
-    def to_dict(self):
-        """Convert prompt to dictionary."""
-        return {
-            "title": self.title,
-            "type": self.type,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat()
-        }
+    New and loaded prompts keep an ISO string in a private slot and only
+    turn it into a datetime when the attribute is read; to_dict() writes an
+    unread string back as it is. A string is checked once, when it is
+    stored, so the slot only ever holds a valid ISO string or a datetime;
+    a value that cannot be parsed is replaced by the current time, as it
+    was when parsing happened on load.
+    """
     
-    @classmethod
-    def from_dict(cls, data):
-        """Create prompt from dictionary."""
-        prompt = cls()
-        prompt.title = data.get("title", "")
-        prompt.type = data.get("type", "")
-        
-        # Parse dates if they exist
-        created_at = data.get("created_at")
-        if created_at:
+    def __init__(self, name):
+        self.name = name
+        self.slot = "_" + name
+    
+    def __get__(self, prompt, owner=None):
+        if prompt is None:
+            return self
+        value = getattr(prompt, self.slot)
+        if not isinstance(value, datetime):
+            value = _parse_timestamp(value)
+            setattr(prompt, self.slot, value)
+        return value
+    
+    def __set__(self, prompt, value):
+        if isinstance(value, str):
             try:
-                prompt.created_at = datetime.fromisoformat(created_at)
-            except (ValueError, TypeError):
-                prompt.created_at = datetime.now()
+                datetime.fromisoformat(value)
+            except ValueError:
+                value = datetime.now()
+        setattr(prompt, self.slot, value)
+
+
+def _compile(source, name, namespace):
+    """Compile generated source and return the function it defines."""
+    exec(compile(source, f"<{name}>", "exec"), namespace)
+    return namespace[name.rsplit(".", 1)[-1]]
+
+
+class PromptSchema(type):
+    """Metaclass that builds prompt classes from their field schema.
+    
+    Each class lists its own fields in a fields tuple; field_names holds the
+    full list, inherited fields first. The fields are stored in __slots__
+    instead of a per-instance __dict__, and __init__, to_dict and from_dict
+    are generated once per class as straight-line code, unless the class
+    body defines them itself.
+    
+    Timestamp fields read as datetimes and are serialized as ISO strings;
+    they are stored in a private slot and parsed lazily (see LazyTimestamp).
+    All other fields default to an empty string.
+    
+    A class may also declare its text as a template string with {field}
+    placeholders. The template is split once into static parts and field
+    slots; see BasePrompt.generate_text for how they are filled.
+    """
+    
+    def __new__(mcls, name, bases, namespace):
+        inherited = ()
+        for base in bases:
+            for field in getattr(base, "field_names", ()):
+                if field not in inherited:
+                    inherited += (field,)
+        own = tuple(field for field in namespace.get("fields", ()) if field not in inherited)
         
-        updated_at = data.get("updated_at")
-        if updated_at:
-            try:
-                prompt.updated_at = datetime.fromisoformat(updated_at)
-            except (ValueError, TypeError):
-                prompt.updated_at = datetime.now()
+        namespace.setdefault("__slots__", own)
+        namespace["field_names"] = inherited + own
+        cls = super().__new__(mcls, name, bases, namespace)
+        
+        if "__init__" not in namespace:
+            cls.__init__ = mcls._build_init(cls)
+        if "to_dict" not in namespace:
+            cls.to_dict = mcls._build_to_dict(cls)
+        if "from_dict" not in namespace:
+            cls.from_dict = classmethod(mcls._build_from_dict(cls))
+        if namespace.get("template") is not None:
+            mcls._compile_template(cls)
+        return cls
+    
+    @staticmethod
+    def _compile_template(cls):
+        """Split a class's text template into static parts and field slots."""
+        parts = []
+        template_fields = []
+        slots = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(cls.template):
+            if literal:
+                parts.append(literal)
+            if field is None:
+                continue
+            if field not in cls.field_names or format_spec or conversion:
+                raise ValueError(f"Invalid placeholder {{{field}}} in {cls.__name__} template")
+            if field not in template_fields:
+                template_fields.append(field)
+            slots.append((len(parts), template_fields.index(field)))
+            parts.append("")
+        
+        cls.template_parts = tuple(parts)
+        cls.template_fields = tuple(template_fields)
+        cls.template_slots = tuple(slots)
+        if len(template_fields) > 1:
+            cls._template_values = staticmethod(attrgetter(*template_fields))
+        else:
+            # attrgetter only returns a tuple for two or more names
+            cls._template_values = staticmethod(
+                lambda prompt: tuple(getattr(prompt, field) for field in template_fields)
+            )
+        cls.render_template = staticmethod(PromptSchema._build_renderer(cls))
+    
+    @staticmethod
+    def _build_renderer(cls):
+        """Generate render_template(*values), an f-string over the template fields.
+        
+        It takes one argument per template field, in template_fields order,
+        and renders the text without creating a prompt object.
+        """
+        slot_fields = {position: cls.template_fields[index] for position, index in cls.template_slots}
+        pieces = []
+        for position, part in enumerate(cls.template_parts):
+            if position in slot_fields:
+                pieces.append("{" + slot_fields[position] + "}")
+            else:
+                pieces.append(part.replace("{", "{{").replace("}", "}}"))
+        lines = [
+            f"def render_template({', '.join(cls.template_fields)}):",
+            f"    return f{''.join(pieces)!r}"
+        ]
+        return _compile("\n".join(lines), f"{cls.__name__}.render_template", {})
+    
+    @staticmethod
+    def _build_init(cls):
+        """Generate __init__(self, title="") for a prompt class.
+        
+        Both timestamps start as the same ISO string, so a new prompt is
+        formatted once when it is created rather than on every to_dict().
+        """
+        lines = ['def __init__(self, title=""):', "    now = _now().isoformat()"]
+        for field in cls.field_names:
+            if field == "title":
+                value = "title"
+            elif field == "type":
+                value = repr(cls.prompt_type)
+            elif field in TIMESTAMP_FIELDS:
+                field, value = "_" + field, "now"
+            else:
+                value = '""'
+            lines.append(f"    self.{field} = {value}")
+        namespace = {"_now": datetime.now}
+        return _compile("\n".join(lines), f"{cls.__name__}.__init__", namespace)
+    
+    @staticmethod
+    def _build_to_dict(cls):
+        """Generate to_dict() for a prompt class.
         
-        return prompt
+        Timestamps are read from their slots, bypassing the descriptor:
+        datetimes are formatted and strings, which were checked when they
+        were stored, are written back as they are.
+        """
+        lines = ["def to_dict(self):", '    """Convert prompt to dictionary."""']
+        for field in TIMESTAMP_FIELDS:
+            lines += [
+                f"    {field} = self._{field}",
+                f"    if {field}.__class__ is not str:",
+                f"        {field} = {field}.isoformat()"
+            ]
+        lines.append("    return {")
+        for field in cls.field_names:
+            if field in TIMESTAMP_FIELDS:
+                lines.append(f"        {field!r}: {field},")
+            else:
+                lines.append(f"        {field!r}: self.{field},")
+        lines.append("    }")
+        return _compile("\n".join(lines), f"{cls.__name__}.to_dict", {})
+    
+    @staticmethod
+    def _build_from_dict(cls):
+        """Generate the from_dict() classmethod for a prompt class."""
+        lines = [
+            "def from_dict(cls, data):",
+            '    """Create prompt from dictionary."""',
+            "    prompt = _new(cls)",
+            "    get = data.get"
+        ]
+        for field in cls.field_names:
+            if field in TIMESTAMP_FIELDS:
+                # Check the string now so saving never has to parse it
+                lines += [
+                    f"    value = get({field!r})",
+                    "    try:",
+                    "        _parse(value)",
+                    "    except (ValueError, TypeError):",
+                    "        value = _now()",
+                    f"    prompt._{field} = value"
+                ]
+            else:
+                lines.append(f"    prompt.{field} = get({field!r}, \"\")")
+        lines.append("    return prompt")
+        namespace = {"_new": object.__new__, "_now": datetime.now, "_parse": datetime.fromisoformat}
+        return _compile("\n".join(lines), f"{cls.__name__}.from_dict", namespace)
+
+
+class BasePrompt(metaclass=PromptSchema):
+    """Base class for all prompt types.
+    
+    Subclasses declare their prompt_type, the names of their fields and
+    usually a text template; see PromptSchema for what is generated from
+    them.
+    """
+    
+    prompt_type = ""
+    fields = ("title", "type", "created_at", "updated_at")
+    template = None
+    __slots__ = ("title", "type", "_created_at", "_updated_at", "_text_cache")
+    
+    created_at = LazyTimestamp("created_at")
+    updated_at = LazyTimestamp("updated_at")
+    
+    def __init__(self, title="", prompt_type=""):
+        self.title = title
+        self.type = prompt_type
+        self._created_at = self._updated_at = datetime.now().isoformat()
     
     def save(self, filepath):
         """Save prompt to file."""
@@ -72,222 +267,187 @@ class BasePrompt:
             print(f"Error loading prompt: {e}")
             return None
     
+    def _render(self):
+        """Get the rendered template parts and the cached text, if any.
+        
+        The values of the template fields are kept with the parts rendered
+        from them. A field whose value has changed since is dirty, and only
+        its slots are rendered again; if no field is dirty the cached parts
+        and text are returned as they are.
+        """
+        values = self._template_values(self)
+        cache = getattr(self, "_text_cache", None)
+        
+        if cache is None:
+            parts = list(self.template_parts)
+            for position, index in self.template_slots:
+                parts[position] = str(values[index])
+        else:
+            previous, parts, text = cache
+            if values == previous:
+                return cache
+            
+            dirty = {
+                index for index, value in enumerate(values)
+                if value is not previous[index] and value != previous[index]
+            }
+            parts = list(parts)
+            for position, index in self.template_slots:
+                if index in dirty:
+                    parts[position] = str(values[index])
+        
+        self._text_cache = (values, tuple(parts), None)
+        return self._text_cache
+    
+    def iter_text(self):
+        """Yield the prompt text in chunks.
+        
+        Long free-text fields are yielded on their own rather than formatted
+        into a larger string, so exports can stream them. Subclasses without
+        a template must implement this method.
+        """
+        if self.template is None:
+            raise NotImplementedError("Subclasses must implement this method")
+        return iter(self._render()[1])
+    
+    def text_parts(self):
+        """Get the prompt text as a tuple of parts.
+        
+        For templated prompts these are the template's static parts and
+        rendered fields; parts that did not change since the last call are
+        the same objects, so views can update only what was edited.
+        """
+        if self.template is None:
+            return tuple(self.iter_text())
+        return self._render()[1]
+    
     def generate_text(self):
-        """Generate prompt text. To be implemented by subclasses."""
-        raise NotImplementedError("Subclasses must implement this method")
+        """Generate prompt text.
+        
+        Templated prompts cache their text; it is only joined again after
+        a field used by the template has changed.
+        """
+        if self.template is None:
+            return "".join(self.iter_text())
+        
+        values, parts, text = self._render()
+        if text is None:
+            text = "".join(parts)
+            self._text_cache = (values, parts, text)
+        return text
 
 
 class ChainOfThoughtPrompt(BasePrompt):
     """Chain of Thought prompt model."""
     
-    def __init__(self, title=""):
-        super().__init__(title, "cot")
-        self.topic = ""
-        self.audience = ""
-        self.objective = ""
-        self.steps = ""
-        self.format = ""
-        self.length = ""
-    
-    def to_dict(self):
-        """Convert prompt to dictionary."""
-        data = super().to_dict()
-        data.update({
-            "topic": self.topic,
-            "audience": self.audience,
-            "objective": self.objective,
-            "steps": self.steps,
-            "format": self.format,
-            "length": self.length
-        })
-        return data
-    
-    @classmethod
-    def from_dict(cls, data):
-        """Create prompt from dictionary."""
-        prompt = super(ChainOfThoughtPrompt, cls).from_dict(data)
-        prompt.topic = data.get("topic", "")
-        prompt.audience = data.get("audience", "")
-        prompt.objective = data.get("objective", "")
-        prompt.steps = data.get("steps", "")
-        prompt.format = data.get("format", "")
-        prompt.length = data.get("length", "")
-        return prompt
+    prompt_type = "cot"
+    fields = (
+        "topic",
+        "audience",
+        "objective",
+        "steps",
+        "format",
+        "length"
+    )
     
-    def generate_text(self):
-        """Generate prompt text."""
-        return (
-            f"Topic: {self.topic}\n\n"
-            f"For {self.audience}, I need a detailed explanation on {self.topic} that achieves the following learning objective:\n"
-            f"{self.objective}\n\n"
-            f"Please use a Chain-of-Thought approach to break down this topic into the following logical steps:\n"
-            f"{self.steps}\n\n"
-            f"The content should be in {self.format} format and approximately {self.length} in length."
-        )
+    template = (
+        "Topic: {topic}\n\n"
+        "For {audience}, I need a detailed explanation on {topic} that achieves the following learning objective:\n"
+        "{objective}\n\n"
+        "Please use a Chain-of-Thought approach to break down this topic into the following logical steps:\n"
+        "{steps}\n\n"
+        "The content should be in {format} format and approximately {length} in length."
+    )
 
 
 class TreeOfThoughtsPrompt(BasePrompt):
     """Tree of Thoughts prompt model."""
     
-    def __init__(self, title=""):
-        super().__init__(title, "tot")
-        self.topic = ""
-        self.audience = ""
-        self.objective = ""
-        self.branches = ""
-        self.evaluation = ""
-        self.format = ""
-        self.length = ""
-    
-    def to_dict(self):
-        """Convert prompt to dictionary."""
-        data = super().to_dict()
-        data.update({
-            "topic": self.topic,
-            "audience": self.audience,
-            "objective": self.objective,
-            "branches": self.branches,
-            "evaluation": self.evaluation,
-            "format": self.format,
-            "length": self.length
-        })
-        return data
-    
-    @classmethod
-    def from_dict(cls, data):
-        """Create prompt from dictionary."""
-        prompt = super(TreeOfThoughtsPrompt, cls).from_dict(data)
-        prompt.topic = data.get("topic", "")
-        prompt.audience = data.get("audience", "")
-        prompt.objective = data.get("objective", "")
-        prompt.branches = data.get("branches", "")
-        prompt.evaluation = data.get("evaluation", "")
-        prompt.format = data.get("format", "")
-        prompt.length = data.get("length", "")
-        return prompt
+    prompt_type = "tot"
+    fields = (
+        "topic",
+        "audience",
+        "objective",
+        "branches",
+        "evaluation",
+        "format",
+        "length"
+    )
     
-    def generate_text(self):
-        """Generate prompt text."""
-        return (
-            f"Topic: {self.topic}\n\n"
-            f"For {self.audience}, I need an exploration of {self.topic} that achieves the following learning objective:\n"
-            f"{self.objective}\n\n"
-            f"Please use a Tree-of-Thoughts approach to explore these different solution paths:\n"
-            f"{self.branches}\n\n"
-            f"Evaluate each path using these criteria:\n"
-            f"{self.evaluation}\n\n"
-            f"The content should be in {self.format} format and approximately {self.length} in length."
-        )
+    template = (
+        "Topic: {topic}\n\n"
+        "For {audience}, I need an exploration of {topic} that achieves the following learning objective:\n"
+        "{objective}\n\n"
+        "Please use a Tree-of-Thoughts approach to explore these different solution paths:\n"
+        "{branches}\n\n"
+        "Evaluate each path using these criteria:\n"
+        "{evaluation}\n\n"
+        "The content should be in {format} format and approximately {length} in length."
+    )
 
 
 class ActivePrompt(BasePrompt):
     """Active Prompting model."""
     
-    def __init__(self, title=""):
-        super().__init__(title, "active")
-        self.topic = ""
-        self.audience = ""
-        self.objective = ""
-        self.initial_question = ""
-        self.followups = ""
-        self.format = ""
-        self.length = ""
-    
-    def to_dict(self):
-        """Convert prompt to dictionary."""
-        data = super().to_dict()
-        data.update({
-            "topic": self.topic,
-            "audience": self.audience,
-            "objective": self.objective,
-            "initial_question": self.initial_question,
-            "followups": self.followups,
-            "format": self.format,
-            "length": self.length
-        })
-        return data
+    prompt_type = "active"
+    fields = (
+        "topic",
+        "audience",
+        "objective",
+        "initial_question",
+        "followups",
+        "format",
+        "length"
+    )
     
-    @classmethod
-    def from_dict(cls, data):
-        """Create prompt from dictionary."""
-        prompt = super(ActivePrompt, cls).from_dict(data)
-        prompt.topic = data.get("topic", "")
-        prompt.audience = data.get("audience", "")
-        prompt.objective = data.get("objective", "")
-        prompt.initial_question = data.get("initial_question", "")
-        prompt.followups = data.get("followups", "")
-        prompt.format = data.get("format", "")
-        prompt.length = data.get("length", "")
-        return prompt
-    
-    def generate_text(self):
-        """Generate prompt text."""
-        return (
-            f"Topic: {self.topic}\n\n"
-            f"For {self.audience}, I need an interactive learning experience on {self.topic} that achieves the following learning objective:\n"
-            f"{self.objective}\n\n"
-            f"Begin with this initial question:\n"
-            f"{self.initial_question}\n\n"
-            f"Then use these follow-up prompts to guide the learning process:\n"
-            f"{self.followups}\n\n"
-            f"The content should be in {self.format} format and approximately {self.length} in length."
-        )
+    template = (
+        "Topic: {topic}\n\n"
+        "For {audience}, I need an interactive learning experience on {topic} that achieves the following learning objective:\n"
+        "{objective}\n\n"
+        "Begin with this initial question:\n"
+        "{initial_question}\n\n"
+        "Then use these follow-up prompts to guide the learning process:\n"
+        "{followups}\n\n"
+        "The content should be in {format} format and approximately {length} in length."
+    )
 
 
 class PersonaPrompt(BasePrompt):
     """Persona-based Prompting model."""
     
-    def __init__(self, title=""):
-        super().__init__(title, "persona")
-        self.topic = ""
-        self.audience = ""
-        self.objective = ""
-        self.role = ""
-        self.expertise = ""
-        self.style = ""
-        self.knowledge = ""
-        self.format = ""
-        self.length = ""
-    
-    def to_dict(self):
-        """Convert prompt to dictionary."""
-        data = super().to_dict()
-        data.update({
-            "topic": self.topic,
-            "audience": self.audience,
-            "objective": self.objective,
-            "role": self.role,
-            "expertise": self.expertise,
-            "style": self.style,
-            "knowledge": self.knowledge,
-            "format": self.format,
-            "length": self.length
-        })
-        return data
+    prompt_type = "persona"
     
-    @classmethod
-    def from_dict(cls, data):
-        """Create prompt from dictionary."""
-        prompt = super(PersonaPrompt, cls).from_dict(data)
-        prompt.topic = data.get("topic", "")
-        prompt.audience = data.get("audience", "")
-        prompt.objective = data.get("objective", "")
-        prompt.role = data.get("role", "")
-        prompt.expertise = data.get("expertise", "")
-        prompt.style = data.get("style", "")
-        prompt.knowledge = data.get("knowledge", "")
-        prompt.format = data.get("format", "")
-        prompt.length = data.get("length", "")
-        return prompt
+    # Choices offered for the expertise and style fields
+    expertise_levels = ("Beginner", "Intermediate", "Expert", "World-class Expert")
+    communication_styles = ("Academic", "Conversational", "Technical", "Simplified", "Socratic")
     
-    def generate_text(self):
-        """Generate prompt text."""
-        return (
-            f"Topic: {self.topic}\n\n"
-            f"For {self.audience}, I need content on {self.topic} that achieves the following learning objective:\n"
-            f"{self.objective}\n\n"
-            f"Please respond as if you are a {self.expertise} {self.role} with the following specific knowledge:\n"
-            f"{self.knowledge}\n\n"
-            f"Use a {self.style} communication style.\n\n"
-            f"The content should be in {self.format} format and approximately {self.length} in length."
-        )
+    fields = (
+        "topic",
+        "audience",
+        "objective",
+        "role",
+        "expertise",
+        "style",
+        "knowledge",
+        "format",
+        "length"
+    )
+    
+    template = (
+        "Topic: {topic}\n\n"
+        "For {audience}, I need content on {topic} that achieves the following learning objective:\n"
+        "{objective}\n\n"
+        "Please respond as if you are a {expertise} {role} with the following specific knowledge:\n"
+        "{knowledge}\n\n"
+        "Use a {style} communication style.\n\n"
+        "The content should be in {format} format and approximately {length} in length."
+    )
+
+
+# Prompt classes by prompt type
+PROMPT_TYPES = {
+    "cot": ChainOfThoughtPrompt,
+    "tot": TreeOfThoughtsPrompt,
+    "active": ActivePrompt,
+    "persona": PersonaPrompt
+}
@@ -0,0 +1,193 @@
+"""
+Columnar prompt batches for the Prompt Generator application.
+Renders many prompts of one type without creating a prompt object per row.
+"""
+
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Type, TextIO
+
+from .prompt import BasePrompt, TIMESTAMP_FIELDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Rows rendered at a time by iter_text() and write()
+RENDER_CHUNK_SIZE = 10000
+
+
+def batch_fields(prompt_class: Type[BasePrompt]) -> List[str]:
+    """Get the fields of a prompt class that a batch holds columns for."""
+    return [
+        field for field in prompt_class.field_names
+        if field != "type" and field not in TIMESTAMP_FIELDS
+    ]
+
+
+class PromptBatch:
+    """A batch of prompts of one type, stored as one column per field.
+
+    Every column is a list (or, with NumPy installed, a string array) of
+    the same length. render() walks the prompt class's compiled template
+    across whole columns: the template's static parts and field slots are
+    turned into a single f-string function once per class, and that
+    function is mapped over the columns. Fields a batch has no column for
+    render as empty strings.
+
+    Only prompt types with a text template can be batched.
+    """
+
+    def __init__(self, prompt_class: Type[BasePrompt],
+                 columns: Optional[Dict[str, Sequence[Any]]] = None):
+        """Initialize the batch.
+
+        Args:
+            prompt_class: Prompt class whose template renders the rows
+            columns: Mapping of field name to column of values
+        """
+        if prompt_class.template is None:
+            raise ValueError(f"{prompt_class.__name__} has no text template")
+
+        self.prompt_class = prompt_class
+        columns = columns or {}
+        for field in columns:
+            if field not in self.fields:
+                raise ValueError(f"{prompt_class.__name__} has no field {field!r}")
+
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("all columns must have the same length")
+
+        self.columns = dict(columns)
+        self.size = lengths.pop() if lengths else 0
+
+    @property
+    def fields(self) -> List[str]:
+        """Get the fields a batch can hold columns for."""
+        return batch_fields(self.prompt_class)
+
+    @classmethod
+    def from_rows(cls, prompt_class: Type[BasePrompt],
+                  rows: Iterable[Dict[str, Any]]) -> "PromptBatch":
+        """Build a batch from dictionaries of field values.
+
+        Missing fields and None values become empty strings.
+        """
+        fields = batch_fields(prompt_class)
+        columns = {field: [] for field in fields}
+        appends = [(field, columns[field].append) for field in fields]
+        for row in rows:
+            get = row.get
+            for field, append in appends:
+                value = get(field)
+                append("" if value is None else value)
+        return cls(prompt_class, columns)
+
+    @classmethod
+    def from_prompts(cls, prompts: Sequence[BasePrompt]) -> "PromptBatch":
+        """Build a batch from prompt objects of one type."""
+        if not prompts:
+            raise ValueError("cannot build a batch from no prompts")
+
+        prompt_class = type(prompts[0])
+        batch = cls(prompt_class)
+        batch.columns = {
+            field: [getattr(prompt, field) for prompt in prompts]
+            for field in batch.fields
+        }
+        batch.size = len(prompts)
+        return batch
+
+    def __len__(self) -> int:
+        return self.size
+
+    def column(self, field: str) -> Sequence[Any]:
+        """Get the column of a field, as empty strings if it has none."""
+        if field not in self.fields:
+            raise KeyError(field)
+        column = self.columns.get(field)
+        if column is None:
+            return [""] * self.size
+        return column
+
+    def prompt(self, index: int) -> BasePrompt:
+        """Create the prompt object for one row."""
+        prompt = self.prompt_class()
+        for field, column in self.columns.items():
+            setattr(prompt, field, column[index])
+        return prompt
+
+    def _template_columns(self, start: int = 0, stop: Optional[int] = None) -> List[Sequence[Any]]:
+        """Get the columns of the template fields, in template order."""
+        stop = self.size if stop is None else min(stop, self.size)
+        columns = []
+        for field in self.prompt_class.template_fields:
+            column = self.columns.get(field)
+            if column is None:
+                columns.append([""] * (stop - start))
+            elif start == 0 and stop == self.size:
+                columns.append(column)
+            else:
+                columns.append(column[start:stop])
+        return columns
+
+    def render(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Render the text of every row, or of rows start to stop.
+
+        Returns:
+            List of prompt texts, equal to generate_text() of each row
+        """
+        return list(map(self.prompt_class.render_template, *self._template_columns(start, stop)))
+
+    def iter_text(self, chunk_size: int = RENDER_CHUNK_SIZE) -> Iterator[str]:
+        """Yield the text of every row, rendering a chunk of rows at a time."""
+        for start in range(0, self.size, chunk_size):
+            yield from self.render(start, start + chunk_size)
+
+    def write(self, f: TextIO, separator: str = "\n",
+              chunk_size: int = RENDER_CHUNK_SIZE) -> int:
+        """Write the text of every row to an open text file.
+
+        Args:
+            f: Text file to write to
+            separator: Written after each prompt
+            chunk_size: Rows rendered at a time
+
+        Returns:
+            Number of prompts written
+        """
+        for start in range(0, self.size, chunk_size):
+            texts = self.render(start, start + chunk_size)
+            f.write(separator.join(texts))
+            f.write(separator)
+        return self.size
+
+    def render_array(self):
+        """Render every row into a NumPy string array.
+
+        The template is applied one segment at a time: each static part is
+        broadcast onto the array and each field slot adds its whole column
+        at once.
+
+        Returns:
+            NumPy array of prompt texts
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if np is None:
+            raise ImportError("render_array requires NumPy")
+
+        # NumPy 2 has a faster string module; older versions only np.char
+        add = np.strings.add if hasattr(np, "strings") else np.char.add
+        columns = self._template_columns()
+        slot_fields = dict(self.prompt_class.template_slots)
+
+        result = np.full(self.size, "", dtype=str)
+        for position, part in enumerate(self.prompt_class.template_parts):
+            if position in slot_fields:
+                result = add(result, np.asarray(columns[slot_fields[position]], dtype=str))
+            elif part:
+                result = add(result, part)
+        return result
@@ -0,0 +1,102 @@
+"""
+Prompt cache for the Prompt Generator application.
+Keeps recently loaded prompt objects so repeated loads skip parsing.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple, Hashable
+
+from .prompt import BasePrompt, TIMESTAMP_FIELDS
+
+
+def copy_prompt(prompt: BasePrompt) -> BasePrompt:
+    """Copy a prompt, sharing its immutable field values.
+
+    Prompt fields are almost always strings and datetimes, so a shallow
+    copy is enough; the rare list or dict value is copied deeply.
+    Timestamps are skipped so unread ones stay unparsed.
+    """
+    clone = copy.copy(prompt)
+    for name in prompt.field_names:
+        if name in TIMESTAMP_FIELDS:
+            continue
+        value = getattr(prompt, name)
+        if isinstance(value, (list, dict, set)):
+            setattr(clone, name, copy.deepcopy(value))
+    return clone
+
+
+class PromptCache:
+    """Bounded LRU cache of parsed prompts.
+
+    Entries are keyed by (collection, filename) and tagged with a
+    validation token from the storage backend, such as the file's path,
+    mtime and size. A lookup whose token no longer matches is a miss, so
+    edits made outside the application are picked up. Callers get a copy
+    of the cached prompt and can modify it freely.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of prompts kept
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()     # key -> (token, prompt)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Tuple[str, str], token: Hashable) -> Optional[BasePrompt]:
+        """Get a copy of a cached prompt if its token still matches."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != token:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            prompt = entry[1]
+
+        return copy_prompt(prompt)
+
+    def put(self, key: Tuple[str, str], token: Hashable, prompt: BasePrompt) -> None:
+        """Cache a copy of a prompt under a key and token."""
+        if self.max_entries <= 0:
+            return
+
+        snapshot = copy_prompt(prompt)
+        with self._lock:
+            self._entries[key] = (token, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Tuple[str, str]) -> None:
+        """Drop a prompt from the cache."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every cached prompt."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics for the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
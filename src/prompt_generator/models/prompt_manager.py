@@ -4,19 +4,44 @@ Manages prompt history, templates, and storage.
 """
 
 import os
-import json
-import shutil
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, Iterator, Sequence, Tuple, TYPE_CHECKING
 
-from .prompt import BasePrompt, ChainOfThoughtPrompt, TreeOfThoughtsPrompt, ActivePrompt, PersonaPrompt
+from .prompt import (
+    BasePrompt, ChainOfThoughtPrompt, TreeOfThoughtsPrompt, ActivePrompt, PersonaPrompt, PROMPT_TYPES
+)
+from .pagination import page_cursor
+from .prompt_cache import PromptCache
+from .watcher import PollingWatcher, ChangeEvent, DELETED
+from .search_index import SearchIndex
+from .storage import (
+    StorageBackend, JSONFileStorage, SQLiteStorage,
+    PROMPTS, TEMPLATES, migrate_json_to_sqlite
+)
+
+if TYPE_CHECKING:
+    from .bulk_import import ImportReport
 
 
 class PromptManager:
     """Manages prompt history, templates, and storage."""
     
-    def __init__(self, base_dir=None):
-        """Initialize the prompt manager."""
+    # Number of history entries kept
+    max_history_entries = 2000
+    
+    # Number of parsed prompts kept by load_prompt
+    prompt_cache_size = 128
+    
+    # Prompt classes by prompt type; usable without creating a manager
+    prompt_types = PROMPT_TYPES
+    
+    def __init__(self, base_dir=None, storage: Union[str, StorageBackend] = "json"):
+        """Initialize the prompt manager.
+        
+        Args:
+            base_dir: Directory holding the prompt library
+            storage: "json", "sqlite" or a StorageBackend instance
+        """
         if base_dir is None:
             # Use default location in user's home directory
             home_dir = os.path.expanduser("~")
@@ -24,22 +49,35 @@ class PromptManager:
         else:
             self.base_dir = base_dir
         
-        # Create directories if they don't exist
-        self.prompts_dir = os.path.join(self.base_dir, "prompts")
-        self.templates_dir = os.path.join(self.base_dir, "templates")
-        self.history_dir = os.path.join(self.base_dir, "history")
+        # The JSON layout is always available, both as the default backend
+        # and as the migration source for the SQLite backend
+        json_storage = JSONFileStorage(self.base_dir)
+        self.prompts_dir = json_storage.prompts_dir
+        self.templates_dir = json_storage.templates_dir
+        self.history_dir = json_storage.history_dir
+        
+        if isinstance(storage, StorageBackend):
+            self.storage = storage
+        elif storage == "sqlite":
+            self.storage = SQLiteStorage(os.path.join(self.base_dir, "library.sqlite3"))
+            migrate_json_to_sqlite(json_storage, self.storage)
+        elif storage == "json":
+            self.storage = json_storage
+        else:
+            raise ValueError(f"Unknown storage backend: {storage}")
+        
+        # Apply the retention window to history written by earlier sessions
+        self._prune_history(self.max_history_entries)
         
-        os.makedirs(self.prompts_dir, exist_ok=True)
-        os.makedirs(self.templates_dir, exist_ok=True)
-        os.makedirs(self.history_dir, exist_ok=True)
+        # The search index is loaded on first use
+        self.search_index_path = os.path.join(self.base_dir, "search_index.json")
+        self.search_index = None
         
-        # Initialize prompt type mapping
-        self.prompt_types = {
-            "cot": ChainOfThoughtPrompt,
-            "tot": TreeOfThoughtsPrompt,
-            "active": ActivePrompt,
-            "persona": PersonaPrompt
-        }
+        # Parsed prompts recently returned by load_prompt
+        self.prompt_cache = PromptCache(self.prompt_cache_size)
+        
+        # Reports changes made by other processes once watch() is called
+        self.watcher = None
     
     def create_prompt(self, prompt_type: str, title: str = "") -> Optional[BasePrompt]:
         """Create a new prompt of the specified type."""
@@ -49,7 +87,7 @@ class PromptManager:
         return self.prompt_types[prompt_type](title)
     
     def save_prompt(self, prompt: BasePrompt, as_template: bool = False) -> str:
-        """Save a prompt to file."""
+        """Save a prompt and return its storage location."""
         if not prompt.title:
             # Generate a title if none exists
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -58,198 +96,360 @@ class PromptManager:
         # Update the updated_at timestamp
         prompt.updated_at = datetime.now()
         
-        # Determine save directory
-        save_dir = self.templates_dir if as_template else self.prompts_dir
-        
         # Create a valid filename
         filename = f"{prompt.title.replace(' ', '_')}.json"
-        filepath = os.path.join(save_dir, filename)
         
         # Save the prompt
-        prompt.save(filepath)
+        collection = TEMPLATES if as_template else PROMPTS
+        data = prompt.to_dict()
+        location = self.storage.save(collection, filename, data)
+        self.prompt_cache.invalidate((collection, filename))
+        
+        if self.search_index is not None and not as_template:
+            self.search_index.add(filename, data)
         
         # Add to history if it's not a template
         if not as_template:
             self._add_to_history(prompt)
         
-        return filepath
+        return location
+    
+    def save_many(self, items: Sequence[Tuple[str, Dict[str, Any]]],
+                  as_template: bool = False) -> None:
+        """Store several prompts as (filename, data) pairs without adding history.
+        
+        The data is stored as given, keeping its timestamps.
+        """
+        collection = TEMPLATES if as_template else PROMPTS
+        self.storage.save_many(collection, items)
+        for filename, _ in items:
+            self.prompt_cache.invalidate((collection, filename))
+        
+        if self.search_index is not None and not as_template:
+            for filename, data in items:
+                self.search_index.add(filename, data)
+    
+    def import_prompts(self, source: str, as_template: bool = False,
+                       on_conflict: str = "rename", workers: Optional[int] = None,
+                       progress=None) -> "ImportReport":
+        """Import a directory or zip archive of JSON prompts.
+        
+        Args:
+            source: Directory or zip archive path
+            as_template: Import into the templates instead of the prompts
+            on_conflict: "rename", "skip" or "overwrite" for taken titles
+            workers: Number of worker processes, None for one per CPU
+            progress: Called with the ImportReport after each batch
+            
+        Returns:
+            ImportReport describing the imported, skipped and failed files
+        """
+        # Imported here so that loading the manager does not pull in the
+        # process pool and archive modules
+        from .bulk_import import BulkImporter
+        
+        importer = BulkImporter(self, as_template, on_conflict, workers)
+        return importer.run(source, progress)
+    
+    def export_archive(self, path: str) -> Dict[str, int]:
+        """Write the whole library (prompts, templates and history) to a zip or tar archive."""
+        from .archive import export_archive
+        return export_archive(self.storage, path)
+    
+    def restore_archive(self, path: str, overwrite: bool = False,
+                        include_history: bool = True) -> Dict[str, int]:
+        """Restore a library archive written by export_archive.
+        
+        Args:
+            path: Archive path
+            overwrite: Replace prompts that already exist instead of keeping them
+            include_history: Replay the archived history as well
+            
+        Returns:
+            Number of entries restored per collection, and of entries
+            rejected for an unsafe filename under "errors"
+        """
+        from .archive import restore_archive
+        return restore_archive(self, path, overwrite, include_history)
     
     def load_prompt(self, filename: str, from_template: bool = False) -> Optional[BasePrompt]:
-        """Load a prompt from file."""
-        # Determine load directory
-        load_dir = self.templates_dir if from_template else self.prompts_dir
-        
-        filepath = os.path.join(load_dir, filename)
+        """Load a prompt from storage.
         
-        if not os.path.exists(filepath):
-            return None
+        Parsed prompts are cached until the stored file changes; each call
+        returns a separate copy.
+        """
+        self._sync_changes()
+        collection = TEMPLATES if from_template else PROMPTS
+        key = (collection, filename)
         
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+            token = self.storage.stat_token(collection, filename)
+            if token is not None:
+                prompt = self.prompt_cache.get(key, token)
+                if prompt is not None:
+                    return prompt
+            
+            data = self.storage.load(collection, filename)
+            if data is None:
+                return None
             
             prompt_type = data.get("type")
             if prompt_type not in self.prompt_types:
                 return None
             
-            return self.prompt_types[prompt_type].from_dict(data)
+            prompt = self.prompt_types[prompt_type].from_dict(data)
+            if token is not None:
+                self.prompt_cache.put(key, token, prompt)
+            return prompt
         except Exception as e:
             print(f"Error loading prompt: {e}")
             return None
     
     def list_prompts(self, prompt_type: str = None) -> List[Dict[str, Any]]:
         """List all saved prompts, optionally filtered by type."""
-        prompts = []
-        
-        for filename in os.listdir(self.prompts_dir):
-            if not filename.endswith('.json'):
-                continue
-            
-            filepath = os.path.join(self.prompts_dir, filename)
-            
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                
-                if prompt_type is None or data.get("type") == prompt_type:
-                    prompts.append({
-                        "filename": filename,
-                        "title": data.get("title", ""),
-                        "type": data.get("type", ""),
-                        "created_at": data.get("created_at", ""),
-                        "updated_at": data.get("updated_at", "")
-                    })
-            except Exception as e:
-                print(f"Error reading prompt file {filename}: {e}")
-        
-        # Sort by updated_at (newest first)
-        prompts.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
-        
-        return prompts
+        self._sync_changes()
+        # Sorted by updated_at (newest first)
+        return self.storage.query(PROMPTS, prompt_type, "updated_at", True)
     
     def list_templates(self, prompt_type: str = None) -> List[Dict[str, Any]]:
         """List all saved templates, optionally filtered by type."""
-        templates = []
-        
-        for filename in os.listdir(self.templates_dir):
-            if not filename.endswith('.json'):
-                continue
-            
-            filepath = os.path.join(self.templates_dir, filename)
+        self._sync_changes()
+        # Sorted by title
+        return self.storage.query(TEMPLATES, prompt_type, "title", False)
+    
+    def list_prompts_page(self, prompt_type: str = None, sort_key: str = "updated_at",
+                          reverse: bool = True, offset: int = 0,
+                          after_key: Optional[Sequence[Any]] = None,
+                          page_size: int = 50) -> Tuple[List[Dict[str, Any]], Optional[List[Any]]]:
+        """Get one page of saved prompts.
+        
+        Args:
+            prompt_type: Only list prompts of this type
+            sort_key: Field to sort by
+            reverse: Sort in descending order
+            offset: Number of entries to skip
+            after_key: Cursor returned with the previous page
+            page_size: Maximum number of entries in the page
             
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                
-                if prompt_type is None or data.get("type") == prompt_type:
-                    templates.append({
-                        "filename": filename,
-                        "title": data.get("title", ""),
-                        "type": data.get("type", ""),
-                        "created_at": data.get("created_at", ""),
-                        "updated_at": data.get("updated_at", "")
-                    })
-            except Exception as e:
-                print(f"Error reading template file {filename}: {e}")
-        
-        # Sort by title
-        templates.sort(key=lambda x: x.get("title", ""))
-        
-        return templates
+        Returns:
+            Tuple of (entries, cursor for the next page or None)
+        """
+        return self._page(PROMPTS, prompt_type, sort_key, reverse, offset, after_key, page_size)
     
-    def delete_prompt(self, filename: str) -> bool:
-        """Delete a prompt file."""
-        filepath = os.path.join(self.prompts_dir, filename)
-        
-        if not os.path.exists(filepath):
-            return False
+    def list_templates_page(self, prompt_type: str = None, sort_key: str = "title",
+                            reverse: bool = False, offset: int = 0,
+                            after_key: Optional[Sequence[Any]] = None,
+                            page_size: int = 50) -> Tuple[List[Dict[str, Any]], Optional[List[Any]]]:
+        """Get one page of saved templates. See list_prompts_page."""
+        return self._page(TEMPLATES, prompt_type, sort_key, reverse, offset, after_key, page_size)
+    
+    def iter_prompts(self, prompt_type: str = None, sort_key: str = "updated_at",
+                     reverse: bool = True, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream saved prompts in sort order.
         
-        try:
-            os.remove(filepath)
-            return True
-        except Exception as e:
-            print(f"Error deleting prompt: {e}")
-            return False
+        Paged backends fetch page_size entries per query.
+        """
+        return self._iter_pages(PROMPTS, prompt_type, sort_key, reverse, page_size)
+    
+    def iter_templates(self, prompt_type: str = None, sort_key: str = "title",
+                       reverse: bool = False, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream saved templates in sort order. See iter_prompts."""
+        return self._iter_pages(TEMPLATES, prompt_type, sort_key, reverse, page_size)
+    
+    def _page(self, collection: str, prompt_type: Optional[str], sort_key: str,
+              reverse: bool, offset: int, after_key: Optional[Sequence[Any]],
+              page_size: int) -> Tuple[List[Dict[str, Any]], Optional[List[Any]]]:
+        """Fetch one page of a collection and the cursor for the next one."""
+        self._sync_changes()
+        entries = self.storage.query(
+            collection, prompt_type, sort_key, reverse, offset, after_key, page_size
+        )
+        cursor = None
+        if len(entries) == page_size:
+            cursor = page_cursor(entries[-1], sort_key)
+        return entries, cursor
+    
+    def _iter_pages(self, collection: str, prompt_type: Optional[str], sort_key: str,
+                    reverse: bool, page_size: int) -> Iterator[Dict[str, Any]]:
+        """Yield every entry of a collection in sort order.
+        
+        Outside changes are applied once when the iteration starts; the
+        backend then streams the entries in a single ordered pass.
+        """
+        self._sync_changes()
+        yield from self.storage.iter_query(collection, prompt_type, sort_key, reverse, page_size)
+    
+    def delete_prompt(self, filename: str) -> bool:
+        """Delete a saved prompt."""
+        deleted = self.storage.delete(PROMPTS, filename)
+        self.prompt_cache.invalidate((PROMPTS, filename))
+        if deleted and self.search_index is not None:
+            self.search_index.remove(filename)
+        return deleted
     
     def delete_template(self, filename: str) -> bool:
-        """Delete a template file."""
-        filepath = os.path.join(self.templates_dir, filename)
-        
-        if not os.path.exists(filepath):
-            return False
-        
-        try:
-            os.remove(filepath)
-            return True
-        except Exception as e:
-            print(f"Error deleting template: {e}")
-            return False
+        """Delete a saved template."""
+        deleted = self.storage.delete(TEMPLATES, filename)
+        self.prompt_cache.invalidate((TEMPLATES, filename))
+        return deleted
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics of the load_prompt cache."""
+        return self.prompt_cache.stats()
     
     def _add_to_history(self, prompt: BasePrompt) -> None:
         """Add a prompt to the history."""
         # Create a history entry
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         history_filename = f"{prompt.type}_{timestamp}.json"
-        history_filepath = os.path.join(self.history_dir, history_filename)
         
         # Save a copy to history
-        prompt.save(history_filepath)
+        self.storage.add_history(history_filename, prompt.to_dict())
         
         # Limit history size (keep the most recent N entries)
-        self._prune_history(50)  # Keep the most recent 50 entries
+        self._prune_history(self.max_history_entries)
     
     def _prune_history(self, max_entries: int) -> None:
         """Limit the history to the most recent entries."""
-        history_files = []
-        
-        for filename in os.listdir(self.history_dir):
-            if not filename.endswith('.json'):
-                continue
+        self.storage.prune_history(max_entries)
+    
+    def get_history(self, limit: int = 10, include_content: bool = True) -> List[Dict[str, Any]]:
+        """Get the most recent prompt history entries."""
+        if include_content:
+            return self.storage.get_history(limit)
+        return self.storage.query_history(limit=limit)
+    
+    def history_page(self, offset: int = 0, after_key: Optional[Sequence[Any]] = None,
+                     page_size: int = 10) -> Tuple[List[Dict[str, Any]], Optional[List[Any]]]:
+        """Get one page of history entries (newest first) without their content.
+        
+        Args:
+            offset: Number of entries to skip
+            after_key: Cursor returned with the previous page
+            page_size: Maximum number of entries in the page
             
-            filepath = os.path.join(self.history_dir, filename)
-            history_files.append((filepath, os.path.getmtime(filepath)))
-        
-        # Sort by modification time (newest first)
-        history_files.sort(key=lambda x: x[1], reverse=True)
+        Returns:
+            Tuple of (entries, cursor for the next page or None)
+        """
+        entries = self.storage.query_history(offset, after_key, page_size)
+        cursor = None
+        if len(entries) == page_size:
+            cursor = page_cursor(entries[-1], "updated_at", id_field="id")
+        return entries, cursor
+    
+    def iter_history(self, page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Stream history entries (newest first) without their content."""
+        cursor = None
+        while True:
+            entries, cursor = self.history_page(after_key=cursor, page_size=page_size)
+            yield from entries
+            if cursor is None:
+                return
+    
+    def load_history_entry(self, entry_id: Any) -> Optional[Dict[str, Any]]:
+        """Get the prompt data stored for a history entry."""
+        return self.storage.load_history(entry_id)
+    
+    def get_search_index(self) -> SearchIndex:
+        """Get the search index, loading it and catching up with the library."""
+        self._sync_changes()
+        if self.search_index is None:
+            index = SearchIndex(self.search_index_path)
+            index.sync(
+                self.storage.iter_entries(PROMPTS),
+                lambda filename: self.storage.load(PROMPTS, filename)
+            )
+            index.save()
+            self.search_index = index
+        return self.search_index
+    
+    def search(self, query: str, prompt_type: str = None, sort_key: str = "updated_at",
+               reverse: bool = True, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Search saved prompts.
+        
+        Args:
+            query: Search query, e.g. 'topic:python OR audience:managers'
+            prompt_type: Only return prompts of this type
+            sort_key: Field to sort the results by
+            reverse: Sort in descending order
+            limit: Maximum number of results, or None for all
+            
+        Returns:
+            List of matching prompt listing entries
+        """
+        return self.get_search_index().search(query, prompt_type, sort_key, reverse, limit)
+    
+    def watch(self, watcher=None, interval: float = 2.0):
+        """Keep listings, the search index and the cache in sync with changes
+        made to the library by other processes.
+        
+        Without a watcher, the prompt and template directories are polled
+        in the background. The GUI can pass a QtFileWatcher instead. Either
+        way, detected changes are queued and applied on the next call that
+        reads the library, updating only the affected entries.
+        
+        Args:
+            watcher: Watcher with start(), stop() and drain(), or None to poll
+            interval: Seconds between polls when no watcher is given
+            
+        Returns:
+            The running watcher, or None if the backend has no files to watch
+        """
+        self.unwatch()
+        
+        if watcher is None:
+            directories = getattr(self.storage, "directories", None)
+            if not directories:
+                return None
+            watcher = PollingWatcher(directories, interval)
         
-        # Remove excess files
-        if len(history_files) > max_entries:
-            for filepath, _ in history_files[max_entries:]:
+        self.storage.set_watched(True)
+        watcher.start()
+        self.watcher = watcher
+        return watcher
+    
+    def unwatch(self) -> None:
+        """Stop watching the library for outside changes."""
+        if self.watcher is None:
+            return
+        
+        self.watcher.stop()
+        self.watcher = None
+        self.storage.set_watched(False)
+    
+    def _sync_changes(self) -> None:
+        """Apply the changes reported by the watcher since the last call."""
+        if self.watcher is not None:
+            events = self.watcher.drain()
+            if events:
+                self.apply_changes(events)
+    
+    def apply_changes(self, events: List[ChangeEvent]) -> None:
+        """Update the in-memory view for prompt files changed outside the manager."""
+        for event in events:
+            self.storage.refresh_entry(event.collection, event.filename)
+            self.prompt_cache.invalidate((event.collection, event.filename))
+            
+            if self.search_index is None or event.collection != PROMPTS:
+                continue
+            data = None
+            if event.kind != DELETED:
                 try:
-                    os.remove(filepath)
+                    data = self.storage.load(event.collection, event.filename)
                 except Exception as e:
-                    print(f"Error pruning history: {e}")
+                    # Most likely caught mid-write; the next event re-adds it
+                    print(f"Error reading changed prompt {event.filename}: {e}")
+            if data is None:
+                self.search_index.remove(event.filename)
+            else:
+                self.search_index.add(event.filename, data)
     
-    def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get the most recent prompt history entries."""
-        history_entries = []
-        
-        for filename in os.listdir(self.history_dir):
-            if not filename.endswith('.json'):
-                continue
-            
-            filepath = os.path.join(self.history_dir, filename)
-            
-            try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                
-                history_entries.append({
-                    "filename": filename,
-                    "title": data.get("title", ""),
-                    "type": data.get("type", ""),
-                    "created_at": data.get("created_at", ""),
-                    "updated_at": data.get("updated_at", ""),
-                    "content": data
-                })
-            except Exception as e:
-                print(f"Error reading history file {filename}: {e}")
-        
-        # Sort by updated_at (newest first)
-        history_entries.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
-        
-        # Limit to the requested number
-        return history_entries[:limit]
+    def close(self) -> None:
+        """Write the search index and release the storage backend."""
+        self.unwatch()
+        if self.search_index is not None:
+            self.search_index.save()
+        self.storage.close()
     
     def create_default_templates(self) -> None:
         """Create default templates for each prompt type."""
@@ -0,0 +1,96 @@
+"""
+Revision deltas for the Prompt Generator application.
+Encodes a prompt revision as per-field line diffs against an earlier one.
+"""
+
+import json
+from difflib import SequenceMatcher
+from typing import List, Dict, Any, Union
+
+
+# Key marking a stored blob as a delta rather than full content
+DELTA_KEY = "_delta"
+
+
+def diff_lines(base: str, text: str) -> List[Union[str, List[int]]]:
+    """Encode text as a line diff against a base string.
+
+    Args:
+        base: The earlier version of the text
+        text: The new version of the text
+
+    Returns:
+        List of operations: [start, end] copies lines of the base and a
+        string inserts new text
+    """
+    base_lines = base.splitlines(True)
+    lines = text.splitlines(True)
+
+    ops = []
+    matcher = SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(lines[j1:j2]))
+    return ops
+
+
+def patch_lines(base: str, ops: List[Union[str, List[int]]]) -> str:
+    """Rebuild text from a base string and the operations of diff_lines."""
+    base_lines = base.splitlines(True)
+
+    parts = []
+    for op in ops:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def make_delta(base: Dict[str, Any], content: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe content as changes to a base revision.
+
+    String fields present in both revisions are stored as line diffs;
+    other changed fields are stored as their new value.
+
+    Args:
+        base: Content of the earlier revision
+        content: Content of the new revision
+
+    Returns:
+        Dictionary with the changed and removed fields
+    """
+    changes = {}
+    for field, value in content.items():
+        if field in base and base[field] == value:
+            continue
+
+        old = base.get(field)
+        if isinstance(value, str) and isinstance(old, str):
+            changes[field] = {"lines": diff_lines(old, value)}
+        else:
+            changes[field] = {"value": value}
+
+    removed = [field for field in base if field not in content]
+    return {"changes": changes, "removed": removed}
+
+
+def apply_delta(base: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild the content of a revision from its base and delta."""
+    content = {
+        field: value for field, value in base.items()
+        if field not in delta.get("removed", ())
+    }
+    for field, change in delta.get("changes", {}).items():
+        if "lines" in change:
+            content[field] = patch_lines(base.get(field, ""), change["lines"])
+        else:
+            content[field] = change["value"]
+    return content
+
+
+def encoded_size(value: Any) -> int:
+    """Get the length of a value once serialized to JSON."""
+    return len(json.dumps(value))
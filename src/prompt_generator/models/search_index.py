@@ -0,0 +1,391 @@
+"""
+Full-text search for the Prompt Generator application.
+Maintains an inverted index over the fields of saved prompts.
+"""
+
+import heapq
+import json
+import os
+import re
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Set, Iterable, Tuple
+
+from .manifest import prompt_metadata
+from .pagination import validate_sort_key
+
+
+INDEX_VERSION = 1
+
+# Timestamps are listing metadata, not searchable text
+UNINDEXED_FIELDS = ("created_at", "updated_at")
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_RE = re.compile(r'\(|\)|-|[^\s()]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase search terms."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted index mapping search terms to prompt filenames.
+
+    Every string field emitted by a prompt's to_dict() is tokenized. Each
+    term is posted twice: once on its own and once qualified by the field
+    name, so queries can match anywhere or within a single field.
+
+    Postings loaded from disk stay encoded until a query touches them, and
+    removed prompts are only tombstoned; their stale postings are filtered
+    out of results and dropped when the index is compacted on save.
+
+    Query syntax:
+        python loops          both terms (AND is implicit)
+        python OR ruby        either term
+        NOT draft, -draft     exclude a term
+        topic:python          term within a field
+        pyth*                 term prefix
+        (a OR b) c            grouping
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the index.
+
+        Args:
+            path: File the index is persisted to, or None for memory only
+        """
+        self.path = path
+        self.docs = []          # doc id -> listing metadata, None if removed
+        self.doc_ids = {}       # filename -> doc id
+        self.postings = {}      # term key -> set of doc ids, or encoded str
+        self._vocabulary = None
+        self._universe = None
+        self._dirty = False
+
+        if path:
+            self.load()
+
+    @staticmethod
+    def _keys(data: Dict[str, Any]) -> Set[str]:
+        """Get the term keys posted for a prompt."""
+        keys = set()
+        for field, value in data.items():
+            if field in UNINDEXED_FIELDS or not isinstance(value, str):
+                continue
+            for term in tokenize(value):
+                keys.add(term)
+                keys.add(f"{field}:{term}")
+        return keys
+
+    def __len__(self):
+        """Get the number of indexed prompts."""
+        return len(self.doc_ids)
+
+    def __contains__(self, filename):
+        """Check whether a prompt is indexed."""
+        return filename in self.doc_ids
+
+    def add(self, filename: str, data: Dict[str, Any]) -> None:
+        """Index a prompt, replacing any previous version of it."""
+        self.remove(filename)
+
+        doc_id = len(self.docs)
+        meta = {"filename": filename}
+        meta.update(prompt_metadata(data))
+        self.docs.append(meta)
+        self.doc_ids[filename] = doc_id
+
+        postings = self.postings
+        for key in self._keys(data):
+            posting = postings.get(key)
+            if posting is None:
+                postings[key] = {doc_id}
+                self._vocabulary = None
+            else:
+                if posting.__class__ is str:
+                    posting = self._posting(key)
+                posting.add(doc_id)
+
+        self._universe = None
+        self._dirty = True
+
+    def remove(self, filename: str) -> bool:
+        """Remove a prompt from the index."""
+        doc_id = self.doc_ids.pop(filename, None)
+        if doc_id is None:
+            return False
+
+        self.docs[doc_id] = None
+        self._universe = None
+        self._dirty = True
+        return True
+
+    def _posting(self, key: str) -> Set[int]:
+        """Get the doc ids posted under a term key, decoding them if needed."""
+        posting = self.postings.get(key)
+        if posting is None:
+            return set()
+        if posting.__class__ is str:
+            posting = set(map(int, posting.split()))
+            self.postings[key] = posting
+        return posting
+
+    def entry(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Get the listing metadata stored for an indexed prompt."""
+        doc_id = self.doc_ids.get(filename)
+        return None if doc_id is None else self.docs[doc_id]
+
+    def _lookup(self, key: str) -> Set[int]:
+        """Get the doc ids posted under a term key, expanding prefixes."""
+        if not key.endswith("*"):
+            return self._posting(key)
+
+        prefix = key[:-1]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+
+        result = set()
+        vocabulary = self._vocabulary
+        for i in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[i].startswith(prefix):
+                break
+            result |= self._posting(vocabulary[i])
+        return result
+
+    def _term(self, token: str) -> Set[int]:
+        """Evaluate a single query term, which may expand to several words."""
+        field = ""
+        if ":" in token:
+            field, token = token.split(":", 1)
+            field = f"{field.lower()}:"
+
+        prefix = token.endswith("*")
+        words = tokenize(token)
+        if not words:
+            return self._all()
+
+        result = None
+        for i, word in enumerate(words):
+            if prefix and i == len(words) - 1:
+                word += "*"
+            matches = self._lookup(field + word)
+            result = matches if result is None else result & matches
+        return result
+
+    def _all(self) -> Set[int]:
+        """Get the ids of every indexed prompt."""
+        if self._universe is None:
+            self._universe = set(self.doc_ids.values())
+        return self._universe
+
+    def _parse(self, tokens: List[str], pos: int) -> Tuple[Set[int], int]:
+        """Evaluate an OR expression starting at tokens[pos]."""
+        result, pos = self._parse_and(tokens, pos)
+        while pos < len(tokens) and tokens[pos] == "OR":
+            right, pos = self._parse_and(tokens, pos + 1)
+            result = result | right
+        return result, pos
+
+    def _parse_and(self, tokens: List[str], pos: int) -> Tuple[Set[int], int]:
+        """Evaluate a run of implicitly or explicitly ANDed terms."""
+        result = None
+        excluded = []
+        while pos < len(tokens) and tokens[pos] not in ("OR", ")"):
+            token = tokens[pos]
+            if token == "AND":
+                pos += 1
+                continue
+            if token in ("NOT", "-") and pos + 1 < len(tokens):
+                # Subtract exclusions at the end instead of complementing
+                operand, pos = self._parse_unary(tokens, pos + 1)
+                excluded.append(operand)
+                continue
+            operand, pos = self._parse_unary(tokens, pos)
+            result = operand if result is None else result & operand
+
+        if result is None:
+            result = self._all()
+        if excluded:
+            result = result.difference(*excluded)
+        return result, pos
+
+    def _parse_unary(self, tokens: List[str], pos: int) -> Tuple[Set[int], int]:
+        """Evaluate a negation, a group or a single term."""
+        token = tokens[pos]
+        if token in ("NOT", "-"):
+            if pos + 1 >= len(tokens):
+                return self._all(), pos + 1
+            operand, pos = self._parse_unary(tokens, pos + 1)
+            return self._all() - operand, pos
+        if token == "(":
+            result, pos = self._parse(tokens, pos + 1)
+            if pos < len(tokens) and tokens[pos] == ")":
+                pos += 1
+            return result, pos
+        return self._term(token), pos + 1
+
+    def match_ids(self, query: str, prompt_type: Optional[str] = None) -> List[int]:
+        """Get the ids of the prompts matching a query, in no particular order."""
+        tokens = _QUERY_RE.findall(query)
+        if not tokens:
+            return []
+
+        matches, _ = self._parse(tokens, 0)
+
+        docs = self.docs
+        return [
+            doc_id for doc_id in matches
+            if docs[doc_id] is not None
+            and (prompt_type is None or docs[doc_id]["type"] == prompt_type)
+        ]
+
+    def search(self, query: str, prompt_type: Optional[str] = None,
+               sort_key: Optional[str] = None, reverse: bool = True,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Find the prompts matching a query.
+
+        Matches are selected as doc ids, ordered by (sort_key, filename) as
+        in select_page, and only the returned ones are copied into
+        metadata dicts. With a limit, a top-K heap picks them without
+        sorting every match.
+
+        Args:
+            query: Query string (see the class docstring for the syntax)
+            prompt_type: Only return prompts of this type
+            sort_key: Field to sort by, or None to leave results unsorted
+            reverse: Sort in descending order
+            limit: Maximum number of results, or None for all
+
+        Returns:
+            Listing metadata of the matching prompts
+        """
+        doc_ids = self.match_ids(query, prompt_type)
+        docs = self.docs
+
+        if sort_key is not None:
+            validate_sort_key(sort_key)
+
+            def key(doc_id):
+                meta = docs[doc_id]
+                return (meta.get(sort_key) or "", meta["filename"])
+
+            if limit is None:
+                doc_ids.sort(key=key, reverse=reverse)
+            elif reverse:
+                doc_ids = heapq.nlargest(limit, doc_ids, key=key)
+            else:
+                doc_ids = heapq.nsmallest(limit, doc_ids, key=key)
+        elif limit is not None:
+            doc_ids = doc_ids[:limit]
+
+        return [dict(docs[doc_id]) for doc_id in doc_ids]
+
+    def sync(self, entries: Iterable[Dict[str, Any]], load) -> int:
+        """Reconcile the index with the current contents of the library.
+
+        Prompts that are new or whose updated_at changed are re-indexed
+        and prompts that no longer exist are dropped.
+
+        Args:
+            entries: Listing entries of every saved prompt
+            load: Function returning the prompt data for a filename
+
+        Returns:
+            Number of prompts added, updated or removed
+        """
+        changed = 0
+        seen = set()
+        for entry in entries:
+            filename = entry["filename"]
+            seen.add(filename)
+            indexed = self.entry(filename)
+            if indexed is not None and indexed["updated_at"] == entry.get("updated_at", ""):
+                continue
+
+            data = load(filename)
+            if data is not None:
+                self.add(filename, data)
+                changed += 1
+
+        for filename in [name for name in self.doc_ids if name not in seen]:
+            self.remove(filename)
+            changed += 1
+
+        return changed
+
+    def load(self) -> bool:
+        """Load the index from disk."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading search index: {e}")
+            return False
+
+        if data.get("version") != INDEX_VERSION:
+            return False
+
+        self.docs = data["docs"]
+        self.doc_ids = {
+            meta["filename"]: doc_id
+            for doc_id, meta in enumerate(self.docs)
+            if meta is not None
+        }
+        self.postings = data["postings"]
+        self._vocabulary = None
+        self._universe = None
+        self._dirty = False
+        return True
+
+    def _compact(self) -> None:
+        """Renumber the documents to drop tombstones and stale postings."""
+        remap = {}
+        docs = []
+        for doc_id, meta in enumerate(self.docs):
+            if meta is not None:
+                remap[doc_id] = len(docs)
+                docs.append(meta)
+
+        postings = {}
+        for key in list(self.postings):
+            posting = {remap[doc_id] for doc_id in self._posting(key) if doc_id in remap}
+            if posting:
+                postings[key] = posting
+
+        self.docs = docs
+        self.doc_ids = {filename: remap[doc_id] for filename, doc_id in self.doc_ids.items()}
+        self.postings = postings
+        self._vocabulary = None
+        self._universe = None
+
+    def save(self) -> None:
+        """Write the index to disk if it has changed."""
+        if not self.path or not self._dirty:
+            return
+
+        # Compacting decodes every posting, so only do it once tombstones
+        # make up a sizeable share of the index
+        if len(self.docs) > 1.25 * len(self.doc_ids) + 100:
+            self._compact()
+
+        postings = {
+            key: posting if posting.__class__ is str
+            else " ".join(map(str, sorted(posting)))
+            for key, posting in self.postings.items()
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "docs": self.docs,
+                    "postings": postings
+                }, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            print(f"Error saving search index: {e}")
@@ -0,0 +1,953 @@
+"""
+Storage backends for the Prompt Generator application.
+Provides pluggable persistence for prompts, templates and history.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Iterator, Tuple, Sequence
+
+from .content_store import content_digest, strip_timestamps, restore_timestamps
+from .history_log import HistoryLog
+from .manifest import DirectoryManifest, MANIFEST_NAME
+from .pagination import page_cursor, select_page, validate_sort_key
+from .revision_store import DELTA_KEY, make_delta, apply_delta, encoded_size
+
+
+PROMPTS = "prompts"
+TEMPLATES = "templates"
+COLLECTIONS = (PROMPTS, TEMPLATES)
+
+
+class StorageBackend:
+    """Interface shared by all prompt storage backends.
+
+    Prompts and templates live in named collections and are addressed by
+    filename, so callers never need to know how the data is persisted.
+    """
+
+    # Maximum number of deltas between two full copies of a prompt
+    keyframe_interval = 16
+
+    # Number of recently stored revisions kept in memory as delta bases
+    revision_cache_size = 64
+
+    # digest -> (content, delta chain length), created on first use
+    _revision_cache = None
+
+    def save(self, collection: str, filename: str, data: Dict[str, Any]) -> str:
+        """Store prompt data and return its location."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def save_many(self, collection: str,
+                  items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store several prompts given as (filename, data) pairs."""
+        for filename, data in items:
+            self.save(collection, filename, data)
+
+    def load(self, collection: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Return stored prompt data, or None if it does not exist."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def stat_token(self, collection: str, filename: str) -> Optional[Tuple[Any, ...]]:
+        """Return a value that changes whenever a stored prompt changes.
+
+        Returns:
+            A hashable token, or None if the prompt does not exist or the
+            backend cannot tell cheaply
+        """
+        return None
+
+    def refresh_entry(self, collection: str, filename: str) -> None:
+        """Update cached listing data for a prompt changed by another process."""
+        pass
+
+    def set_watched(self, watched: bool) -> None:
+        """Tell the backend whether a watcher reports changes to it."""
+        pass
+
+    def iter_entries(self, collection: str,
+                     prompt_type: str = None) -> Iterator[Dict[str, Any]]:
+        """Yield unsorted listing entries for a collection."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def query(self, collection: str, prompt_type: str = None,
+              sort_key: str = "updated_at", reverse: bool = True,
+              offset: int = 0, after_key: Optional[Sequence[Any]] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return one sorted page of listing entries.
+
+        Args:
+            collection: Collection to list
+            prompt_type: Only list prompts of this type
+            sort_key: Field to sort by
+            reverse: Sort in descending order
+            offset: Number of entries to skip
+            after_key: Cursor of the last entry of the previous page
+            limit: Maximum number of entries, or None for all
+
+        Returns:
+            List of listing entries in sort order
+        """
+        return select_page(
+            self.iter_entries(collection, prompt_type),
+            sort_key, reverse, offset, after_key, limit
+        )
+
+    def iter_query(self, collection: str, prompt_type: str = None,
+                   sort_key: str = "updated_at", reverse: bool = True,
+                   page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield every listing entry of a collection in sort order.
+
+        Entries are fetched a page at a time, each page resuming from the
+        cursor of the previous one.
+        """
+        after_key = None
+        while True:
+            entries = self.query(collection, prompt_type, sort_key, reverse,
+                                 after_key=after_key, limit=page_size)
+            yield from entries
+            if len(entries) < page_size:
+                return
+            after_key = page_cursor(entries[-1], sort_key)
+
+    def delete(self, collection: str, filename: str) -> bool:
+        """Delete a stored prompt."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def iter_items(self, collection: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, data) pairs for every prompt in a collection."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def add_history(self, filename: str, data: Dict[str, Any]) -> bool:
+        """Append a prompt snapshot to the history.
+
+        The snapshot content is stored once as a blob keyed by its digest
+        and the history record only points at it. Saving a prompt whose
+        content matches its latest history record adds nothing.
+        Revisions of the same title are stored as deltas against the
+        previous one (see store_revision).
+
+        Args:
+            filename: Name of the history entry
+            data: Prompt data as returned by to_dict()
+
+        Returns:
+            True if a history record was added
+        """
+        digest = content_digest(data)
+        previous = self._latest_history_blob(data.get("title", ""))
+        if previous == digest:
+            return False
+
+        self.store_revision(digest, strip_timestamps(data), previous)
+        self._append_history({
+            "filename": filename,
+            "title": data.get("title", ""),
+            "type": data.get("type", ""),
+            "created_at": data.get("created_at", ""),
+            "updated_at": data.get("updated_at", ""),
+            "blob": digest
+        })
+        return True
+
+    def _append_history(self, record: Dict[str, Any]) -> None:
+        """Store a history record that points at a blob."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def _latest_history_blob(self, title: str) -> Optional[str]:
+        """Get the blob digest of the newest history record for a title."""
+        for entry in self.iter_history_entries():
+            if entry["title"] == title:
+                return entry.get("blob")
+        return None
+
+    def _read_history(self, entry_id: Any) -> Optional[Dict[str, Any]]:
+        """Get a stored history record, including any inline data."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def store_revision(self, digest: str, content: Dict[str, Any],
+                       previous: Optional[str] = None) -> bool:
+        """Store the content of a revision, as a delta where possible.
+
+        The content is stored as per-field line diffs against the previous
+        revision unless that would make the delta chain longer than
+        keyframe_interval or the delta is no smaller than the content, in
+        which case a full keyframe is written.
+
+        Args:
+            digest: Digest of the content
+            content: Prompt content without timestamps
+            previous: Digest of the revision to diff against, if any
+
+        Returns:
+            True if a blob was written
+        """
+        if self.has_blob(digest):
+            return False
+
+        blob = content
+        depth = 0
+        base = self._revision_base(previous) if previous else None
+        if base is not None:
+            base_content, base_depth = base
+            depth = base_depth + 1
+            if depth < self.keyframe_interval:
+                delta = make_delta(base_content, content)
+                if encoded_size(delta) < encoded_size(content):
+                    delta.update(base=previous, depth=depth)
+                    blob = {DELTA_KEY: delta}
+        if blob is content:
+            depth = 0
+
+        written = self.put_blob(digest, blob)
+        # The next save of the same title diffs against this revision, so
+        # keep it instead of replaying its delta chain from storage then
+        cache = self._revision_cache
+        if cache is None:
+            cache = self._revision_cache = OrderedDict()
+        cache[digest] = (content, depth)
+        if len(cache) > self.revision_cache_size:
+            cache.popitem(last=False)
+        return written
+
+    def _revision_base(self, digest: str) -> Optional[Tuple[Dict[str, Any], int]]:
+        """Get the content of a revision and the length of its delta chain."""
+        cache = self._revision_cache
+        if cache is not None and digest in cache:
+            cache.move_to_end(digest)
+            return cache[digest]
+
+        blob = self.get_blob(digest)
+        if blob is None:
+            return None
+        content = self.load_revision(digest)
+        if content is None:
+            return None
+        return content, blob[DELTA_KEY]["depth"] if DELTA_KEY in blob else 0
+
+    def load_revision(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Rebuild the content of a revision by replaying its delta chain."""
+        deltas = []
+        blob = self.get_blob(digest)
+        while blob is not None and DELTA_KEY in blob:
+            deltas.append(blob[DELTA_KEY])
+            blob = self.get_blob(blob[DELTA_KEY]["base"])
+
+        if blob is None:
+            return None
+
+        for delta in reversed(deltas):
+            blob = apply_delta(blob, delta)
+        return blob
+
+    def put_blob(self, digest: str, content: Dict[str, Any]) -> bool:
+        """Store a blob under its digest unless it is already stored.
+
+        Returns:
+            True if the content was written
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def get_blob(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Get the blob stored under a digest, which may be a delta."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def has_blob(self, digest: str) -> bool:
+        """Check whether a blob is stored under a digest."""
+        return self.get_blob(digest) is not None
+
+    def prune_history(self, max_entries: int) -> None:
+        """Limit the history to the most recent entries."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def iter_history_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield listing entries for the history, newest first.
+
+        Each entry carries an "id" that can be passed to load_history.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def load_history(self, entry_id: Any) -> Optional[Dict[str, Any]]:
+        """Return the prompt data of a history entry."""
+        record = self._read_history(entry_id)
+        if record is None:
+            return None
+
+        # Records written before content addressing carry their data inline
+        if record.get("data") is not None:
+            return record["data"]
+
+        content = self.load_revision(record["blob"])
+        if content is None:
+            return None
+        return restore_timestamps(content, record)
+
+    def query_history(self, offset: int = 0,
+                      after_key: Optional[Sequence[Any]] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return one page of history entries, newest first."""
+        return select_page(
+            self.iter_history_entries(), "updated_at", True,
+            offset, after_key, limit, id_field="id"
+        )
+
+    def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the most recent history entries with their content."""
+        history_entries = self.query_history(limit=limit)
+        for entry in history_entries:
+            entry["content"] = self.load_history(entry["id"])
+        return history_entries
+
+    def iter_history(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, data) pairs for every history entry, oldest first."""
+        entries = list(self.iter_history_entries())
+        for entry in reversed(entries):
+            data = self.load_history(entry["id"])
+            if data is not None:
+                yield entry["filename"], data
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+        pass
+
+
+class JSONFileStorage(StorageBackend):
+    """Stores every prompt as its own JSON file.
+
+    This is the original on-disk layout: one directory per collection plus
+    a history directory under the base directory. Listings are served from
+    a sidecar manifest in each collection directory, and the history is an
+    append-only log of JSONL segments.
+    """
+
+    def __init__(self, base_dir: str):
+        """Initialize the storage and create its directories."""
+        self.base_dir = base_dir
+        self.prompts_dir = os.path.join(base_dir, "prompts")
+        self.templates_dir = os.path.join(base_dir, "templates")
+        self.history_dir = os.path.join(base_dir, "history")
+
+        os.makedirs(self.prompts_dir, exist_ok=True)
+        os.makedirs(self.templates_dir, exist_ok=True)
+        os.makedirs(self.history_dir, exist_ok=True)
+
+        self.directories = {
+            PROMPTS: self.prompts_dir,
+            TEMPLATES: self.templates_dir
+        }
+        self.manifests = {
+            collection: DirectoryManifest(directory)
+            for collection, directory in self.directories.items()
+        }
+        self.blobs_dir = os.path.join(self.history_dir, "blobs")
+        self.history = HistoryLog(self.history_dir)
+        self._migrate_history_files()
+
+    def _path(self, collection: str, filename: str) -> str:
+        """Get the file path for a prompt in a collection."""
+        return os.path.join(self.directories[collection], filename)
+
+    def _read(self, filepath: str) -> Dict[str, Any]:
+        """Read a JSON file."""
+        with open(filepath, 'r') as f:
+            return json.load(f)
+
+    def _write(self, filepath: str, data: Dict[str, Any]) -> None:
+        """Write a JSON file."""
+        with open(filepath, 'w') as f:
+            json.dump(data, f, indent=4)
+
+    def save(self, collection: str, filename: str, data: Dict[str, Any]) -> str:
+        """Store prompt data and return its file path."""
+        filepath = self._path(collection, filename)
+        self._write(filepath, data)
+        self.manifests[collection].record(filename, data)
+        return filepath
+
+    def save_many(self, collection: str,
+                  items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store several prompt files and write the manifest once."""
+        super().save_many(collection, items)
+        self.manifests[collection].flush()
+
+    def load(self, collection: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Return stored prompt data, or None if it does not exist."""
+        filepath = self._path(collection, filename)
+
+        if not os.path.exists(filepath):
+            return None
+
+        return self._read(filepath)
+
+    def stat_token(self, collection: str, filename: str) -> Optional[Tuple[Any, ...]]:
+        """Return (path, mtime_ns, size) of a prompt file."""
+        filepath = self._path(collection, filename)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return (filepath, stat.st_mtime_ns, stat.st_size)
+
+    def refresh_entry(self, collection: str, filename: str) -> None:
+        """Re-read the manifest entry of a single prompt file."""
+        self.manifests[collection].update(filename)
+
+    def set_watched(self, watched: bool) -> None:
+        """Serve listings from the manifests without rescanning while watched."""
+        for manifest in self.manifests.values():
+            if watched:
+                # Start from an up-to-date manifest; the watcher takes over
+                manifest.refresh()
+            manifest.watched = watched
+
+    def iter_entries(self, collection: str,
+                     prompt_type: str = None) -> Iterator[Dict[str, Any]]:
+        """Yield unsorted listing entries for a collection."""
+        for entry in self.manifests[collection].iter_entries():
+            if prompt_type is None or entry["type"] == prompt_type:
+                yield entry
+
+    def iter_query(self, collection: str, prompt_type: str = None,
+                   sort_key: str = "updated_at", reverse: bool = True,
+                   page_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """Yield every listing entry of a collection in sort order.
+
+        Every query refreshes the manifest and scans all of its entries, so
+        paging through it would cost a full scan per page. Instead the
+        manifest is refreshed and sorted once for the whole iteration.
+        """
+        yield from self.query(collection, prompt_type, sort_key, reverse)
+
+    def delete(self, collection: str, filename: str) -> bool:
+        """Delete a prompt file."""
+        filepath = self._path(collection, filename)
+
+        if not os.path.exists(filepath):
+            return False
+
+        try:
+            os.remove(filepath)
+            self.manifests[collection].discard(filename)
+            return True
+        except Exception as e:
+            print(f"Error deleting {filepath}: {e}")
+            return False
+
+    def _iter_dir(self, directory: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, data) pairs for the JSON files in a directory."""
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json') or filename.startswith('.'):
+                continue
+
+            try:
+                data = self._read(os.path.join(directory, filename))
+            except Exception as e:
+                print(f"Error reading file {filename}: {e}")
+                continue
+
+            yield filename, data
+
+    def iter_items(self, collection: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, data) pairs for every prompt in a collection."""
+        return self._iter_dir(self.directories[collection])
+
+    def close(self) -> None:
+        """Write any pending manifest changes."""
+        for manifest in self.manifests.values():
+            manifest.flush()
+
+    def _migrate_history_files(self) -> None:
+        """Move history saved as one JSON file per entry into the log."""
+        legacy = []
+        for filename, data in self._iter_dir(self.history_dir):
+            filepath = os.path.join(self.history_dir, filename)
+            legacy.append((os.path.getmtime(filepath), filename, data))
+
+        if not legacy:
+            return
+
+        legacy.sort(key=lambda item: item[0])
+        for _, filename, data in legacy:
+            self.add_history(filename, data)
+
+        for _, filename, _ in legacy:
+            try:
+                os.remove(os.path.join(self.history_dir, filename))
+            except Exception as e:
+                print(f"Error migrating history file {filename}: {e}")
+
+        manifest_path = os.path.join(self.history_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+    def _append_history(self, record: Dict[str, Any]) -> None:
+        """Append a history record to the log."""
+        self.history.append(record, {})
+
+    def _latest_history_blob(self, title: str) -> Optional[str]:
+        """Get the blob digest of the newest history record for a title."""
+        record = self.history.latest_for_title(title)
+        return record.get("blob") if record is not None else None
+
+    def _read_history(self, entry_id: Any) -> Optional[Dict[str, Any]]:
+        """Read a history record from the log."""
+        return self.history.read(int(entry_id))
+
+    def _blob_path(self, digest: str) -> str:
+        """Get the file path of a blob, fanned out by digest prefix."""
+        return os.path.join(self.blobs_dir, digest[:2], f"{digest}.json")
+
+    def put_blob(self, digest: str, content: Dict[str, Any]) -> bool:
+        """Write a blob file unless it already exists."""
+        filepath = self._blob_path(digest)
+        if os.path.exists(filepath):
+            return False
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(content, f)
+        os.replace(tmp_path, filepath)
+        return True
+
+    def has_blob(self, digest: str) -> bool:
+        """Check whether a blob file exists."""
+        return os.path.exists(self._blob_path(digest))
+
+    def get_blob(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Read a blob file."""
+        filepath = self._blob_path(digest)
+        if not os.path.exists(filepath):
+            return None
+        return self._read(filepath)
+
+    def prune_history(self, max_entries: int) -> None:
+        """Limit the history to the most recent entries."""
+        if self.history.prune(max_entries):
+            self._collect_blobs()
+
+    def _collect_blobs(self) -> None:
+        """Delete blobs no longer referenced by any history record."""
+        if not os.path.isdir(self.blobs_dir):
+            return
+
+        referenced = set()
+        pending = [
+            record["blob"] for record in self.history.iter_stored() if "blob" in record
+        ]
+        while pending:
+            digest = pending.pop()
+            if digest in referenced:
+                continue
+            referenced.add(digest)
+
+            # Keep the bases a delta is rebuilt from
+            blob = self.get_blob(digest)
+            if blob is not None and DELTA_KEY in blob:
+                pending.append(blob[DELTA_KEY]["base"])
+
+        for prefix in os.listdir(self.blobs_dir):
+            prefix_dir = os.path.join(self.blobs_dir, prefix)
+            for filename in os.listdir(prefix_dir):
+                if filename[:-5] in referenced:
+                    continue
+                try:
+                    os.remove(os.path.join(prefix_dir, filename))
+                except Exception as e:
+                    print(f"Error pruning history blob: {e}")
+
+    def iter_history_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield listing entries for the history, newest first."""
+        return self.history.iter_entries()
+
+    def query_history(self, offset: int = 0,
+                      after_key: Optional[Sequence[Any]] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return one page of history entries, newest first.
+
+        Log records are ordered by id, so a page is read backwards from
+        the tail of the log without looking at older segments.
+        """
+        before_id = after_key[1] if after_key is not None else None
+        count = None if limit is None else offset + limit
+        return self.history.latest(count, before_id)[offset:]
+
+
+class SQLiteStorage(StorageBackend):
+    """Stores prompts, templates and history in a single SQLite database.
+
+    The database runs in WAL mode so readers never block the writer, and
+    listing columns are indexed so libraries with tens of thousands of
+    prompts can be listed without touching the prompt bodies.
+    """
+
+    # Rows read per query when iterating over prompt bodies
+    fetch_size = 500
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS prompts (
+            collection TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            title TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL DEFAULT '',
+            updated_at TEXT NOT NULL DEFAULT '',
+            data TEXT NOT NULL,
+            PRIMARY KEY (collection, filename)
+        );
+        CREATE INDEX IF NOT EXISTS idx_prompts_type
+            ON prompts (collection, type);
+        CREATE INDEX IF NOT EXISTS idx_prompts_title
+            ON prompts (collection, title);
+        CREATE INDEX IF NOT EXISTS idx_prompts_updated_at
+            ON prompts (collection, updated_at);
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filename TEXT NOT NULL,
+            title TEXT NOT NULL DEFAULT '',
+            type TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL DEFAULT '',
+            updated_at TEXT NOT NULL DEFAULT '',
+            data TEXT NOT NULL DEFAULT '',
+            blob TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_history_updated_at
+            ON history (updated_at, id);
+        CREATE TABLE IF NOT EXISTS blobs (
+            digest TEXT PRIMARY KEY,
+            base TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: str):
+        """Open (and if needed create) the database."""
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._upgrade_schema()
+        self._conn.commit()
+
+    def _upgrade_schema(self) -> None:
+        """Add columns introduced after a database was created."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(history)")}
+        if "blob" not in columns:
+            self._conn.execute("ALTER TABLE history ADD COLUMN blob TEXT")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(blobs)")}
+        if "base" not in columns:
+            self._conn.execute("ALTER TABLE blobs ADD COLUMN base TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_history_title ON history (title, id)"
+        )
+
+    @staticmethod
+    def _columns(data: Dict[str, Any]) -> Tuple[str, str, str, str, str]:
+        """Extract the indexed columns and the serialized body."""
+        return (
+            data.get("title", "") or "",
+            data.get("type", "") or "",
+            data.get("created_at", "") or "",
+            data.get("updated_at", "") or "",
+            json.dumps(data)
+        )
+
+    def save(self, collection: str, filename: str, data: Dict[str, Any]) -> str:
+        """Store prompt data and return its filename."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prompts "
+                "(collection, filename, title, type, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (collection, filename) + self._columns(data)
+            )
+        return filename
+
+    def save_many(self, collection: str,
+                  items: Sequence[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store several prompts in a single transaction."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO prompts "
+                "(collection, filename, title, type, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(collection, filename) + self._columns(data) for filename, data in items]
+            )
+
+    def load(self, collection: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Return stored prompt data, or None if it does not exist."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM prompts WHERE collection = ? AND filename = ?",
+                (collection, filename)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0])
+
+    def stat_token(self, collection: str, filename: str) -> Optional[Tuple[Any, ...]]:
+        """Return the updated_at and body length of a stored prompt."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT updated_at, length(data) FROM prompts "
+                "WHERE collection = ? AND filename = ?",
+                (collection, filename)
+            ).fetchone()
+        return None if row is None else (collection, filename) + tuple(row)
+
+    def iter_entries(self, collection: str,
+                     prompt_type: str = None) -> Iterator[Dict[str, Any]]:
+        """Yield unsorted listing entries without reading prompt bodies."""
+        return iter(self.query(collection, prompt_type, "filename", False))
+
+    def query(self, collection: str, prompt_type: str = None,
+              sort_key: str = "updated_at", reverse: bool = True,
+              offset: int = 0, after_key: Optional[Sequence[Any]] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return one sorted page of listing entries using the indexes."""
+        validate_sort_key(sort_key)
+        order = "DESC" if reverse else "ASC"
+
+        query = (
+            "SELECT filename, title, type, created_at, updated_at "
+            "FROM prompts WHERE collection = ?"
+        )
+        params = [collection]
+        if prompt_type is not None:
+            query += " AND type = ?"
+            params.append(prompt_type)
+        if after_key is not None:
+            query += f" AND ({sort_key}, filename) {'<' if reverse else '>'} (?, ?)"
+            params.extend(after_key)
+        query += f" ORDER BY {sort_key} {order}, filename {order} LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {
+                "filename": filename,
+                "title": title,
+                "type": row_type,
+                "created_at": created_at,
+                "updated_at": updated_at
+            }
+            for filename, title, row_type, created_at, updated_at in rows
+        ]
+
+    def delete(self, collection: str, filename: str) -> bool:
+        """Delete a stored prompt."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM prompts WHERE collection = ? AND filename = ?",
+                (collection, filename)
+            )
+        return cursor.rowcount > 0
+
+    def iter_items(self, collection: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, data) pairs for every prompt in a collection.
+
+        Rows are fetched in filename order a batch at a time, so the whole
+        collection is never held in memory.
+        """
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT filename, data FROM prompts "
+                    "WHERE collection = ? AND filename > ? "
+                    "ORDER BY filename LIMIT ?",
+                    (collection, last, self.fetch_size)
+                ).fetchall()
+
+            for filename, data in rows:
+                yield filename, json.loads(data)
+
+            if len(rows) < self.fetch_size:
+                return
+            last = rows[-1][0]
+
+    def _append_history(self, record: Dict[str, Any]) -> None:
+        """Insert a history record that points at a blob."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO history "
+                "(filename, title, type, created_at, updated_at, blob) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (record["filename"], record["title"], record["type"],
+                 record["created_at"], record["updated_at"], record["blob"])
+            )
+
+    def _latest_history_blob(self, title: str) -> Optional[str]:
+        """Get the blob digest of the newest history record for a title."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM history WHERE title = ? ORDER BY id DESC LIMIT 1",
+                (title,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _read_history(self, entry_id: Any) -> Optional[Dict[str, Any]]:
+        """Read a history record."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, updated_at, data, blob FROM history WHERE id = ?",
+                (entry_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        created_at, updated_at, data, blob = row
+        return {
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "data": json.loads(data) if data else None,
+            "blob": blob
+        }
+
+    def put_blob(self, digest: str, content: Dict[str, Any]) -> bool:
+        """Insert a blob unless it already exists."""
+        base = content[DELTA_KEY]["base"] if DELTA_KEY in content else None
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, base, data) VALUES (?, ?, ?)",
+                (digest, base, json.dumps(content))
+            )
+        return cursor.rowcount > 0
+
+    def get_blob(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Read a blob."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def prune_history(self, max_entries: int) -> None:
+        """Limit the history to the most recent entries."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM history WHERE id NOT IN "
+                "(SELECT id FROM history ORDER BY id DESC LIMIT ?)",
+                (max_entries,)
+            )
+            if cursor.rowcount > 0:
+                # Blobs stay while a record or a delta built on them needs them
+                self._conn.execute(
+                    "WITH RECURSIVE live (digest) AS ("
+                    " SELECT blob FROM history WHERE blob IS NOT NULL"
+                    " UNION SELECT blobs.base FROM blobs"
+                    " JOIN live ON blobs.digest = live.digest"
+                    " WHERE blobs.base IS NOT NULL"
+                    ") DELETE FROM blobs WHERE digest NOT IN (SELECT digest FROM live)"
+                )
+
+    def iter_history_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield listing entries for the history, newest first."""
+        return iter(self.query_history())
+
+    def query_history(self, offset: int = 0,
+                      after_key: Optional[Sequence[Any]] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return one page of history entries, newest first."""
+        query = (
+            "SELECT id, filename, title, type, created_at, updated_at "
+            "FROM history"
+        )
+        params = []
+        if after_key is not None:
+            query += " WHERE (updated_at, id) < (?, ?)"
+            params.extend(after_key)
+        query += " ORDER BY updated_at DESC, id DESC LIMIT ? OFFSET ?"
+        params.extend([-1 if limit is None else limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {
+                "id": entry_id,
+                "filename": filename,
+                "title": title,
+                "type": row_type,
+                "created_at": created_at,
+                "updated_at": updated_at
+            }
+            for entry_id, filename, title, row_type, created_at, updated_at in rows
+        ]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Read a value from the metadata table."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        """Write a value to the metadata table."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, value)
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(source: JSONFileStorage, target: SQLiteStorage) -> int:
+    """Copy a JSON file library into an SQLite database.
+
+    The migration runs once per database; later calls are no-ops so it is
+    safe to invoke every time the SQLite backend is opened.
+
+    Args:
+        source: The JSON file storage to read from
+        target: The SQLite storage to write to
+
+    Returns:
+        Number of entries copied
+    """
+    if target.get_meta("json_migrated"):
+        return 0
+
+    count = 0
+    with target._lock, target._conn:
+        for collection in COLLECTIONS:
+            for filename, data in source.iter_items(collection):
+                target._conn.execute(
+                    "INSERT OR IGNORE INTO prompts "
+                    "(collection, filename, title, type, created_at, updated_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (collection, filename) + target._columns(data)
+                )
+                count += 1
+
+    # The history is replayed oldest first so its order is kept
+    for filename, data in source.iter_history():
+        if target.add_history(filename, data):
+            count += 1
+
+    target.set_meta("json_migrated", str(count))
+    return count
@@ -0,0 +1,243 @@
+"""
+Variant generation for the Prompt Generator application.
+Renders every combination of alternative field values, for A/B testing.
+"""
+
+import json
+import operator
+import os
+import random
+from collections import deque
+from functools import reduce
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator, Iterable, Sequence, Tuple, Type, Union
+
+from .prompt import BasePrompt
+from .batch_generate import DEFAULT_SEPARATOR, OUTPUT_FORMATS, WRITE_BUFFER_SIZE
+
+
+def render_variants(prompt_class: Type[BasePrompt], fixed: Sequence[Any],
+                    varied: Sequence[Tuple[int, Sequence[Any]]],
+                    indices: Iterable[int]) -> List[Tuple[int, str]]:
+    """Render the variants with the given indices.
+
+    This runs in a worker process, so it only receives picklable arguments.
+
+    Args:
+        prompt_class: Prompt class whose template renders the variants
+        fixed: Values of every template field, in template_fields order
+        varied: (template field index, choices) pairs of the varied fields
+        indices: Variant indices to render
+
+    Returns:
+        List of (index, text) tuples
+    """
+    render = prompt_class.render_template
+    values = list(fixed)
+    results = []
+    for index in indices:
+        # The index is a mixed-radix number; the last field varies fastest
+        remainder = index
+        for position, choices in reversed(varied):
+            remainder, digit = divmod(remainder, len(choices))
+            values[position] = choices[digit]
+        results.append((index, render(*values)))
+    return results
+
+
+class VariantGenerator:
+    """Generates the cartesian product of alternative field values.
+
+    A base prompt supplies every field; for some fields a list of
+    alternative values is given instead. Variant n is the n-th combination
+    in itertools.product order, and the generator can be indexed and
+    sliced like a sequence of variant texts. Combinations are decoded from
+    their index when they are rendered, so the variant space is never
+    materialized: a million variants cost no more memory than ten.
+
+    Duplicate renders are avoided up front. Repeated alternatives are
+    dropped, and only fields that appear in the prompt's text template can
+    be varied, so no two variants differ only in a value that is not
+    rendered.
+
+    Rendering can be spread across a process pool; only a few chunks of
+    indices are in flight at a time and results come back in order.
+    """
+
+    # Variants handed to a worker at a time
+    chunk_size = 5000
+
+    # Chunks in flight per worker process
+    pending_per_worker = 2
+
+    def __init__(self, base: Union[BasePrompt, Type[BasePrompt]],
+                 values: Dict[str, Sequence[Any]], workers: Optional[int] = 1):
+        """Initialize the generator.
+
+        Args:
+            base: Prompt supplying the fixed fields, or a prompt class to
+                leave them empty
+            values: Mapping of template field to its alternative values
+            workers: Number of worker processes, None for one per CPU
+                or 1 to render in this process
+        """
+        if isinstance(base, type):
+            base = base()
+        self.prompt_class = type(base)
+        self.base = base
+
+        if self.prompt_class.template is None:
+            raise ValueError(f"{self.prompt_class.__name__} has no text template")
+
+        template_fields = self.prompt_class.template_fields
+        varied = []
+        for field, choices in values.items():
+            if field not in template_fields:
+                raise ValueError(
+                    f"cannot vary {field!r}; template fields are {', '.join(template_fields)}"
+                )
+            choices = tuple(dict.fromkeys(choices))
+            if not choices:
+                raise ValueError(f"no values given for {field!r}")
+            varied.append((template_fields.index(field), choices))
+
+        # Vary fields in template order so variant order is predictable
+        varied.sort()
+        self.varied = tuple(varied)
+        self.fixed = tuple(getattr(base, field) for field in template_fields)
+        self.size = reduce(operator.mul, (len(choices) for _, choices in self.varied), 1)
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[str, List[str]]:
+        """Render one variant, or a list of variants for a slice.
+
+        Negative indices count from the end, as for a sequence.
+        """
+        if isinstance(key, slice):
+            indices = range(self.size)[key]
+            return [text for _, text in render_variants(self.prompt_class, self.fixed, self.varied, indices)]
+
+        index = operator.index(key)
+        if index < 0:
+            index += self.size
+        return self.render(index)
+
+    def combination(self, index: int) -> Dict[str, Any]:
+        """Get the varied field values of a variant."""
+        if not 0 <= index < self.size:
+            raise IndexError(f"variant index {index} out of range")
+
+        digits = []
+        remainder = index
+        for _, choices in reversed(self.varied):
+            remainder, digit = divmod(remainder, len(choices))
+            digits.append(digit)
+        digits.reverse()
+
+        template_fields = self.prompt_class.template_fields
+        return {
+            template_fields[position]: choices[digit]
+            for (position, choices), digit in zip(self.varied, digits)
+        }
+
+    def render(self, index: int) -> str:
+        """Render the text of one variant."""
+        if not 0 <= index < self.size:
+            raise IndexError(f"variant index {index} out of range")
+        return render_variants(self.prompt_class, self.fixed, self.varied, [index])[0][1]
+
+    def prompt(self, index: int) -> BasePrompt:
+        """Create the prompt object for one variant."""
+        prompt = self.prompt_class.from_dict(self.base.to_dict())
+        prompt.title = f"{self.base.title} #{index + 1}".strip()
+        for field, value in self.combination(index).items():
+            setattr(prompt, field, value)
+        return prompt
+
+    def indices(self, sample: Optional[int] = None, seed: Optional[int] = None) -> Sequence[int]:
+        """Get the indices of the variants to generate.
+
+        Args:
+            sample: Number of variants to pick at random, None for all
+            seed: Seed for the random sample
+
+        Returns:
+            A range over every variant, or the sorted sampled indices
+        """
+        if sample is None or sample >= self.size:
+            return range(self.size)
+        # Sampling from a range does not materialize it
+        return sorted(random.Random(seed).sample(range(self.size), sample))
+
+    def generate(self, sample: Optional[int] = None,
+                 seed: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Lazily render variants in index order.
+
+        Args:
+            sample: Number of variants to pick at random, None for all
+            seed: Seed for the random sample
+
+        Yields:
+            (index, text) tuples
+        """
+        indices = self.indices(sample, seed)
+        chunks = (
+            indices[start:start + self.chunk_size]
+            for start in range(0, len(indices), self.chunk_size)
+        )
+
+        if self.workers == 1:
+            for chunk in chunks:
+                yield from render_variants(self.prompt_class, self.fixed, self.varied, chunk)
+            return
+
+        max_pending = self.workers * self.pending_per_worker
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(
+                    render_variants, self.prompt_class, self.fixed, self.varied, chunk
+                ))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def write(self, path: str, output_format: str = "text",
+              sample: Optional[int] = None, seed: Optional[int] = None,
+              separator: str = DEFAULT_SEPARATOR) -> int:
+        """Render variants straight to a file.
+
+        Args:
+            path: Output file path
+            output_format: "text" for variant texts between separators, or
+                "jsonl" for one {"variant", "values", "text"} object per line
+            sample: Number of variants to pick at random, None for all
+            seed: Seed for the random sample
+            separator: Written between variants in text output
+
+        Returns:
+            Number of variants written
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"output format must be one of {', '.join(OUTPUT_FORMATS)}")
+
+        count = 0
+        with open(path, 'w', encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            for index, text in self.generate(sample, seed):
+                if output_format == "jsonl":
+                    record = {"variant": index, "values": self.combination(index), "text": text}
+                    f.write(json.dumps(record))
+                    f.write("\n")
+                else:
+                    if count:
+                        f.write(separator)
+                    f.write(text)
+                count += 1
+
+            if output_format == "text" and count:
+                f.write("\n")
+        return count
@@ -0,0 +1,145 @@
+"""
+Change watching for the Prompt Generator application.
+Detects prompt files added, modified or deleted outside the application.
+"""
+
+import os
+import queue
+import threading
+from collections import namedtuple
+from typing import List, Dict, Tuple, Callable, Optional
+
+
+ADDED = "added"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+# A change to one prompt file
+ChangeEvent = namedtuple("ChangeEvent", ["kind", "collection", "filename"])
+
+
+class DirectoryScanner:
+    """Compares a directory of JSON files against its previous state.
+
+    Only the mtime and size of each file are kept, so a scan costs one
+    directory listing and no file reads.
+    """
+
+    def __init__(self, collection: str, directory: str):
+        """Initialize the scanner and record the current state as a baseline."""
+        self.collection = collection
+        self.directory = directory
+        self.state = self._stat_files()
+
+    def _stat_files(self) -> Dict[str, Tuple[int, int]]:
+        """Get (mtime_ns, size) for every JSON file in the directory."""
+        state = {}
+        try:
+            with os.scandir(self.directory) as it:
+                for dir_entry in it:
+                    filename = dir_entry.name
+                    if not filename.endswith('.json') or filename.startswith('.'):
+                        continue
+                    try:
+                        stat = dir_entry.stat()
+                    except OSError:
+                        continue
+                    state[filename] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            print(f"Error scanning {self.directory}: {e}")
+            return self.state
+        return state
+
+    def scan(self) -> List[ChangeEvent]:
+        """Get the changes since the previous scan."""
+        previous = self.state
+        current = self._stat_files()
+        self.state = current
+
+        events = []
+        for filename, signature in current.items():
+            old = previous.get(filename)
+            if old is None:
+                events.append(ChangeEvent(ADDED, self.collection, filename))
+            elif old != signature:
+                events.append(ChangeEvent(MODIFIED, self.collection, filename))
+        for filename in previous:
+            if filename not in current:
+                events.append(ChangeEvent(DELETED, self.collection, filename))
+        return events
+
+
+class PollingWatcher:
+    """Portable watcher that polls directories for changes.
+
+    A background thread scans the watched directories every interval and
+    queues the resulting events. Consumers take them with drain() on their
+    own thread, so the watcher never touches their state concurrently.
+    """
+
+    def __init__(self, directories: Dict[str, str], interval: float = 2.0):
+        """Initialize the watcher.
+
+        Args:
+            directories: Mapping of collection name to directory
+            interval: Seconds between scans
+        """
+        self.interval = interval
+        self.scanners = [
+            DirectoryScanner(collection, directory)
+            for collection, directory in directories.items()
+        ]
+        self.events = queue.Queue()
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback: Callable[[List[ChangeEvent]], None]) -> None:
+        """Call a function with each batch of events as it is detected.
+
+        The callback runs on the polling thread.
+        """
+        self._listeners.append(callback)
+
+    def poll(self) -> List[ChangeEvent]:
+        """Scan every directory once and queue the changes found."""
+        events = []
+        for scanner in self.scanners:
+            events.extend(scanner.scan())
+
+        if events:
+            for event in events:
+                self.events.put(event)
+            for callback in self._listeners:
+                callback(events)
+        return events
+
+    def drain(self) -> List[ChangeEvent]:
+        """Take every queued event."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def start(self) -> None:
+        """Start polling in a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Poll until stopped."""
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
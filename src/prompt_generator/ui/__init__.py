@@ -1,31 +1,26 @@
 """
 UI components for the Prompt Generator application.
+
+Widgets are imported from their modules on first access, so importing one
+widget module does not load every other widget.
 """
 
-from .header import HeaderWidget
-from .sidebar import SidebarWidget
-from .content import ContentWidget
-from .footer import FooterWidget
-from .preview import PreviewWidget
-from .welcome import WelcomeWidget
-from .prompt_forms import (
-    BasePromptForm,
-    ChainOfThoughtForm,
-    TreeOfThoughtsForm,
-    ActivePromptForm,
-    PersonaPromptForm
-)
+from .. import _lazy
+
+# Public name -> module that defines it
+_lazy_imports = {
+    "HeaderWidget": "header",
+    "SidebarWidget": "sidebar",
+    "ContentWidget": "content",
+    "FooterWidget": "footer",
+    "PreviewWidget": "preview",
+    "WelcomeWidget": "welcome",
+    "BasePromptForm": "prompt_forms",
+    "ChainOfThoughtForm": "prompt_forms",
+    "TreeOfThoughtsForm": "prompt_forms",
+    "ActivePromptForm": "prompt_forms",
+    "PersonaPromptForm": "prompt_forms"
+}
 
-__all__ = [
-    "HeaderWidget",
-    "SidebarWidget",
-    "ContentWidget",
-    "FooterWidget",
-    "PreviewWidget",
-    "WelcomeWidget",
-    "BasePromptForm",
-    "ChainOfThoughtForm",
-    "TreeOfThoughtsForm",
-    "ActivePromptForm",
-    "PersonaPromptForm"
-]
+__all__ = list(_lazy_imports)
+__getattr__, __dir__ = _lazy.attach(__name__, _lazy_imports)
@@ -90,7 +90,7 @@ class ContentWidget(QWidget):
     
     def update_preview(self, prompt):
         """Update the preview with the generated prompt text."""
-        self.preview_widget.set_preview_text(prompt.generate_text())
+        self.preview_widget.set_preview_parts(prompt.text_parts())
     
     def save_current_prompt(self):
         """Save the current prompt to a file."""
@@ -3,6 +3,12 @@ Preview widget for the Prompt Generator application.
 """
 
 from PyQt5.QtWidgets import QGroupBox, QVBoxLayout, QTextEdit
+from PyQt5.QtGui import QTextCursor
+
+
+def text_length(text):
+    """Get the length of text in the UTF-16 units Qt uses for positions."""
+    return len(text.encode("utf-16-le")) // 2
 
 
 class PreviewWidget(QGroupBox):
@@ -10,6 +16,8 @@ class PreviewWidget(QGroupBox):
     
     def __init__(self, parent=None):
         super().__init__("Prompt Preview", parent)
+        self.parts = None
+        self.part_lengths = None
         self.setup_ui()
     
     def setup_ui(self):
@@ -24,4 +32,59 @@ class PreviewWidget(QGroupBox):
     
     def set_preview_text(self, text):
         """Set the preview text."""
+        self.parts = None
         self.preview_text.setPlainText(text)
+    
+    def set_preview_parts(self, parts):
+        """Set the preview text from a tuple of parts.
+        
+        When the previous text had the same number of parts, only the parts
+        that changed are replaced in the document, so a keystroke in one
+        field costs time in proportion to that field.
+        
+        Args:
+            parts: Tuple of strings that make up the text
+        """
+        previous = self.parts
+        if previous is None or len(previous) != len(parts):
+            self._replace_all(parts)
+            return
+        
+        changed = [
+            index for index, part in enumerate(parts)
+            if part is not previous[index] and part != previous[index]
+        ]
+        if not changed:
+            self.parts = parts
+            return
+        if any("\r" in parts[index] for index in changed):
+            # Qt turns carriage returns into paragraph breaks, so positions
+            # would no longer line up with the parts
+            self._replace_all(parts)
+            return
+        
+        starts = []
+        position = 0
+        for length in self.part_lengths:
+            starts.append(position)
+            position += length
+        
+        # Replace from the end so earlier positions stay valid
+        cursor = QTextCursor(self.preview_text.document())
+        cursor.beginEditBlock()
+        for index in reversed(changed):
+            cursor.setPosition(starts[index])
+            cursor.setPosition(starts[index] + self.part_lengths[index], QTextCursor.KeepAnchor)
+            cursor.insertText(parts[index])
+            self.part_lengths[index] = text_length(parts[index])
+        cursor.endEditBlock()
+        self.parts = parts
+    
+    def _replace_all(self, parts):
+        """Replace the whole preview text with the given parts."""
+        self.preview_text.setPlainText("".join(parts))
+        if any("\r" in part for part in parts):
+            self.parts = None
+            return
+        self.parts = parts
+        self.part_lengths = [text_length(part) for part in parts]
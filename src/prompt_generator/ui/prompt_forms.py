@@ -3,6 +3,8 @@ Prompt form widgets for the Prompt Generator application.
 Provides UI components for different prompt types.
 """
 
+from functools import partial
+
 from PyQt5.QtWidgets import (
     QWidget, QFormLayout, QLineEdit, QTextEdit, 
     QComboBox, QLabel, QVBoxLayout, QHBoxLayout,
@@ -20,6 +22,7 @@ class BasePromptForm(QWidget):
     """Base class for all prompt form widgets."""
     
     prompt_updated = pyqtSignal(BasePrompt)
+    prompt_class = BasePrompt
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -35,7 +38,14 @@ class BasePromptForm(QWidget):
     
     def connect_signals(self):
         """Connect signals to slots."""
-        pass
+        for name, field in self.fields.items():
+            handler = partial(self.field_changed, name)
+            if isinstance(field, QLineEdit):
+                field.textChanged.connect(handler)
+            elif isinstance(field, QTextEdit):
+                field.textChanged.connect(handler)
+            elif isinstance(field, QComboBox):
+                field.currentTextChanged.connect(handler)
     
     def set_prompt(self, prompt):
         """Set the prompt and update the form fields."""
@@ -65,16 +75,36 @@ class BasePromptForm(QWidget):
             elif isinstance(field, QComboBox):
                 field.setCurrentIndex(0)
     
-    def field_changed(self):
-        """Handle field changes."""
+    def field_value(self, name):
+        """Get the current value of a form field."""
+        field = self.fields[name]
+        if isinstance(field, QLineEdit):
+            return field.text()
+        elif isinstance(field, QTextEdit):
+            return field.toPlainText()
+        elif isinstance(field, QComboBox):
+            return field.currentText()
+        return ""
+    
+    def field_changed(self, name, *args):
+        """Handle a change to one field.
+        
+        Only the edited field is read back into the prompt, so the prompt
+        can re-render just that field's part of its text.
+        """
         if self.prompt:
-            self.update_prompt_from_fields()
+            if isinstance(self.prompt, self.prompt_class):
+                setattr(self.prompt, name, self.field_value(name))
+            else:
+                self.update_prompt_from_fields()
             self.prompt_updated.emit(self.prompt)
 
 
 class ChainOfThoughtForm(BasePromptForm):
     """Form for Chain of Thought prompts."""
     
+    prompt_class = ChainOfThoughtPrompt
+    
     def setup_ui(self):
         """Set up the UI components."""
         super().setup_ui()
@@ -104,14 +134,6 @@ class ChainOfThoughtForm(BasePromptForm):
         self.fields["length"] = QLineEdit()
         self.layout.addRow("Length:", self.fields["length"])
     
-    def connect_signals(self):
-        """Connect signals to slots."""
-        for field in self.fields.values():
-            if isinstance(field, QLineEdit):
-                field.textChanged.connect(self.field_changed)
-            elif isinstance(field, QTextEdit):
-                field.textChanged.connect(self.field_changed)
-    
     def update_fields_from_prompt(self):
         """Update form fields from prompt data."""
         if not isinstance(self.prompt, ChainOfThoughtPrompt):
@@ -140,6 +162,8 @@ class ChainOfThoughtForm(BasePromptForm):
 class TreeOfThoughtsForm(BasePromptForm):
     """Form for Tree of Thoughts prompts."""
     
+    prompt_class = TreeOfThoughtsPrompt
+    
     def setup_ui(self):
         """Set up the UI components."""
         super().setup_ui()
@@ -174,14 +198,6 @@ class TreeOfThoughtsForm(BasePromptForm):
         self.fields["length"] = QLineEdit()
         self.layout.addRow("Length:", self.fields["length"])
     
-    def connect_signals(self):
-        """Connect signals to slots."""
-        for field in self.fields.values():
-            if isinstance(field, QLineEdit):
-                field.textChanged.connect(self.field_changed)
-            elif isinstance(field, QTextEdit):
-                field.textChanged.connect(self.field_changed)
-    
     def update_fields_from_prompt(self):
         """Update form fields from prompt data."""
         if not isinstance(self.prompt, TreeOfThoughtsPrompt):
@@ -212,6 +228,8 @@ class TreeOfThoughtsForm(BasePromptForm):
 class ActivePromptForm(BasePromptForm):
     """Form for Active Prompting."""
     
+    prompt_class = ActivePrompt
+    
     def setup_ui(self):
         """Set up the UI components."""
         super().setup_ui()
@@ -246,14 +264,6 @@ class ActivePromptForm(BasePromptForm):
         self.fields["length"] = QLineEdit()
         self.layout.addRow("Length:", self.fields["length"])
     
-    def connect_signals(self):
-        """Connect signals to slots."""
-        for field in self.fields.values():
-            if isinstance(field, QLineEdit):
-                field.textChanged.connect(self.field_changed)
-            elif isinstance(field, QTextEdit):
-                field.textChanged.connect(self.field_changed)
-    
     def update_fields_from_prompt(self):
         """Update form fields from prompt data."""
         if not isinstance(self.prompt, ActivePrompt):
@@ -284,6 +294,8 @@ class ActivePromptForm(BasePromptForm):
 class PersonaPromptForm(BasePromptForm):
     """Form for Persona-based Prompting."""
     
+    prompt_class = PersonaPrompt
+    
     def setup_ui(self):
         """Set up the UI components."""
         super().setup_ui()
@@ -307,12 +319,12 @@ class PersonaPromptForm(BasePromptForm):
         
         # Expertise Level
         self.fields["expertise"] = QComboBox()
-        self.fields["expertise"].addItems(["Beginner", "Intermediate", "Expert", "World-class Expert"])
+        self.fields["expertise"].addItems(PersonaPrompt.expertise_levels)
         self.layout.addRow("Expertise Level:", self.fields["expertise"])
         
         # Communication Style
         self.fields["style"] = QComboBox()
-        self.fields["style"].addItems(["Academic", "Conversational", "Technical", "Simplified", "Socratic"])
+        self.fields["style"].addItems(PersonaPrompt.communication_styles)
         self.layout.addRow("Communication Style:", self.fields["style"])
         
         # Specific Knowledge
@@ -327,16 +339,6 @@ class PersonaPromptForm(BasePromptForm):
         self.fields["length"] = QLineEdit()
         self.layout.addRow("Length:", self.fields["length"])
     
-    def connect_signals(self):
-        """Connect signals to slots."""
-        for field in self.fields.values():
-            if isinstance(field, QLineEdit):
-                field.textChanged.connect(self.field_changed)
-            elif isinstance(field, QTextEdit):
-                field.textChanged.connect(self.field_changed)
-            elif isinstance(field, QComboBox):
-                field.currentTextChanged.connect(self.field_changed)
-    
     def update_fields_from_prompt(self):
         """Update form fields from prompt data."""
         if not isinstance(self.prompt, PersonaPrompt):
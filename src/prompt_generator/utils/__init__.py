@@ -1,8 +1,19 @@
 """
 Utility modules for the Prompt Generator application.
+
+Names are imported from their modules on first access.
 """
 
-from .settings import Settings
-from .stylesheets import StylesheetManager
+from .. import _lazy
+
+# Public name -> module that defines it
+_lazy_imports = {
+    'Settings': 'settings',
+    'JSONSettingsStore': 'settings',
+    'get_settings': 'settings',
+    'init_settings': 'settings',
+    'StylesheetManager': 'stylesheets'
+}
 
-__all__ = ['Settings', 'StylesheetManager']
+__all__ = list(_lazy_imports)
+__getattr__, __dir__ = _lazy.attach(__name__, _lazy_imports)
@@ -4,8 +4,58 @@ Provides functionality for exporting prompts to different formats.
 """
 
 import os
-import json
-from .settings import Settings
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .export_renderers import get_renderer, prompt_fields
+from .settings import get_settings
+
+
+class ExportResult:
+    """Outcome of exporting one prompt to one format."""
+
+    def __init__(self, index, title, format_type, filepath):
+        self.index = index
+        self.title = title
+        self.format_type = format_type
+        self.filepath = filepath
+        self.status = "pending"     # pending, done, failed or cancelled
+        self.error = None
+
+    @property
+    def ok(self):
+        """Whether the file was written."""
+        return self.status == "done"
+
+
+class BatchExportReport:
+    """Per-item results of a batch export."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def _with_status(self, status):
+        return [result for result in self.results if result.status == status]
+
+    @property
+    def succeeded(self):
+        """Results of the files that were written."""
+        return self._with_status("done")
+
+    @property
+    def failed(self):
+        """Results of the exports that raised an error."""
+        return self._with_status("failed")
+
+    @property
+    def cancelled(self):
+        """Results of the exports skipped because of a cancellation."""
+        return self._with_status("cancelled")
+
+    @property
+    def ok(self):
+        """Whether every export succeeded."""
+        return all(result.ok for result in self.results)
 
 
 class ExportManager:
@@ -13,14 +63,14 @@ class ExportManager:
 
     def __init__(self):
         """Initialize the export manager."""
-        self.settings = Settings()
+        self.settings = get_settings()
         self.supported_formats = self.settings.get("export_formats")
 
     def export_prompt(self, prompt_data, filepath, format_type=None):
         """Export a prompt to a file.
 
         Args:
-            prompt_data: Dictionary containing prompt data
+            prompt_data: Dictionary containing prompt data, or a prompt object
             filepath: Path to save the exported file
             format_type: Format to export to (txt, md, html, json)
 
@@ -42,258 +92,100 @@ class ExportManager:
 
         # Export based on format
         try:
-            if format_type == "json":
-                return self._export_json(prompt_data, filepath)
-            elif format_type == "md":
-                return self._export_markdown(prompt_data, filepath)
-            elif format_type == "html":
-                return self._export_html(prompt_data, filepath)
-            else:  # Default to txt
-                return self._export_text(prompt_data, filepath)
+            return self._export(prompt_data, filepath, format_type)
         except Exception as e:
             print(f"Error exporting prompt: {e}")
             return False
 
-    def _export_text(self, prompt_data, filepath):
-        """Export prompt as plain text.
+    def _export(self, prompt_data, filepath, format_type):
+        """Write a prompt in the given format, raising on failure."""
+        # Unknown formats fall back to plain text
+        get_renderer(format_type).write_file(prompt_data, filepath)
+        return True
 
-        Args:
-            prompt_data: Dictionary containing prompt data
-            filepath: Path to save the exported file
-
-        Returns:
-            True if successful, False otherwise
-        """
-        try:
-            # Get the generated text from the prompt data
-            if "generated_text" in prompt_data:
-                text = prompt_data["generated_text"]
-            else:
-                # Try to generate text if prompt object has generate_text method
-                text = self._get_prompt_text(prompt_data)
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(text)
-            return True
-        except Exception as e:
-            print(f"Error exporting text: {e}")
-            return False
-
-    def _export_json(self, prompt_data, filepath):
-        """Export prompt as JSON.
+    def render(self, prompt_data, format_type):
+        """Render a prompt in an export format without writing a file.
 
         Args:
-            prompt_data: Dictionary containing prompt data
-            filepath: Path to save the exported file
+            prompt_data: Dictionary containing prompt data, or a prompt object
+            format_type: Format to render (txt, md, html, json)
 
         Returns:
-            True if successful, False otherwise
+            The exported document as a string
         """
-        try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(prompt_data, f, indent=4)
-            return True
-        except Exception as e:
-            print(f"Error exporting JSON: {e}")
-            return False
+        return get_renderer(format_type).render(prompt_data)
 
-    def _export_markdown(self, prompt_data, filepath):
-        """Export prompt as Markdown.
-
-        Args:
-            prompt_data: Dictionary containing prompt data
-            filepath: Path to save the exported file
+    def export_batch(self, prompts, formats, output_dir, max_workers=4,
+                     progress=None, cancel_event=None):
+        """Export many prompts to several formats at once.
 
-        Returns:
-            True if successful, False otherwise
-        """
-        try:
-            # Get the generated text from the prompt data
-            if "generated_text" in prompt_data:
-                text = prompt_data["generated_text"]
-            else:
-                # Try to generate text if prompt object has generate_text method
-                text = self._get_prompt_text(prompt_data)
-
-            # Create markdown content
-            title = prompt_data.get("title", "Untitled Prompt")
-            prompt_type = prompt_data.get("type", "").upper()
-
-            md_content = f"# {title}\n\n"
-            md_content += f"**Type:** {prompt_type}\n\n"
-
-            # Add metadata
-            if "created_at" in prompt_data:
-                md_content += f"**Created:** {prompt_data['created_at']}\n\n"
-
-            # Add prompt text
-            md_content += "## Prompt\n\n"
-            md_content += text
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(md_content)
-            return True
-        except Exception as e:
-            print(f"Error exporting Markdown: {e}")
-            return False
-
-    def _export_html(self, prompt_data, filepath):
-        """Export prompt as HTML.
+        File writes run on a thread pool. Progress is reported from the
+        calling thread, so a Qt caller running this in a worker thread can
+        forward it through a signal.
 
         Args:
-            prompt_data: Dictionary containing prompt data
-            filepath: Path to save the exported file
+            prompts: Iterable of prompt data dictionaries or prompt objects
+            formats: Formats to export each prompt to (txt, md, html, json)
+            output_dir: Directory to write the files to
+            max_workers: Number of writer threads
+            progress: Called as progress(done, total, result) after each file
+            cancel_event: threading.Event; once set, exports not yet started
+                are skipped and reported as cancelled
 
         Returns:
-            True if successful, False otherwise
+            BatchExportReport with one ExportResult per prompt and format
         """
-        try:
-            # Get the generated text from the prompt data
-            if "generated_text" in prompt_data:
-                text = prompt_data["generated_text"]
-            else:
-                # Try to generate text if prompt object has generate_text method
-                text = self._get_prompt_text(prompt_data)
-
-            # Create HTML content
-            title = prompt_data.get("title", "Untitled Prompt")
-            prompt_type = prompt_data.get("type", "").upper()
-
-            # Format text with paragraphs
-            formatted_text = ""
-            for line in text.split('\n'):
-                if line.strip():
-                    formatted_text += f"<p>{line}</p>\n"
-                else:
-                    formatted_text += "<br>\n"
-
-            # Build HTML content in parts to avoid long lines
-            html_start = (
-                f"<!DOCTYPE html>\n"
-                f"<html>\n"
-                f"<head>\n"
-                f"    <meta charset='UTF-8'>\n"
-                f"    <meta name='viewport' content='width=device-width, initial-scale=1.0'>\n"
-            )
-            
-            html_title = f"    <title>{title}</title>\n"
-            
-            style_start = (
-                f"    <style>\n"
-                f"        body {{\n"
-                f"            font-family: Arial, sans-serif;\n"
-                f"            line-height: 1.6;\n"
-                f"            margin: 0;\n"
-                f"            padding: 20px;\n"
-                f"            color: #333;\n"
-                f"        }}\n"
-            )
-            
-            style_container = (
-                f"        .container {{\n"
-                f"            max-width: 800px;\n"
-                f"            margin: 0 auto;\n"
-                f"            background: #fff;\n"
-                f"            padding: 20px;\n"
-                f"            border-radius: 5px;\n"
-                f"            box-shadow: 0 0 10px rgba(0,0,0,0.1);\n"
-                f"        }}\n"
-            )
-            
-            style_h1 = (
-                f"        h1 {{\n"
-                f"            color: #2c3e50;\n"
-                f"            border-bottom: 2px solid #eee;\n"
-                f"            padding-bottom: 10px;\n"
-                f"        }}\n"
-            )
-            
-            style_meta = (
-                f"        .meta {{\n"
-                f"            color: #7f8c8d;\n"
-                f"            font-size: 0.9em;\n"
-                f"            margin-bottom: 20px;\n"
-                f"        }}\n"
-            )
-            
-            style_prompt = (
-                f"        .prompt-text {{\n"
-                f"            background: #f9f9f9;\n"
-                f"            padding: 15px;\n"
-                f"            border-left: 4px solid #2c3e50;\n"
-                f"            margin-bottom: 20px;\n"
-                f"        }}\n"
-                f"    </style>\n"
-                f"</head>\n"
-            )
-            
-            body_start = (
-                f"<body>\n"
-                f"    <div class='container'>\n"
-                f"        <h1>{title}</h1>\n"
-                f"        <div class='meta'>\n"
-                f"            <strong>Type:</strong> {prompt_type}<br>\n"
-            )
-            
-            # Combine all parts
-            html_content = (
-                html_start + html_title + style_start + 
-                style_container + style_h1 + style_meta + 
-                style_prompt + body_start
-            )
-            
-            # Add creation date if available
-            if "created_at" in prompt_data:
-                created_at = prompt_data['created_at']
-                created_line = (
-                    f"            <strong>Created:</strong> "
-                    f"{created_at}<br>\n"
-                )
-                html_content += created_line
-
-            body_end = (
-                f"        </div>\n"
-                f"        <h2>Prompt</h2>\n"
-                f"        <div class='prompt-text'>\n"
-                f"{formatted_text}"
-                f"        </div>\n"
-                f"    </div>\n"
-                f"</body>\n"
-                f"</html>\n"
-            )
-            
-            html_content += body_end
-
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            return True
-        except Exception as e:
-            print(f"Error exporting HTML: {e}")
-            return False
+        # A format requested twice would write the same file twice
+        formats = list(dict.fromkeys(formats))
+        unsupported = [fmt for fmt in formats if fmt not in self.supported_formats]
+        if unsupported:
+            raise ValueError(f"Unsupported export formats: {', '.join(unsupported)}")
+
+        if cancel_event is None:
+            cancel_event = threading.Event()
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Assign file names up front so prompts whose titles sanitize to the
+        # same name do not overwrite each other. Names are compared without
+        # case, as on case-insensitive file systems; every name gets the
+        # same extensions, so unique names give unique paths.
+        jobs = []
+        used = set()
+        for index, prompt in enumerate(prompts):
+            title = prompt_fields(prompt).get("title") or "Untitled Prompt"
+            stem = re.sub(r'[^\w\-. ]', '_', title).strip() or "prompt"
+            name, counter = stem, 2
+            while name.lower() in used:
+                name = f"{stem}_{counter}"
+                counter += 1
+            used.add(name.lower())
+
+            for format_type in formats:
+                filepath = os.path.join(output_dir, f"{name}.{format_type}")
+                jobs.append((prompt, ExportResult(index, title, format_type, filepath)))
+
+        results = [result for _, result in jobs]
+        total = len(jobs)
+        done = 0
+
+        def run(prompt_data, result):
+            if cancel_event.is_set():
+                result.status = "cancelled"
+                return result
+            try:
+                self._export(prompt_data, result.filepath, result.format_type)
+                result.status = "done"
+            except Exception as e:
+                result.status = "failed"
+                result.error = str(e)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(run, prompt_data, result) for prompt_data, result in jobs]
+            for future in as_completed(futures):
+                done += 1
+                if progress:
+                    progress(done, total, future.result())
+
+        return BatchExportReport(results)
 
-    def _get_prompt_text(self, prompt_data):
-        """Try to get generated text from prompt data.
-
-        Args:
-            prompt_data: Dictionary containing prompt data
-
-        Returns:
-            Generated text if available, otherwise a summary of prompt data
-        """
-        # If prompt data has a generate_text method, use it
-        has_generate = hasattr(prompt_data, 'generate_text')
-        is_callable = callable(getattr(prompt_data, 'generate_text', None))
-        
-        if has_generate and is_callable:
-            return prompt_data.generate_text()
-
-        # Otherwise, create a summary from the prompt data
-        text = f"Title: {prompt_data.get('title', 'Untitled')}\n\n"
-
-        # Add other fields
-        excluded_keys = ['title', 'type', 'created_at', 'updated_at', 'id']
-        for key, value in prompt_data.items():
-            if key not in excluded_keys and value:
-                text += f"{key.replace('_', ' ').title()}: {value}\n\n"
-
-        return text
@@ -0,0 +1,259 @@
+"""
+Export renderers for the Prompt Generator application.
+Turns prompt data into the documents written by the export manager.
+"""
+
+import html
+import json
+
+
+EXCLUDED_SUMMARY_KEYS = ('title', 'type', 'created_at', 'updated_at', 'id')
+
+# Buffer size for export files; documents are written in many small parts
+WRITE_BUFFER_SIZE = 64 * 1024
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset='UTF-8'>
+    <meta name='viewport' content='width=device-width, initial-scale=1.0'>
+"""
+
+HTML_STYLE = """    <style>
+        body {
+            font-family: Arial, sans-serif;
+            line-height: 1.6;
+            margin: 0;
+            padding: 20px;
+            color: #333;
+        }
+        .container {
+            max-width: 800px;
+            margin: 0 auto;
+            background: #fff;
+            padding: 20px;
+            border-radius: 5px;
+            box-shadow: 0 0 10px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #2c3e50;
+            border-bottom: 2px solid #eee;
+            padding-bottom: 10px;
+        }
+        .meta {
+            color: #7f8c8d;
+            font-size: 0.9em;
+            margin-bottom: 20px;
+        }
+        .prompt-text {
+            background: #f9f9f9;
+            padding: 15px;
+            border-left: 4px solid #2c3e50;
+            margin-bottom: 20px;
+        }
+    </style>
+</head>
+"""
+
+HTML_TAIL = """        </div>
+    </div>
+</body>
+</html>
+"""
+
+
+def prompt_fields(prompt):
+    """Get the data fields of a prompt object or dictionary."""
+    if isinstance(prompt, dict):
+        return prompt
+    return prompt.to_dict()
+
+
+def iter_prompt_text(prompt):
+    """Yield the text to export for a prompt in chunks.
+
+    Args:
+        prompt: Dictionary containing prompt data, or a prompt object
+
+    Yields:
+        The generated text if available, otherwise a summary of the fields
+    """
+    if not isinstance(prompt, dict):
+        # Prompt objects stream their text field by field
+        if callable(getattr(prompt, 'iter_text', None)):
+            yield from prompt.iter_text()
+        else:
+            yield prompt.generate_text()
+        return
+
+    if "generated_text" in prompt:
+        yield prompt["generated_text"]
+        return
+
+    # Otherwise, create a summary from the prompt data
+    yield f"Title: {prompt.get('title', 'Untitled')}\n\n"
+    for key, value in prompt.items():
+        if key not in EXCLUDED_SUMMARY_KEYS and value:
+            yield f"{key.replace('_', ' ').title()}: {value}\n\n"
+
+
+def prompt_text(prompt):
+    """Get the full text to export for a prompt."""
+    return "".join(iter_prompt_text(prompt))
+
+
+def iter_lines(chunks):
+    """Split a stream of text chunks into lines without their newlines.
+
+    Behaves like str.split('\\n') on the joined text, but only ever holds
+    one line at a time.
+    """
+    pending = []
+    for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find("\n", start)
+            if end < 0:
+                break
+            pending.append(chunk[start:end])
+            yield "".join(pending)
+            pending = []
+            start = end + 1
+        if start < len(chunk):
+            pending.append(chunk[start:])
+    yield "".join(pending)
+
+
+class Renderer:
+    """Base class for export formats.
+
+    A renderer builds its static markup once, when it is created, and
+    renders a prompt as a stream of string parts. render() joins them
+    once; write() hands them to a buffered file as they are produced, so
+    large prompts are never held in memory as a whole document.
+
+    Renderers accept prompt data dictionaries or prompt objects.
+    """
+
+    extension = ""
+
+    def iter_parts(self, prompt):
+        """Yield the parts of the document for a prompt."""
+        raise NotImplementedError("Subclasses must implement this method")
+
+    def render(self, prompt):
+        """Render a prompt to a string without writing it anywhere."""
+        return "".join(self.iter_parts(prompt))
+
+    def write(self, prompt, f):
+        """Write the document for a prompt to an open text file."""
+        size = WRITE_BUFFER_SIZE
+        for part in self.iter_parts(prompt):
+            if len(part) <= size:
+                f.write(part)
+                continue
+
+            # Encode long fields a slice at a time instead of all at once
+            for start in range(0, len(part), size):
+                f.write(part[start:start + size])
+
+    def write_file(self, prompt, filepath):
+        """Write the document for a prompt to a file."""
+        with open(filepath, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            self.write(prompt, f)
+
+
+class TextRenderer(Renderer):
+    """Plain text: the generated prompt text only."""
+
+    extension = "txt"
+
+    def iter_parts(self, prompt):
+        return iter_prompt_text(prompt)
+
+
+class JSONRenderer(Renderer):
+    """The prompt data as indented JSON."""
+
+    extension = "json"
+
+    @staticmethod
+    def _data(prompt):
+        if isinstance(prompt, dict):
+            return prompt
+        data = prompt.to_dict()
+        data["generated_text"] = prompt.generate_text()
+        return data
+
+    def iter_parts(self, prompt):
+        return json.JSONEncoder(indent=4).iterencode(self._data(prompt))
+
+
+class MarkdownRenderer(Renderer):
+    """A Markdown document with a metadata header."""
+
+    extension = "md"
+
+    def iter_parts(self, prompt):
+        fields = prompt_fields(prompt)
+        title = fields.get("title", "Untitled Prompt")
+        prompt_type = (fields.get("type") or "").upper()
+
+        yield f"# {title}\n\n**Type:** {prompt_type}\n\n"
+        if "created_at" in fields:
+            yield f"**Created:** {fields['created_at']}\n\n"
+        yield "## Prompt\n\n"
+
+        # The prompt text is Markdown content in its own right, so it is
+        # streamed through unchanged
+        yield from iter_prompt_text(prompt)
+
+
+class HTMLRenderer(Renderer):
+    """A standalone, styled HTML page."""
+
+    extension = "html"
+
+    def __init__(self):
+        # The stylesheet and page chrome never change between prompts
+        self.head = HTML_HEAD
+        self.style = HTML_STYLE
+        self.tail = HTML_TAIL
+
+    def iter_parts(self, prompt):
+        fields = prompt_fields(prompt)
+        title = html.escape(str(fields.get("title", "Untitled Prompt")))
+        prompt_type = html.escape((fields.get("type") or "").upper())
+
+        yield self.head
+        yield f"    <title>{title}</title>\n"
+        yield self.style
+        yield "<body>\n    <div class='container'>\n"
+        yield f"        <h1>{title}</h1>\n"
+        yield "        <div class='meta'>\n"
+        yield f"            <strong>Type:</strong> {prompt_type}<br>\n"
+        if "created_at" in fields:
+            created_at = html.escape(str(fields["created_at"]))
+            yield f"            <strong>Created:</strong> {created_at}<br>\n"
+        yield "        </div>\n        <h2>Prompt</h2>\n        <div class='prompt-text'>\n"
+
+        # One escaped paragraph per line; blank lines become breaks
+        for line in iter_lines(iter_prompt_text(prompt)):
+            if line.strip():
+                yield f"<p>{html.escape(line, quote=False)}</p>\n"
+            else:
+                yield "<br>\n"
+
+        yield self.tail
+
+
+# Shared renderer instances keyed by export format
+RENDERERS = {
+    renderer.extension: renderer
+    for renderer in (TextRenderer(), JSONRenderer(), MarkdownRenderer(), HTMLRenderer())
+}
+
+
+def get_renderer(format_type):
+    """Get the renderer for an export format, falling back to plain text."""
+    return RENDERERS.get(format_type, RENDERERS["txt"])
@@ -0,0 +1,79 @@
+"""
+File watching for the Prompt Generator application.
+Reports changes to the prompt library directories to the GUI.
+"""
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from ..models.watcher import PollingWatcher
+
+
+class QtFileWatcher(QObject):
+    """Watches prompt directories with QFileSystemWatcher.
+
+    QFileSystemWatcher reports that a directory changed but not which
+    file, so each notification triggers a (debounced) stat-only scan that
+    works out the individual additions, modifications and deletions. File
+    edits that do not touch the directory, and shared drives that do not
+    deliver notifications at all, are caught by a slower periodic rescan.
+
+    The interface matches PollingWatcher, so it can be passed to
+    PromptManager.watch(); the changed signal lets views refresh.
+    """
+
+    changed = pyqtSignal(list)
+
+    def __init__(self, directories, rescan_interval=10000, debounce=200, parent=None):
+        """Initialize the watcher.
+
+        Args:
+            directories: Mapping of collection name to directory
+            rescan_interval: Milliseconds between fallback rescans
+            debounce: Milliseconds to wait for a burst of changes to settle
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.directories = list(directories.values())
+        self.scanner = PollingWatcher(directories)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._schedule_scan)
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce)
+        self.debounce_timer.timeout.connect(self.scan)
+
+        self.rescan_timer = QTimer(self)
+        self.rescan_timer.setInterval(rescan_interval)
+        self.rescan_timer.timeout.connect(self.scan)
+
+    def _schedule_scan(self, path):
+        """Scan once the current burst of notifications is over."""
+        self.debounce_timer.start()
+
+    def scan(self):
+        """Scan the directories and announce any changes."""
+        events = self.scanner.poll()
+        if events:
+            self.changed.emit(events)
+        return events
+
+    def subscribe(self, callback):
+        """Call a function with each batch of events, on the GUI thread."""
+        self.changed.connect(callback)
+
+    def drain(self):
+        """Take every event detected since the last call."""
+        return self.scanner.drain()
+
+    def start(self):
+        """Start watching."""
+        self.watcher.addPaths(self.directories)
+        self.rescan_timer.start()
+
+    def stop(self):
+        """Stop watching."""
+        self.rescan_timer.stop()
+        self.debounce_timer.stop()
+        if self.watcher.directories():
+            self.watcher.removePaths(self.watcher.directories())
@@ -5,116 +5,264 @@ Provides functionality for tracking and managing prompt history.
 
 import json
 import os
+import threading
+from collections import deque
 from datetime import datetime
-from .settings import Settings
+from itertools import islice
+from .settings import get_settings
 
 
 class HistoryManager:
-    """Manages prompt history tracking."""
-    
-    def __init__(self):
-        """Initialize the history manager."""
-        self.settings = Settings()
+    """Manages prompt history tracking.
+
+    The history is persisted as a snapshot plus an append-only journal of
+    add/remove/clear/trim operations. Each change appends one line to the
+    journal; once the journal grows past a threshold it is rotated and
+    folded into a new snapshot on a background thread. Startup loads the
+    snapshot and replays the journal, skipping operations the snapshot
+    already contains, so a crash mid-write loses at most the torn line.
+    """
+
+    # Journal operations written before a compaction is started
+    compact_threshold = 200
+
+    def __init__(self, history_file=None):
+        """Initialize the history manager.
+
+        Args:
+            history_file: Path of the history snapshot, or None for
+                prompt_history.json in the application directory
+        """
+        self.settings = get_settings()
         self.history_enabled = self.settings.get("save_history")
         self.max_items = self.settings.get("max_history_items")
-        self.history_file = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
-            "prompt_history.json"
-        )
+        if history_file is None:
+            history_file = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
+                "prompt_history.json"
+            )
+        self.history_file = history_file
+        self.journal_file = f"{self.history_file}.journal"
+        self.rotated_journal_file = f"{self.journal_file}.1"
+
+        self._lock = threading.Lock()
+        self._compaction = None
+        self._seq = 0
+        self._journal_ops = 0
         self.history = self._load_history()
-    
+
     def _load_history(self):
-        """Load history from file."""
+        """Load the snapshot and replay the journal on top of it."""
         if not self.history_enabled:
-            return []
-        
-        if not os.path.exists(self.history_file):
-            return []
-        
+            return deque(maxlen=self.max_items)
+
+        # Replay with the limit that was in force when each operation was
+        # recorded, then apply the current limit
+        limit = self.max_items
+        items = []
+        snapshot_seq = 0
+        if os.path.exists(self.history_file):
+            try:
+                with open(self.history_file, 'r') as f:
+                    snapshot = json.load(f)
+
+                # Older versions stored a bare list
+                if isinstance(snapshot, list):
+                    snapshot = {"seq": 0, "items": snapshot}
+                snapshot_seq = snapshot.get("seq", 0)
+                limit = snapshot.get("max_items", limit)
+                items = snapshot.get("items", [])
+            except Exception as e:
+                print(f"Error loading history: {e}")
+
+        history = deque(islice(items, limit), maxlen=limit)
+        self._seq = snapshot_seq
+        for journal in (self.rotated_journal_file, self.journal_file):
+            for op in self._read_journal(journal):
+                if op.get("seq", 0) <= snapshot_seq:
+                    continue
+                history = self._apply(history, op)
+                self._seq = max(self._seq, op["seq"])
+                self._journal_ops += 1
+
+        return deque(islice(history, self.max_items), maxlen=self.max_items)
+
+    def _read_journal(self, path):
+        """Yield the operations recorded in a journal file.
+
+        A torn line left at the end by a crash mid-write is cut off, so
+        operations recorded afterwards start on a line of their own.
+        """
+        if not os.path.exists(path):
+            return
+
+        offset = 0
         try:
-            with open(self.history_file, 'r') as f:
-                history = json.load(f)
-            return history
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        op = json.loads(line)
+                    except ValueError:
+                        break
+                    offset += len(line)
+                    yield op
+
+            if offset != os.path.getsize(path):
+                with open(path, 'r+b') as f:
+                    f.truncate(offset)
         except Exception as e:
-            print(f"Error loading history: {e}")
-            return []
-    
-    def _save_history(self):
-        """Save history to file."""
+            print(f"Error reading history journal: {e}")
+
+    @staticmethod
+    def _apply(history, op):
+        """Apply a journal operation and return the resulting deque."""
+        kind = op.get("op")
+        if kind == "add":
+            history.appendleft(op["item"])
+        elif kind == "remove":
+            index = op["index"]
+            if 0 <= index < len(history):
+                del history[index]
+        elif kind == "clear":
+            history.clear()
+        elif kind == "trim":
+            history = deque(islice(history, op["max"]), maxlen=op["max"])
+        return history
+
+    def _record(self, op):
+        """Append an operation to the journal, compacting when it grows."""
+        if not self.history_enabled:
+            return
+
+        with self._lock:
+            self._seq += 1
+            op["seq"] = self._seq
+            try:
+                with open(self.journal_file, 'a') as f:
+                    f.write(json.dumps(op) + "\n")
+            except Exception as e:
+                print(f"Error saving history: {e}")
+                return
+            self._journal_ops += 1
+
+        if self._journal_ops >= self.compact_threshold:
+            self.compact(background=True)
+
+    def compact(self, background=False):
+        """Fold the journal into a new snapshot.
+
+        Args:
+            background: Write the snapshot on a background thread
+        """
         if not self.history_enabled:
             return
-        
+
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            self._rotate_journal()
+
+            args = (list(self.history), self._seq, self.max_items)
+            self._journal_ops = 0
+
+        if background:
+            self._compaction = threading.Thread(
+                target=self._write_snapshot, args=args, daemon=True
+            )
+            self._compaction.start()
+        else:
+            self._write_snapshot(*args)
+
+    def _rotate_journal(self):
+        """Move the journal aside so new operations start a fresh file."""
+        if not os.path.exists(self.journal_file):
+            return
+
+        try:
+            if os.path.exists(self.rotated_journal_file):
+                # A previous compaction did not finish; fold both journals
+                with open(self.journal_file, 'r') as src, \
+                        open(self.rotated_journal_file, 'a') as dst:
+                    dst.write(src.read())
+                os.remove(self.journal_file)
+            else:
+                os.replace(self.journal_file, self.rotated_journal_file)
+        except Exception as e:
+            print(f"Error rotating history journal: {e}")
+
+    def _write_snapshot(self, items, seq, max_items):
+        """Atomically replace the snapshot and drop the folded journal."""
+        tmp_path = f"{self.history_file}.tmp"
         try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.history, f, indent=4)
+            with open(tmp_path, 'w') as f:
+                json.dump({"seq": seq, "max_items": max_items, "items": items}, f)
+            os.replace(tmp_path, self.history_file)
+
+            if os.path.exists(self.rotated_journal_file):
+                os.remove(self.rotated_journal_file)
         except Exception as e:
-            print(f"Error saving history: {e}")
-    
+            print(f"Error compacting history: {e}")
+
     def add_to_history(self, prompt_data):
         """Add a prompt to history.
-        
+
         Args:
             prompt_data: Dictionary containing prompt data
         """
         if not self.history_enabled:
             return
-        
+
         # Add timestamp if not present
         if "timestamp" not in prompt_data:
             prompt_data["timestamp"] = datetime.now().isoformat()
-        
-        # Add to history
-        self.history.insert(0, prompt_data)
-        
-        # Limit history size
-        if len(self.history) > self.max_items:
-            self.history = self.history[:self.max_items]
-        
-        # Save history
-        self._save_history()
-    
+
+        # Add to history; the deque drops the oldest item beyond max_items
+        self.history.appendleft(prompt_data)
+        self._record({"op": "add", "item": prompt_data})
+
     def get_history(self):
         """Get the prompt history.
-        
+
         Returns:
             List of prompt history items
         """
-        return self.history
-    
+        return list(self.history)
+
     def clear_history(self):
         """Clear the prompt history."""
-        self.history = []
-        self._save_history()
-    
+        self.history.clear()
+        self._record({"op": "clear"})
+
     def remove_from_history(self, index):
         """Remove a prompt from history.
-        
+
         Args:
             index: Index of the prompt to remove
         """
         if 0 <= index < len(self.history):
             del self.history[index]
-            self._save_history()
-    
+            self._record({"op": "remove", "index": index})
+
     def enable_history(self, enabled=True):
         """Enable or disable history tracking.
-        
+
         Args:
             enabled: Whether history tracking should be enabled
         """
         self.history_enabled = enabled
         self.settings.set("save_history", enabled)
-    
+
     def set_max_items(self, max_items):
         """Set the maximum number of history items.
-        
+
         Args:
             max_items: Maximum number of history items to keep
         """
         self.max_items = max_items
         self.settings.set("max_history_items", max_items)
-        
+
         # Trim history if needed
-        if len(self.history) > self.max_items:
-            self.history = self.history[:self.max_items]
-            self._save_history()
+        self.history = deque(islice(self.history, self.max_items), maxlen=self.max_items)
+        self._record({"op": "trim", "max": self.max_items})
@@ -3,17 +3,97 @@ Settings management for the Prompt Generator application.
 Handles user preferences, theme settings, and application configuration.
 """
 
+import atexit
+import copy
 import json
 import os
-from PyQt5.QtCore import QSettings
+import threading
+
+
+class JSONSettingsStore:
+    """Settings store kept in a JSON file.
+
+    Offers the part of the QSettings interface that Settings uses, so the
+    command-line tools can keep settings without importing Qt.
+    """
+
+    def __init__(self, path):
+        """Initialize the store.
+
+        Args:
+            path: JSON file holding the settings
+        """
+        self.path = path
+        self.data = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.data = json.load(f)
+            except Exception as e:
+                print(f"Error loading settings: {e}")
+
+    def contains(self, key):
+        """Check whether a setting is stored."""
+        return key in self.data
+
+    def value(self, key, default=None, type=None):
+        """Get a stored setting, or the default if it is missing."""
+        value = self.data.get(key, default)
+        if type is not None and not isinstance(value, type):
+            try:
+                return type(value)
+            except (TypeError, ValueError):
+                return default
+        return value
+
+    def setValue(self, key, value):
+        """Store a setting; it is written to disk by sync()."""
+        self.data[key] = value
+
+    def sync(self):
+        """Write the settings to disk."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=4)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error saving settings: {e}")
+
+
+def qt_settings_store():
+    """Get the QSettings store used by the desktop application."""
+    from PyQt5.QtCore import QSettings
+    return QSettings("PromptGenerator", "PromptGeneratorApp")
 
 
 class Settings:
-    """Manages application settings and preferences."""
+    """Manages application settings and preferences.
+
+    Values are decoded once and held in memory with the type of their
+    default, so reads never touch QSettings. Writes update memory at once,
+    notify subscribers and are flushed to QSettings together after
+    flush_delay seconds, or at exit or close().
 
-    
-    def __init__(self):
-        self.settings = QSettings("PromptGenerator", "PromptGeneratorApp")
+    Use get_settings() to share one instance across the application.
+    """
+
+    # Seconds to wait after a change before writing settings to disk
+    flush_delay = 1.0
+
+    def __init__(self, store=None):
+        """Initialize the settings.
+
+        Args:
+            store: QSettings or JSONSettingsStore to keep the settings in,
+                or None for the application's QSettings
+        """
+        self.settings = store if store is not None else qt_settings_store()
         self.default_settings = {
             "theme": "light",  # light or dark
             "font_size": 10,
@@ -36,87 +116,149 @@ class Settings:
             "auto_save_interval": 5  # minutes
         }
 
-        # Initialize settings if they don't exist
-        if not self.settings.contains("theme"):
-            self.reset_to_defaults()
+        self._lock = threading.RLock()
+        self._values = {}
+        self._dirty = set()
+        self._timer = None
+        self._subscribers = []
 
-            "window_size": (1000, 700),
-            "sidebar_width": 200
-        }
-        
         # Initialize settings if they don't exist
         if not self.settings.contains("theme"):
             self.reset_to_defaults()
-    
+
+        atexit.register(self.flush)
+
+    def _decode(self, key):
+        """Read a value from the store and convert it to its default's type."""
+        default = self.default_settings[key]
+        value_type = type(default)
+
+        if value_type in (bool, int, float):
+            return self.settings.value(key, default, type=value_type)
+
+        value = self.settings.value(key, default)
+        if value_type == tuple:
+            # Handle tuple conversion
+            if isinstance(value, str):
+                # Convert from string if needed
+                try:
+                    return tuple(map(int, value.strip('()').split(',')))
+                except ValueError:
+                    return default
+            if isinstance(value, list):
+                return tuple(value)
+            return value
+        elif value_type == dict:
+            # Handle dictionary conversion
+            if isinstance(value, str):
+                # Convert from string if needed
+                try:
+                    return dict(
+                        item.split(": ")
+                        for item in value.strip("{}").split(", ")
+                    )
+                except ValueError:
+                    return copy.deepcopy(default)
+            return value
+        elif value_type == list and isinstance(value, str):
+            return [value]
+        return value
+
     def get(self, key):
         """Get a setting value."""
-        if key in self.default_settings:
-            value_type = type(self.default_settings[key])
-
-            if value_type == bool:
-                return self.settings.value(
-                    key, self.default_settings[key], type=bool
-                )
-            elif value_type == int:
-                return self.settings.value(
-                    key, self.default_settings[key], type=int
-                )
-            elif value_type == float:
-                return self.settings.value(
-                    key, self.default_settings[key], type=float
-                )
-            
-            if value_type == bool:
-                return self.settings.value(key, self.default_settings[key], type=bool)
-            elif value_type == int:
-                return self.settings.value(key, self.default_settings[key], type=int)
-            elif value_type == float:
-                return self.settings.value(key, self.default_settings[key], type=float)
-            elif value_type == tuple:
-                # Handle tuple conversion
-                value = self.settings.value(key, self.default_settings[key])
-                if isinstance(value, str):
-                    # Convert from string if needed
-                    try:
-                        return tuple(map(int, value.strip('()').split(',')))
-                    except ValueError:
-                        return self.default_settings[key]
-                return value
-            elif value_type == dict:
-                # Handle dictionary conversion
-                value = self.settings.value(key, self.default_settings[key])
-                if isinstance(value, str):
-                    # Convert from string if needed
-                    try:
-                        return dict(
-                            item.split(": ")
-                            for item in value.strip("{}").split(", ")
-                        )
-                    except ValueError:
-                    except:
-                        return self.default_settings[key]
-                return value
-            else:
-                return self.settings.value(key, self.default_settings[key])
-        return None
-
-    
+        if key not in self.default_settings:
+            return None
+
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = self._decode(key)
+            value = self._values[key]
+
+        # Callers may modify lists and dicts before setting them back
+        if isinstance(value, (list, dict)):
+            return copy.deepcopy(value)
+        return value
+
     def set(self, key, value):
         """Set a setting value."""
-        if key in self.default_settings:
-            self.settings.setValue(key, value)
+        if key not in self.default_settings:
+            return False
+
+        with self._lock:
+            if key in self._values and self._values[key] == value:
+                return True
+            self._values[key] = copy.deepcopy(value)
+            self._dirty.add(key)
+            self._schedule_flush()
+
+        self._notify(key, value)
+        return True
+
+    def subscribe(self, callback, key=None):
+        """Call a function whenever a setting changes.
+
+        Args:
+            callback: Called as callback(key, value)
+            key: Only report changes to this setting, or None for all
+        """
+        with self._lock:
+            self._subscribers.append((key, callback))
+
+    def unsubscribe(self, callback):
+        """Stop reporting changes to a function."""
+        with self._lock:
+            self._subscribers = [
+                (key, subscriber) for key, subscriber in self._subscribers
+                if subscriber != callback
+            ]
+
+    def _notify(self, key, value):
+        """Report a changed setting to its subscribers."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscribed_key, callback in subscribers:
+            if subscribed_key is None or subscribed_key == key:
+                try:
+                    callback(key, value)
+                except Exception as e:
+                    print(f"Error notifying settings subscriber: {e}")
+
+    def _schedule_flush(self):
+        """Start the flush timer unless one is already pending."""
+        if self._timer is not None:
+            return
+
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write pending changes to the store."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            if not self._dirty:
+                return
+
+            for key in self._dirty:
+                self.settings.setValue(key, self._values[key])
+            self._dirty.clear()
             self.settings.sync()
-            return True
-        return False
 
-    
+    def close(self):
+        """Write pending changes and stop flushing this instance at exit."""
+        self.flush()
+        atexit.unregister(self.flush)
+
     def reset_to_defaults(self):
         """Reset all settings to default values."""
         for key, value in self.default_settings.items():
-            self.settings.setValue(key, value)
-        self.settings.sync()
+            self.set(key, value)
+        self.flush()
 
-    
     def export_settings(self, filepath):
         """Export settings to a JSON file."""
         settings_dict = {}
@@ -126,10 +268,6 @@ class Settings:
         with open(filepath, 'w') as f:
             json.dump(settings_dict, f, indent=4)
 
-        
-        with open(filepath, 'w') as f:
-            json.dump(settings_dict, f, indent=4)
-    
     def import_settings(self, filepath):
         """Import settings from a JSON file."""
         if not os.path.exists(filepath):
@@ -139,16 +277,47 @@ class Settings:
             with open(filepath, 'r') as f:
                 settings_dict = json.load(f)
 
-        
-        try:
-            with open(filepath, 'r') as f:
-                settings_dict = json.load(f)
-            
             for key, value in settings_dict.items():
                 if key in self.default_settings:
+                    if isinstance(self.default_settings[key], tuple):
+                        value = tuple(value)
                     self.set(key, value)
             return True
         except Exception as e:
             print(f"Error importing settings: {e}")
-        except:
             return False
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_settings():
+    """Get the settings instance shared by the whole application.
+
+    It is kept in the application's QSettings unless init_settings() was
+    called first.
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = Settings()
+    return _instance
+
+
+def init_settings(store):
+    """Create the shared settings instance on a given store.
+
+    Args:
+        store: QSettings or JSONSettingsStore to keep the settings in
+
+    Returns:
+        The shared Settings instance
+    """
+    global _instance
+    with _instance_lock:
+        if _instance is not None:
+            _instance.close()
+        _instance = Settings(store)
+    return _instance
@@ -5,7 +5,7 @@ Provides functionality for registering and handling keyboard shortcuts.
 
 from PyQt5.QtWidgets import QShortcut
 from PyQt5.QtGui import QKeySequence
-from .settings import Settings
+from .settings import get_settings
 
 
 class ShortcutManager:
@@ -18,7 +18,7 @@ class ShortcutManager:
             parent: The parent widget to attach shortcuts to
         """
         self.parent = parent
-        self.settings = Settings()
+        self.settings = get_settings()
         self.shortcuts = {}
         self.actions = {}
     
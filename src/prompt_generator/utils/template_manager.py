@@ -5,49 +5,160 @@ Provides functionality for saving, loading, and managing prompt templates.
 
 import json
 import os
+from collections import OrderedDict
+from collections.abc import Mapping
 from datetime import datetime
-from .settings import Settings
+from ..models.manifest import DirectoryManifest
+from .settings import get_settings
+
+
+def template_metadata(template):
+    """Extract the fields indexed for a template file."""
+    return {
+        "id": template.get("id"),
+        "title": template.get("title", ""),
+        "type": template.get("type", ""),
+        "created_at": template.get("created_at", ""),
+        "updated_at": template.get("updated_at", "")
+    }
+
+
+class LazyTemplates(Mapping):
+    """Read-only mapping of template ID to template data.
+    
+    Iterating and membership tests use the index only; a template body is
+    read when it is looked up.
+    """
+    
+    def __init__(self, manager):
+        self.manager = manager
+    
+    def __getitem__(self, template_id):
+        template = self.manager.get_template(template_id)
+        if template is None:
+            raise KeyError(template_id)
+        return template
+    
+    def __contains__(self, template_id):
+        return template_id in self.manager.index
+    
+    def __iter__(self):
+        return iter(list(self.manager.index))
+    
+    def __len__(self):
+        return len(self.manager.index)
 
 
 class TemplateManager:
-    """Manages prompt templates."""
+    """Manages prompt templates.
+    
+    Startup only builds an index of template IDs and metadata from the
+    directory manifest, which re-reads just the files changed since the
+    last run. Template bodies are parsed on first use and kept in a
+    bounded LRU cache along with the file's mtime and size, so a template
+    changed on disk is read again.
+    """
+    
+    # Number of template bodies kept in memory
+    max_loaded = 256
     
-    def __init__(self):
-        """Initialize the template manager."""
-        self.settings = Settings()
-        self.templates_dir = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
-            "templates"
-        )
+    def __init__(self, templates_dir=None):
+        """Initialize the template manager.
+        
+        Args:
+            templates_dir: Directory of template files, or None for
+                templates in the application directory
+        """
+        self.settings = get_settings()
+        if templates_dir is None:
+            templates_dir = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
+                "templates"
+            )
+        self.templates_dir = templates_dir
         
         # Create templates directory if it doesn't exist
         if not os.path.exists(self.templates_dir):
             os.makedirs(self.templates_dir)
         
-        self.templates = self._load_templates()
+        self.manifest = DirectoryManifest(self.templates_dir, template_metadata)
+        self.index = self._build_index()
+        self.loaded = OrderedDict()     # template ID -> (stat token, template)
+        self.templates = LazyTemplates(self)
     
-    def _load_templates(self):
-        """Load templates from the templates directory."""
-        templates = {}
+    def _build_index(self):
+        """Index the templates directory without reading template bodies."""
+        index = {}
         
-        if not os.path.exists(self.templates_dir):
-            return templates
-        
-        # Load templates from each file in the templates directory
-        for filename in os.listdir(self.templates_dir):
-            if filename.endswith('.json'):
-                try:
-                    with open(os.path.join(self.templates_dir, filename), 'r') as f:
-                        template = json.load(f)
-                    
-                    # Use template ID as key, or filename if ID not present
-                    template_id = template.get('id', filename[:-5])
-                    templates[template_id] = template
-                except Exception as e:
-                    print(f"Error loading template {filename}: {e}")
+        try:
+            entries = list(self.manifest.iter_entries())
+        except Exception as e:
+            print(f"Error indexing templates: {e}")
+            return index
+        
+        for entry in entries:
+            # Use template ID as key, or filename if ID not present
+            template_id = entry.get("id") or entry["filename"][:-5]
+            index[template_id] = entry
         
+        return index
+    
+    def _stat_token(self, filename):
+        """Get (mtime_ns, size) of a template file, or None if it is gone."""
+        try:
+            stat = os.stat(os.path.join(self.templates_dir, filename))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_template(self, template_id, token):
+        """Parse a template file and add it to the cache."""
+        filename = self.index[template_id]["filename"]
+        try:
+            with open(os.path.join(self.templates_dir, filename), 'r') as f:
+                template = json.load(f)
+        except Exception as e:
+            print(f"Error loading template {filename}: {e}")
+            return None
+        
+        self._cache(template_id, template, token)
+        return template
+    
+    def _cache(self, template_id, template, token):
+        """Keep a template body, evicting the least recently used ones."""
+        self.loaded[template_id] = (token, template)
+        self.loaded.move_to_end(template_id)
+        while len(self.loaded) > self.max_loaded:
+            self.loaded.popitem(last=False)
+    
+    def preload(self, template_ids=None):
+        """Read many templates at once, e.g. for a batch job.
+        
+        Args:
+            template_ids: IDs to read, or None for every template
+            
+        Returns:
+            Dictionary of template ID to template data; the caller decides
+            how long to keep them, the cache stays bounded
+        """
+        if template_ids is None:
+            template_ids = list(self.index)
+        
+        templates = {}
+        for template_id in template_ids:
+            template = self.get_template(template_id)
+            if template is not None:
+                templates[template_id] = template
         return templates
     
+    def list_templates(self):
+        """Get the indexed metadata of every template without reading them.
+        
+        Returns:
+            List of dictionaries with id, filename, title, type and timestamps
+        """
+        return [dict(entry, id=template_id) for template_id, entry in self.index.items()]
+    
     def save_template(self, template_data):
         """Save a template.
         
@@ -74,8 +185,13 @@ class TemplateManager:
             with open(os.path.join(self.templates_dir, filename), 'w') as f:
                 json.dump(template_data, f, indent=4)
             
-            # Add to templates dictionary
-            self.templates[template_id] = template_data
+            # Add to the index and the cache
+            self.manifest.record(filename, template_data)
+            self.manifest.flush()
+            entry = {"filename": filename}
+            entry.update(template_metadata(template_data))
+            self.index[template_id] = entry
+            self._cache(template_id, template_data, self._stat_token(filename))
             return template_id
         except Exception as e:
             print(f"Error saving template: {e}")
@@ -90,13 +206,28 @@ class TemplateManager:
         Returns:
             Template data if found, None otherwise
         """
-        return self.templates.get(template_id)
+        entry = self.index.get(template_id)
+        if entry is None:
+            return None
+        
+        token = self._stat_token(entry["filename"])
+        if token is None:
+            self.loaded.pop(template_id, None)
+            return None
+        
+        cached = self.loaded.get(template_id)
+        if cached is not None and cached[0] == token:
+            self.loaded.move_to_end(template_id)
+            return cached[1]
+        
+        return self._read_template(template_id, token)
     
     def get_all_templates(self):
         """Get all templates.
         
         Returns:
-            Dictionary of all templates
+            Mapping of template ID to template data; bodies are read as
+            they are accessed
         """
         return self.templates
     
@@ -109,18 +240,21 @@ class TemplateManager:
         Returns:
             True if successful, False otherwise
         """
-        if template_id not in self.templates:
+        if template_id not in self.index:
             return False
         
         # Delete template file
-        filename = f"{template_id}.json"
+        filename = self.index[template_id]["filename"]
         filepath = os.path.join(self.templates_dir, filename)
         
         if os.path.exists(filepath):
             try:
                 os.remove(filepath)
-                # Remove from templates dictionary
-                del self.templates[template_id]
+                # Remove from the index and the cache
+                del self.index[template_id]
+                self.loaded.pop(template_id, None)
+                self.manifest.discard(filename)
+                self.manifest.flush()
                 return True
             except Exception as e:
                 print(f"Error deleting template: {e}")
@@ -138,7 +272,7 @@ class TemplateManager:
         Returns:
             True if successful, False otherwise
         """
-        if template_id not in self.templates:
+        if template_id not in self.index:
             return False
         
         # Update template data
@@ -146,8 +280,9 @@ class TemplateManager:
         template_data['updated_at'] = datetime.now().isoformat()
         
         # Preserve creation timestamp
-        if 'created_at' not in template_data and 'created_at' in self.templates[template_id]:
-            template_data['created_at'] = self.templates[template_id]['created_at']
+        created_at = self.index[template_id].get('created_at')
+        if 'created_at' not in template_data and created_at:
+            template_data['created_at'] = created_at
         
         # Save updated template
         return self.save_template(template_data) is not None
@@ -5,7 +5,7 @@ Provides functionality for switching between light and dark themes.
 
 from PyQt5.QtWidgets import QApplication
 from .stylesheets import StylesheetManager
-from .settings import Settings
+from .settings import get_settings
 
 
 class ThemeManager:
@@ -13,7 +13,7 @@ class ThemeManager:
     
     def __init__(self):
         """Initialize the theme manager."""
-        self.settings = Settings()
+        self.settings = get_settings()
         self.current_theme = self.settings.get("theme")
     
     def get_current_theme(self):
@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the Prompt Generator tests.
+"""
+
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+@pytest.fixture(autouse=True)
+def settings_file(tmp_path_factory):
+    """Keep settings in a temporary JSON file instead of the user's QSettings."""
+    from prompt_generator.utils.settings import JSONSettingsStore, init_settings
+
+    path = tmp_path_factory.mktemp("settings") / "settings.json"
+    init_settings(JSONSettingsStore(str(path)))
+    return path
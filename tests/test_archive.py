@@ -0,0 +1,174 @@
+"""
+Tests for whole-library backup archives.
+"""
+
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from prompt_generator.models.archive import (
+    ARCHIVE_FORMAT, MANIFEST_NAME, ArchiveReader, _TarWriter, archive_format, safe_filename
+)
+from prompt_generator.models.prompt import ChainOfThoughtPrompt, PersonaPrompt
+from prompt_generator.models.prompt_manager import PromptManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = PromptManager(str(tmp_path / "library"))
+    for i in range(5):
+        prompt = ChainOfThoughtPrompt(f"Prompt {i}")
+        prompt.topic = f"topic {i}"
+        manager.save_prompt(prompt)
+    template = PersonaPrompt("Persona")
+    template.role = "teacher"
+    manager.save_prompt(template, as_template=True)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def target(tmp_path):
+    manager = PromptManager(str(tmp_path / "restored"))
+    yield manager
+    manager.close()
+
+
+def prompts(manager):
+    return {entry["filename"]: entry["title"] for entry in manager.list_prompts()}
+
+
+@pytest.mark.parametrize("name", ["backup.zip", "backup.tar", "backup.tar.gz", "backup.tgz"])
+def test_round_trip(manager, target, tmp_path, name):
+    path = str(tmp_path / name)
+    counts = manager.export_archive(path)
+    assert counts == {"prompts": 5, "templates": 1, "history": 5}
+
+    with ArchiveReader(path) as reader:
+        header = reader.header()
+        assert header["format"] == ARCHIVE_FORMAT
+        assert header["counts"] == counts
+        assert len(list(reader.entries("prompts"))) == 5
+
+    restored = target.restore_archive(path)
+    assert restored == {"prompts": 5, "templates": 1, "history": 5, "errors": 0}
+    assert prompts(target) == prompts(manager)
+    assert target.load_prompt("Prompt_3.json").topic == "topic 3"
+    assert target.load_prompt("Persona.json", from_template=True).role == "teacher"
+    assert [entry["title"] for entry in target.get_history(10)] == \
+        [entry["title"] for entry in manager.get_history(10)]
+
+
+def test_restore_keeps_existing_prompts(manager, target, tmp_path):
+    path = str(tmp_path / "backup.tar.gz")
+    manager.export_archive(path)
+
+    prompt = ChainOfThoughtPrompt("Prompt 0")
+    prompt.topic = "mine"
+    target.save_prompt(prompt)
+
+    counts = target.restore_archive(path, include_history=False)
+    assert counts["prompts"] == 4
+    assert counts["history"] == 0
+    assert target.load_prompt("Prompt_0.json").topic == "mine"
+
+    target.restore_archive(path, overwrite=True, include_history=False)
+    assert target.load_prompt("Prompt_0.json").topic == "topic 0"
+
+
+def write_tar(path, members):
+    with tarfile.open(path, "w") as archive:
+        for name, data in members:
+            payload = json.dumps(data).encode("utf-8")
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            archive.addfile(info, io.BytesIO(payload))
+
+
+def evil_members():
+    data = ChainOfThoughtPrompt("Evil").to_dict()
+    names = [
+        "prompts/../../pwned.json",
+        "prompts/.hidden.json",
+        "prompts/ok.json",
+        "history/000001_../pwned.json",
+    ]
+    manifest = "".join(
+        json.dumps({"collection": name.split("/", 1)[0], "name": name,
+                    "filename": name.split("/", 1)[1].split("_", 1)[-1]
+                    if name.startswith("history") else name.split("/", 1)[1]}) + "\n"
+        for name in names
+    )
+    manifest += json.dumps({"format": ARCHIVE_FORMAT, "version": 1, "counts": {}}) + "\n"
+    return [(name, data) for name in names], manifest.encode("utf-8")
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar"])
+def test_unsafe_filenames_are_rejected(target, tmp_path, fmt, capsys):
+    members, manifest = evil_members()
+    path = str(tmp_path / f"evil.{fmt}")
+    if fmt == "zip":
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name, data in members:
+                archive.writestr(name, json.dumps(data))
+            archive.writestr(MANIFEST_NAME, manifest)
+    else:
+        write_tar(path, members)
+        with tarfile.open(path, "a") as archive:
+            info = tarfile.TarInfo(MANIFEST_NAME)
+            info.size = len(manifest)
+            archive.addfile(info, io.BytesIO(manifest))
+
+    counts = target.restore_archive(path)
+
+    assert counts["prompts"] == 1
+    assert counts["errors"] == 3
+    assert "unsafe filename" in capsys.readouterr().out
+    assert list(prompts(target)) == ["ok.json"]
+    assert not (tmp_path / "pwned.json").exists()
+    assert not os.path.exists(os.path.join(target.prompts_dir, ".hidden.json"))
+
+
+@pytest.mark.parametrize("filename, safe", [
+    ("prompt.json", True),
+    ("../prompt.json", False),
+    ("dir/prompt.json", False),
+    ("/etc/passwd", False),
+    (".hidden.json", False),
+    ("a..b.json", False),
+    ("", False),
+    (None, False),
+])
+def test_safe_filename(filename, safe):
+    assert safe_filename(filename) is safe
+
+
+def test_not_an_archive(target, tmp_path):
+    path = str(tmp_path / "plain.tar")
+    write_tar(path, [("prompts/a.json", {"title": "a"})])
+    with pytest.raises(ValueError):
+        target.restore_archive(path)
+    with pytest.raises(ValueError):
+        archive_format("backup.rar")
+
+
+def test_tar_members_are_not_kept(manager, tmp_path):
+    path = str(tmp_path / "backup.tar.gz")
+    manager.export_archive(path)
+
+    with ArchiveReader(path) as reader:
+        seen = 0
+        for archive, _ in reader._members():
+            assert len(archive.members) <= 1
+            seen += 1
+        assert seen == 12
+
+    writer = _TarWriter(str(tmp_path / "written.tar"), "tar")
+    writer.add("a.json", b"{}")
+    writer.add_file(MANIFEST_NAME, io.BytesIO(b"{}\n"))
+    assert writer.archive.members == []
+    writer.close()
@@ -0,0 +1,138 @@
+"""
+Tests for generating one prompt per row of a CSV or JSONL file.
+"""
+
+import json
+
+import pytest
+
+from prompt_generator.models.batch_generate import (
+    DEFAULT_SEPARATOR, BatchGenerator, main, render_rows
+)
+from prompt_generator.models.prompt import ChainOfThoughtPrompt, PersonaPrompt
+
+
+def expected_text(cls, **fields):
+    prompt = cls(fields.pop("title", ""))
+    for field, value in fields.items():
+        setattr(prompt, field, value)
+    return prompt.generate_text()
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    path = tmp_path / "rows.csv"
+    # "notes" is not a prompt field and "steps" is missing altogether
+    path.write_text(
+        "title,topic,audience,notes\n"
+        "First,Rivers,children,ignored\n"
+        'Second,"Tides, and moons",,also ignored\n',
+        encoding="utf-8"
+    )
+    return path
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    path = tmp_path / "rows.jsonl"
+    lines = [
+        json.dumps({"title": "First", "topic": "Rivers", "extra": [1, 2]}),
+        "",
+        json.dumps({"title": "Second", "role": "guide", "expertise": None}),
+        "not json",
+        json.dumps(["not", "an", "object"]),
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_csv_to_text(csv_file, tmp_path):
+    output = tmp_path / "out.txt"
+    assert main([str(csv_file), "--type", "cot", "-o", str(output)]) == 0
+
+    texts = [
+        expected_text(ChainOfThoughtPrompt, title="First", topic="Rivers", audience="children"),
+        expected_text(ChainOfThoughtPrompt, title="Second", topic="Tides, and moons"),
+    ]
+    assert output.read_text(encoding="utf-8") == DEFAULT_SEPARATOR.join(texts) + "\n"
+
+
+def test_jsonl_to_jsonl(jsonl_file, tmp_path, capsys):
+    output = tmp_path / "out.jsonl"
+    code = main([str(jsonl_file), "--type", "persona", "-o", str(output),
+                 "--output-format", "jsonl"])
+
+    assert code == 1
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert lines == [
+        {"row": 1, "title": "First",
+         "text": expected_text(PersonaPrompt, title="First", topic="Rivers")},
+        {"row": 3, "title": "Second",
+         "text": expected_text(PersonaPrompt, title="Second", role="guide")},
+    ]
+
+    err = capsys.readouterr().err
+    assert "row 4:" in err
+    assert "row 5: not a JSON object" in err
+    assert "2 prompts generated, 2 rows failed" in err
+
+
+def test_mapped_columns(tmp_path):
+    source = tmp_path / "rows.csv"
+    source.write_text("name,subject\nMapped,Volcanoes\n", encoding="utf-8")
+    output = tmp_path / "out.txt"
+
+    code = main([str(source), "--type", "tot", "--map", "name=title",
+                 "--map", "subject=topic", "--separator", "|", "-o", str(output)])
+    assert code == 0
+    assert "Topic: Volcanoes\n\n" in output.read_text(encoding="utf-8")
+
+
+def test_bad_type(csv_file, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(csv_file), "--type", "nonsense"])
+    assert exit_info.value.code == 2
+    assert "invalid choice" in capsys.readouterr().err
+
+    with pytest.raises(ValueError, match="prompt type must be one of"):
+        BatchGenerator("nonsense")
+
+
+def test_bad_mapping_and_missing_file(csv_file, tmp_path, capsys):
+    assert main([str(csv_file), "--type", "cot", "--map", "topic=nonsense"]) == 2
+    assert main([str(tmp_path / "missing.csv"), "--type", "cot"]) == 2
+    assert capsys.readouterr().err.count("Error:") == 2
+
+
+def test_type_comes_from_the_prompt_class(monkeypatch):
+    created = []
+    from_dict = ChainOfThoughtPrompt.from_dict
+
+    def record(data):
+        prompt = from_dict(data)
+        created.append(prompt)
+        return prompt
+
+    monkeypatch.setattr(ChainOfThoughtPrompt, "from_dict", record)
+    generator = BatchGenerator("cot")
+    render_rows(ChainOfThoughtPrompt, generator.columns,
+                [(2, {"title": "No type"}), (3, {"title": "Wrong type", "type": "persona"})])
+
+    assert [prompt.type for prompt in created] == ["cot", "cot"]
+
+
+def test_workers_keep_input_order(tmp_path):
+    source = tmp_path / "rows.jsonl"
+    source.write_text(
+        "".join(json.dumps({"title": f"Row {i}", "topic": str(i)}) + "\n" for i in range(30)),
+        encoding="utf-8"
+    )
+    output = tmp_path / "out.jsonl"
+
+    generator = BatchGenerator("cot", workers=2)
+    generator.chunk_size = 4
+    report = generator.run(str(source), str(output), output_format="jsonl")
+
+    assert report.generated == 30 and report.errors == []
+    rows = [json.loads(line)["row"] for line in output.read_text(encoding="utf-8").splitlines()]
+    assert rows == list(range(1, 31))
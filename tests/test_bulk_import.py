@@ -0,0 +1,143 @@
+"""
+Tests for bulk imports of prompt directories and zip archives.
+"""
+
+import json
+import os
+import zipfile
+
+import pytest
+
+from prompt_generator.models.bulk_import import BulkImporter, title_filename
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.models.prompt_manager import PromptManager
+
+
+def prompt_json(title, topic="imported"):
+    prompt = ChainOfThoughtPrompt(title)
+    prompt.topic = topic
+    return json.dumps(prompt.to_dict())
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = PromptManager(str(tmp_path / "library"))
+    existing = ChainOfThoughtPrompt("Taken")
+    existing.topic = "original"
+    manager.save_prompt(existing)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def source(tmp_path):
+    directory = tmp_path / "source"
+    (directory / "nested").mkdir(parents=True)
+    (directory / "a.json").write_text(prompt_json("Fresh"))
+    (directory / "nested" / "b.json").write_text(prompt_json("Taken"))
+    (directory / "bad.json").write_text("{not json")
+    (directory / "unknown.json").write_text(json.dumps({"type": "nope"}))
+    (directory / "notes.txt").write_text("ignored")
+    return directory
+
+
+def stored(manager):
+    return {entry["filename"]: entry["title"] for entry in manager.list_prompts()}
+
+
+def test_rename_on_conflict(manager, source):
+    report = manager.import_prompts(str(source), workers=1)
+
+    assert len(report.imported) == 2
+    assert sorted(name for name, _ in report.errors) == ["bad.json", "unknown.json"]
+    assert report.total == 4
+    assert stored(manager) == {
+        "Taken.json": "Taken",
+        "Fresh.json": "Fresh",
+        "Taken_(2).json": "Taken (2)",
+    }
+    assert manager.load_prompt("Taken.json").topic == "original"
+
+
+def test_skip_on_conflict(manager, source):
+    report = manager.import_prompts(str(source), on_conflict="skip", workers=1)
+
+    assert report.skipped == [os.path.join("nested", "b.json")]
+    assert sorted(stored(manager)) == ["Fresh.json", "Taken.json"]
+    assert manager.load_prompt("Taken.json").topic == "original"
+
+
+def test_overwrite_on_conflict(manager, source):
+    manager.import_prompts(str(source), on_conflict="overwrite", workers=1)
+
+    assert sorted(stored(manager)) == ["Fresh.json", "Taken.json"]
+    assert manager.load_prompt("Taken.json").topic == "imported"
+
+
+def test_conflicts_within_the_source(manager, tmp_path):
+    directory = tmp_path / "dupes"
+    directory.mkdir()
+    for i in range(3):
+        (directory / f"{i}.json").write_text(prompt_json("Same"))
+
+    manager.import_prompts(str(directory), workers=1)
+    assert sorted(stored(manager)) == [
+        "Same.json", "Same_(2).json", "Same_(3).json", "Taken.json"
+    ]
+
+
+def test_zip_archive_in_worker_processes(manager, tmp_path):
+    archive = tmp_path / "prompts.zip"
+    with zipfile.ZipFile(archive, 'w') as f:
+        for i in range(10):
+            f.writestr(f"dir/p{i}.json", prompt_json(f"Zipped {i}"))
+
+    importer = BulkImporter(manager, workers=2)
+    importer.chunk_size = 3
+    report = importer.run(str(archive))
+
+    assert len(report.imported) == 10
+    assert manager.load_prompt("Zipped_7.json").topic == "imported"
+
+
+def test_import_as_templates(manager, source):
+    manager.import_prompts(str(source), as_template=True, workers=1)
+    assert {entry["title"] for entry in manager.list_templates()} == {"Fresh", "Taken"}
+
+
+def test_invalid_source_and_mode(manager, tmp_path):
+    with pytest.raises(ValueError):
+        manager.import_prompts(str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        BulkImporter(manager, on_conflict="merge")
+
+
+@pytest.mark.parametrize("title, filename", [
+    ("My title", "My_title.json"),
+    ("../../pwned", "_.._pwned.json"),
+    ("a/b\\c", "a_b_c.json"),
+    (".hidden", "hidden.json"),
+    ("..", None),
+    ("", None),
+    ("/", None),
+])
+def test_title_filename(title, filename):
+    assert title_filename(title) == filename
+
+
+def test_unsafe_titles_stay_in_the_library(manager, tmp_path):
+    directory = tmp_path / "evil"
+    directory.mkdir()
+    (directory / "1.json").write_text(prompt_json("../../pwned"))
+    (directory / "2.json").write_text(prompt_json(".."))
+    (directory / "3.json").write_text(prompt_json("/etc/passwd"))
+
+    report = manager.import_prompts(str(directory), workers=1)
+
+    assert len(report.imported) == 3
+    assert not (tmp_path / "pwned.json").exists()
+    assert sorted(stored(manager)) == [
+        "COT_import.json", "Taken.json", "_.._pwned.json", "_etc_passwd.json"
+    ]
+    for filename in stored(manager):
+        assert os.path.exists(os.path.join(manager.prompts_dir, filename))
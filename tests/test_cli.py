@@ -0,0 +1,185 @@
+"""
+Tests for the command-line interface.
+"""
+
+import json
+
+import pytest
+
+from prompt_generator.cli import main
+from prompt_generator.models.prompt import ChainOfThoughtPrompt, PersonaPrompt
+
+
+@pytest.fixture
+def run(tmp_path, capsys):
+    """Run the command line against a library in a temporary directory."""
+    base = ["--base-dir", str(tmp_path / "library"), "--settings", str(tmp_path / "settings.json")]
+
+    def run(*argv):
+        code = main(base + list(argv))
+        out, err = capsys.readouterr()
+        return code, out, err
+
+    return run
+
+
+def test_generate_new_prompt(run):
+    code, out, err = run("generate", "cot", "--title", "Rivers", "--set", "topic=Rivers",
+                         "--set", "audience=children")
+
+    expected = ChainOfThoughtPrompt("Rivers")
+    expected.topic = "Rivers"
+    expected.audience = "children"
+    assert code == 0
+    assert out == expected.generate_text() + "\n"
+    assert err == ""
+
+
+def test_generate_save_and_load(run):
+    code, _, err = run("generate", "persona", "--title", "Guide", "--set", "role=guide", "--save")
+    assert code == 0
+    assert "Saved to" in err
+
+    code, out, _ = run("generate", "--load", "Guide", "--set", "style=friendly")
+    expected = PersonaPrompt("Guide")
+    expected.role = "guide"
+    expected.style = "friendly"
+    assert code == 0
+    assert out == expected.generate_text() + "\n"
+
+
+@pytest.mark.parametrize("argv, message", [
+    (("generate",), "give a prompt type or --load NAME"),
+    (("generate", "cot", "--set", "role=teacher"), "has no field 'role'"),
+    (("generate", "cot", "--set", "created_at=now"), "has no field 'created_at'"),
+    (("generate", "cot", "--set", "topic"), "expected FIELD=VALUE"),
+    (("generate", "--load", "Missing"), "no saved prompt named 'Missing'"),
+    (("export", "Missing"), "no saved prompt named 'Missing'"),
+])
+def test_errors_exit_with_2(run, argv, message):
+    code, out, err = run(*argv)
+    assert code == 2
+    assert out == ""
+    assert err.startswith("Error: ") and message in err
+
+
+def test_unknown_type_is_a_usage_error(run, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        run("generate", "nonsense")
+    assert exit_info.value.code == 2
+    assert "invalid choice: 'nonsense'" in capsys.readouterr().err
+
+
+def save(run, prompt_type, title, **fields):
+    argv = ["generate", prompt_type, "--title", title, "--save"]
+    for field, value in fields.items():
+        argv += ["--set", f"{field}={value}"]
+    assert run(*argv)[0] == 0
+
+
+def test_list(run):
+    assert run("list") == (0, "", "")
+
+    save(run, "cot", "Alpha", topic="rivers")
+    save(run, "persona", "Beta", topic="tides")
+    save(run, "cot", "Gamma", topic="rivers and tides")
+
+    code, out, _ = run("list", "--sort", "title")
+    assert code == 0
+    assert out.splitlines() == [
+        "Gamma.json\tcot\tGamma",
+        "Beta.json\tpersona\tBeta",
+        "Alpha.json\tcot\tAlpha",
+    ]
+
+    _, out, _ = run("list", "--sort", "title", "--reverse", "--limit", "2")
+    assert out.splitlines() == ["Alpha.json\tcot\tAlpha", "Beta.json\tpersona\tBeta"]
+
+    _, out, _ = run("list", "--type", "persona")
+    assert out.splitlines() == ["Beta.json\tpersona\tBeta"]
+
+
+def test_search(run):
+    save(run, "cot", "Alpha", topic="rivers")
+    save(run, "persona", "Beta", topic="tides")
+    save(run, "cot", "Gamma", topic="rivers and tides")
+
+    code, out, _ = run("search", "topic:rivers")
+    assert code == 0
+    assert sorted(out.splitlines()) == ["Alpha.json\tcot\tAlpha", "Gamma.json\tcot\tGamma"]
+
+    _, out, _ = run("search", "topic:tides", "--type", "persona")
+    assert out.splitlines() == ["Beta.json\tpersona\tBeta"]
+
+    _, out, _ = run("search", "topic:rivers", "--limit", "1")
+    assert len(out.splitlines()) == 1
+
+    # No match is not an error, but is reported by the exit code
+    assert run("search", "topic:volcanoes") == (1, "", "")
+
+
+def test_export(run, tmp_path):
+    save(run, "cot", "Alpha", topic="rivers")
+
+    code, out, _ = run("export", "Alpha", "--format", "json")
+    assert code == 0
+    assert json.loads(out)["topic"] == "rivers"
+
+    # The default format comes from the settings
+    code, out, _ = run("export", "Alpha.json")
+    assert code == 0
+    assert out.startswith("Topic: rivers")
+
+    target = tmp_path / "alpha.md"
+    code, out, err = run("export", "Alpha", "--format", "md", "-o", str(target))
+    assert (code, out) == (0, "")
+    assert f"Exported to {target}" in err
+    assert "rivers" in target.read_text(encoding="utf-8")
+
+
+def test_import(run, tmp_path):
+    source = tmp_path / "incoming"
+    source.mkdir()
+    for title in ("One", "Two"):
+        prompt = ChainOfThoughtPrompt(title)
+        prompt.topic = title.lower()
+        (source / f"{title}.json").write_text(json.dumps(prompt.to_dict()), encoding="utf-8")
+    (source / "broken.json").write_text("{not json", encoding="utf-8")
+
+    code, out, err = run("import", str(source), "--workers", "1")
+    assert code == 1
+    assert out == "2 imported, 0 skipped, 1 failed of 3 files\n"
+    assert err.startswith("broken.json: ")
+
+    _, out, _ = run("list", "--sort", "title", "--reverse")
+    assert out.splitlines() == ["One.json\tcot\tOne", "Two.json\tcot\tTwo"]
+
+    (source / "broken.json").unlink()
+    code, out, _ = run("import", str(source), "--workers", "1", "--on-conflict", "skip")
+    assert code == 0
+    assert out == "0 imported, 2 skipped, 0 failed of 2 files\n"
+
+    code, out, err = run("import", str(tmp_path / "missing"))
+    assert code == 2
+    assert err.startswith("Error: ")
+
+
+def test_batch(run, tmp_path):
+    source = tmp_path / "rows.csv"
+    source.write_text("title,who\nFirst,children\nSecond,adults\n", encoding="utf-8")
+    output = tmp_path / "prompts.jsonl"
+
+    code, out, err = run("batch", str(source), "--type", "cot", "--map", "who=audience",
+                         "--output-format", "jsonl", "-o", str(output))
+    assert (code, out) == (0, "")
+    assert "2 prompts generated, 0 rows failed" in err
+
+    lines = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    expected = ChainOfThoughtPrompt("Second")
+    expected.audience = "adults"
+    assert [line["title"] for line in lines] == ["First", "Second"]
+    assert lines[1]["text"] == expected.generate_text()
+
+    code, _, err = run("batch", str(tmp_path / "missing.csv"), "--type", "cot")
+    assert code == 2
+    assert err.startswith("Error: ")
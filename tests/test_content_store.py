@@ -0,0 +1,96 @@
+"""
+Tests for content-addressed history snapshots.
+"""
+
+import os
+
+import pytest
+
+from prompt_generator.models.content_store import (
+    content_digest, restore_timestamps, strip_timestamps
+)
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.models.storage import JSONFileStorage, SQLiteStorage
+
+
+def prompt_data(title="Intro", topic="python", updated_at="2024-01-01T00:00:00"):
+    prompt = ChainOfThoughtPrompt(title)
+    prompt.topic = topic
+    data = prompt.to_dict()
+    data["updated_at"] = updated_at
+    return data
+
+
+def test_digest_ignores_timestamps():
+    first = prompt_data(updated_at="2024-01-01T00:00:00")
+    second = prompt_data(updated_at="2025-06-01T12:00:00")
+    assert content_digest(first) == content_digest(second)
+    assert content_digest(first) != content_digest(prompt_data(topic="ruby"))
+
+
+def test_digest_ignores_key_order():
+    data = prompt_data()
+    reordered = dict(reversed(list(data.items())))
+    assert content_digest(data) == content_digest(reordered)
+
+
+def test_restore_timestamps_round_trip():
+    data = prompt_data()
+    assert restore_timestamps(strip_timestamps(data), data) == data
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        backend = JSONFileStorage(str(tmp_path))
+    else:
+        backend = SQLiteStorage(str(tmp_path / "library.sqlite3"))
+    yield backend
+    backend.close()
+
+
+def test_unchanged_save_adds_no_record(storage):
+    assert storage.add_history("cot_1.json", prompt_data(updated_at="1"))
+    assert not storage.add_history("cot_2.json", prompt_data(updated_at="2"))
+    assert len(list(storage.iter_history_entries())) == 1
+
+
+def test_identical_content_is_stored_once(storage):
+    storage.add_history("a_1.json", prompt_data(topic="one"))
+    storage.add_history("a_2.json", prompt_data(topic="two"))
+    # Back to the first content: a new record pointing at the existing blob
+    storage.add_history("a_3.json", prompt_data(topic="one", updated_at="3"))
+
+    entries = list(storage.iter_history_entries())
+    assert len(entries) == 3
+    blobs = [storage._read_history(entry["id"])["blob"] for entry in entries]
+    assert blobs[0] == blobs[2] != blobs[1]
+    assert storage.load_history(entries[0]["id"])["updated_at"] == "3"
+    assert storage.load_history(entries[2]["id"])["topic"] == "one"
+
+
+def test_dedup_is_per_title(storage):
+    storage.add_history("a.json", prompt_data(title="A"))
+    assert storage.add_history("b.json", prompt_data(title="B"))
+
+
+def test_json_blob_files_are_shared(tmp_path):
+    storage = JSONFileStorage(str(tmp_path))
+    for i in range(4):
+        storage.add_history(f"x_{i}.json", prompt_data(title=f"T{i % 2}", topic="same"))
+
+    blobs = [name for _, _, names in os.walk(storage.blobs_dir) for name in names]
+    assert len(blobs) == 2
+
+
+def test_pruning_collects_unreferenced_blobs(tmp_path):
+    storage = JSONFileStorage(str(tmp_path))
+    storage.history.segment_size = 2
+    for i in range(6):
+        storage.add_history(f"x_{i}.json", prompt_data(title=f"T{i}", topic=f"topic {i}"))
+    storage.prune_history(2)
+
+    blobs = {name[:-5] for _, _, names in os.walk(storage.blobs_dir) for name in names}
+    assert blobs == {entry["blob"] for entry in storage.history.iter_stored()}
+    for entry in storage.iter_history_entries():
+        assert storage.load_history(entry["id"]) is not None
@@ -0,0 +1,121 @@
+"""
+Tests for batch exports and their cancellation.
+"""
+
+import os
+import threading
+
+import pytest
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.utils.export_manager import ExportManager
+
+
+def make_prompts(count):
+    prompts = []
+    for i in range(count):
+        prompt = ChainOfThoughtPrompt(f"Prompt {i}")
+        prompt.topic = f"topic {i}"
+        prompts.append(prompt)
+    return prompts
+
+
+def test_batch_export_writes_every_format(tmp_path):
+    calls = []
+    report = ExportManager().export_batch(
+        make_prompts(3), ["txt", "md"], str(tmp_path),
+        progress=lambda done, total, result: calls.append((done, total))
+    )
+
+    assert report.ok
+    assert len(report.succeeded) == 6
+    assert sorted(os.listdir(tmp_path)) == [
+        f"Prompt {i}.{ext}" for i in range(3) for ext in ("md", "txt")
+    ]
+    assert [done for done, _ in calls] == list(range(1, 7))
+    assert {total for _, total in calls} == {6}
+
+
+def test_duplicate_and_unsafe_titles_get_distinct_files(tmp_path):
+    prompts = [{"title": "Same", "topic": "a"}, {"title": "same", "topic": "b"},
+               {"title": "../up", "topic": "c"}, {"title": "", "topic": "d"}]
+    report = ExportManager().export_batch(prompts, ["txt"], str(tmp_path))
+
+    names = [os.path.basename(result.filepath) for result in report.results]
+    assert names == ["Same.txt", "same_2.txt", ".._up.txt", "Untitled Prompt.txt"]
+    assert all(os.path.dirname(result.filepath) == str(tmp_path) for result in report.results)
+
+
+def test_repeated_formats_and_colliding_names(tmp_path):
+    # "a/b" and "a?b" both sanitize to "a_b", which another title already is
+    prompts = [{"title": "a/b", "topic": "1"}, {"title": "a?b", "topic": "2"},
+               {"title": "a_b", "topic": "3"}, {"title": "A_B_2", "topic": "4"}]
+    report = ExportManager().export_batch(prompts, ["txt", "md", "txt"], str(tmp_path))
+
+    assert report.ok
+    paths = [result.filepath for result in report.results]
+    assert len(paths) == 8
+    assert len({path.lower() for path in paths}) == 8
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in paths)
+
+    for result in report.results:
+        with open(result.filepath, encoding="utf-8") as f:
+            assert f"Topic: {prompts[result.index]['topic']}" in f.read()
+
+
+def test_cancel_before_start(tmp_path):
+    cancel = threading.Event()
+    cancel.set()
+    report = ExportManager().export_batch(
+        make_prompts(4), ["txt"], str(tmp_path), cancel_event=cancel
+    )
+
+    assert not report.ok
+    assert len(report.cancelled) == 4
+    assert os.listdir(tmp_path) == []
+
+
+def test_cancel_midway_skips_the_rest(tmp_path):
+    cancel = threading.Event()
+    manager = ExportManager()
+    original = manager._export
+    written = []
+
+    def export(prompt_data, filepath, format_type):
+        original(prompt_data, filepath, format_type)
+        written.append(filepath)
+        if len(written) == 2:
+            cancel.set()
+        return True
+
+    manager._export = export
+    report = manager.export_batch(
+        make_prompts(20), ["txt"], str(tmp_path), max_workers=1, cancel_event=cancel
+    )
+
+    assert len(report.succeeded) == 2
+    assert len(report.cancelled) == 18
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(path) for path in written)
+    for result in report.cancelled:
+        assert not os.path.exists(result.filepath)
+
+
+def test_failures_are_reported_per_item(tmp_path):
+    manager = ExportManager()
+    original = manager._export
+
+    def export(prompt_data, filepath, format_type):
+        if format_type == "html":
+            raise OSError("disk full")
+        return original(prompt_data, filepath, format_type)
+
+    manager._export = export
+    report = manager.export_batch(make_prompts(2), ["txt", "html"], str(tmp_path))
+
+    assert len(report.succeeded) == 2
+    assert [result.error for result in report.failed] == ["disk full", "disk full"]
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError):
+        ExportManager().export_batch(make_prompts(1), ["pdf"], str(tmp_path))
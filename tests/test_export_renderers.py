@@ -0,0 +1,109 @@
+"""
+Tests for the export renderers.
+"""
+
+import json
+
+import pytest
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.utils import export_renderers
+from prompt_generator.utils.export_renderers import RENDERERS, get_renderer, iter_lines
+
+
+def evil_prompt():
+    return {
+        "title": "<script>alert('x')</script> & co",
+        "type": "cot",
+        "created_at": "<today>",
+        "generated_text": "Use <b>bold</b> & \"quotes\"\n\nsecond line"
+    }
+
+
+def test_html_escapes_title_metadata_and_text():
+    page = RENDERERS["html"].render(evil_prompt())
+
+    assert "<script>" not in page
+    assert "<title>&lt;script&gt;alert(&#x27;x&#x27;)&lt;/script&gt; &amp; co</title>" in page
+    assert "<strong>Created:</strong> &lt;today&gt;" in page
+    assert "<p>Use &lt;b&gt;bold&lt;/b&gt; &amp; \"quotes\"</p>\n<br>\n<p>second line</p>\n" in page
+    assert "<strong>Type:</strong> COT" in page
+
+
+def test_markdown_keeps_text_unchanged():
+    document = RENDERERS["md"].render(evil_prompt())
+
+    assert document.startswith("# <script>alert('x')</script> & co\n\n**Type:** COT\n\n")
+    assert "**Created:** <today>" in document
+    assert document.endswith("## Prompt\n\nUse <b>bold</b> & \"quotes\"\n\nsecond line")
+
+
+def test_json_round_trips():
+    data = evil_prompt()
+    assert json.loads(RENDERERS["json"].render(data)) == data
+
+
+def test_prompt_objects_include_generated_text():
+    prompt = ChainOfThoughtPrompt("Steps")
+    prompt.topic = "a < b"
+
+    assert RENDERERS["txt"].render(prompt) == prompt.generate_text()
+    data = json.loads(RENDERERS["json"].render(prompt))
+    assert data["generated_text"] == prompt.generate_text()
+    assert "a &lt; b" in RENDERERS["html"].render(prompt)
+
+
+def test_summary_without_generated_text():
+    text = RENDERERS["txt"].render({"title": "T", "type": "cot", "topic_area": "x", "empty": ""})
+    assert text == "Title: T\n\nTopic Area: x\n\n"
+
+
+def test_unknown_format_falls_back_to_text():
+    assert get_renderer("pdf") is RENDERERS["txt"]
+
+
+@pytest.mark.parametrize("chunks", [
+    ["a\nb\n\nc"],
+    ["a", "\n", "b\n", "\nc"],
+    ["", "a\nb", "", "\n\nc", ""],
+    ["\n"],
+    [""],
+])
+def test_iter_lines_matches_split(chunks):
+    assert list(iter_lines(chunks)) == "".join(chunks).split("\n")
+
+
+@pytest.mark.parametrize("format_type", ["md", "html"])
+def test_missing_or_null_type(format_type):
+    for data in ({"title": "T", "type": None, "generated_text": "x"}, {"title": "T", "generated_text": "x"}):
+        assert "x" in RENDERERS[format_type].render(data)
+
+
+class RecordingFile:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+@pytest.mark.parametrize("format_type", sorted(RENDERERS))
+def test_write_streams_long_fields_in_slices(format_type, monkeypatch):
+    monkeypatch.setattr(export_renderers, "WRITE_BUFFER_SIZE", 100)
+
+    data = {"title": "Long", "type": "cot", "generated_text": "word " * 1000}
+    f = RecordingFile()
+    RENDERERS[format_type].write(data, f)
+
+    assert "".join(f.writes) == RENDERERS[format_type].render(data)
+    assert max(len(part) for part in f.writes) <= 100
+
+
+@pytest.mark.parametrize("format_type", sorted(RENDERERS))
+def test_write_file_matches_render(format_type, tmp_path):
+    prompt = ChainOfThoughtPrompt("Ünïcode ✓")
+    prompt.topic = "line one\nline two"
+    path = tmp_path / f"out.{format_type}"
+
+    RENDERERS[format_type].write_file(prompt, str(path))
+    assert path.read_text(encoding="utf-8") == RENDERERS[format_type].render(prompt)
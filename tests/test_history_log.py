@@ -0,0 +1,216 @@
+"""
+Tests for the segmented, append-only history log.
+"""
+
+import multiprocessing
+import os
+
+from prompt_generator.models.history_log import HistoryLog
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.models.storage import JSONFileStorage
+
+
+def append(log, count, start=0, title=None):
+    return [
+        log.append({"filename": f"h{i}.json", "title": title or f"T{i}", "updated_at": ""},
+                   {"data": {"n": i}})
+        for i in range(start, start + count)
+    ]
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith("segment_"))
+
+
+def test_append_read_and_reopen(tmp_path):
+    log = HistoryLog(str(tmp_path), segment_size=3)
+    ids = append(log, 7)
+    assert ids == list(range(1, 8))
+    assert len(segment_files(str(tmp_path))) == 3
+
+    reopened = HistoryLog(str(tmp_path), segment_size=3)
+    assert [meta["id"] for meta in reopened.iter_entries()] == ids[::-1]
+    assert reopened.read(5)["data"] == {"n": 4}
+    assert reopened.read(99) is None
+    assert append(reopened, 1, start=7) == [8]
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    log = HistoryLog(str(tmp_path))
+    append(log, 3)
+    path = os.path.join(str(tmp_path), segment_files(str(tmp_path))[-1])
+    with open(path, 'ab') as f:
+        f.write(b'{"id": 4, "filename": "torn')
+
+    reopened = HistoryLog(str(tmp_path))
+    assert [meta["id"] for meta in reopened.iter_entries()] == [3, 2, 1]
+
+    # New records start on a clean line instead of joining the torn one
+    append(reopened, 1, start=3)
+    again = HistoryLog(str(tmp_path))
+    assert [meta["id"] for meta in again.iter_entries()] == [4, 3, 2, 1]
+    assert again.read(4)["data"] == {"n": 3}
+
+
+def test_prune_hides_then_drops_whole_segments(tmp_path):
+    log = HistoryLog(str(tmp_path), segment_size=4)
+    append(log, 10)
+
+    assert log.prune(5) == 4
+    assert len(segment_files(str(tmp_path))) == 2
+    # Records 6..10 are retained; 5 is stored but hidden
+    assert [meta["id"] for meta in log.iter_entries()] == [10, 9, 8, 7, 6]
+    assert [meta["id"] for meta in log.iter_stored()] == [5, 6, 7, 8, 9, 10]
+
+
+def test_prune_compacts_oversized_segments(tmp_path):
+    log = HistoryLog(str(tmp_path), segment_size=10)
+    append(log, 10)
+
+    # A smaller segment size leaves most of the single segment hidden
+    log = HistoryLog(str(tmp_path), segment_size=2)
+    removed = log.prune(3)
+    assert removed == 7
+    assert [meta["id"] for meta in log.iter_stored()] == [8, 9, 10]
+    assert [meta["id"] for meta in log.iter_entries()] == [10, 9, 8]
+    assert log.read(9)["data"] == {"n": 8}
+    assert len(segment_files(str(tmp_path))) == 2
+
+
+def test_latest_for_title(tmp_path):
+    log = HistoryLog(str(tmp_path), segment_size=2)
+    append(log, 1, title="A")
+    append(log, 1, start=1, title="B")
+    assert log.latest_for_title("A")["id"] == 1
+
+    append(log, 1, start=2, title="A")
+    assert log.latest_for_title("A")["id"] == 3
+    assert log.latest_for_title("missing") is None
+
+    # Records outside the retention window do not count
+    append(log, 3, start=3, title="C")
+    log.prune(2)
+    assert log.latest_for_title("A") is None
+    assert log.latest_for_title("C")["id"] == 6
+
+    assert HistoryLog(str(tmp_path), segment_size=2).latest_for_title("C")["id"] == 6
+
+
+def test_json_storage_prunes_history(tmp_path):
+    storage = JSONFileStorage(str(tmp_path))
+    storage.history.segment_size = 5
+    for i in range(23):
+        prompt = ChainOfThoughtPrompt(f"Prompt {i}")
+        prompt.topic = f"topic {i}"
+        storage.add_history(f"cot_{i}.json", prompt.to_dict())
+        storage.prune_history(10)
+
+    entries = list(storage.iter_history_entries())
+    assert len(entries) == 10
+    assert entries[0]["filename"] == "cot_22.json"
+    assert storage.load_history(entries[-1]["id"])["topic"] == "topic 13"
+    assert len(storage.history.segments) <= 3
+
+
+def test_reading_does_not_truncate(tmp_path):
+    log = HistoryLog(str(tmp_path))
+    append(log, 3)
+    path = os.path.join(str(tmp_path), segment_files(str(tmp_path))[-1])
+    with open(path, 'ab') as f:
+        f.write(b'{"id": 4, "filename": "torn')
+    size = os.path.getsize(path)
+
+    reopened = HistoryLog(str(tmp_path))
+    list(reopened.iter_entries())
+    reopened.read(2)
+    assert os.path.getsize(path) == size
+
+
+def test_corrupt_middle_line_keeps_later_records(tmp_path, capsys):
+    log = HistoryLog(str(tmp_path))
+    append(log, 4)
+    path = os.path.join(str(tmp_path), segment_files(str(tmp_path))[-1])
+    with open(path, 'rb') as f:
+        lines = f.readlines()
+    lines[1] = b"{not json\n"
+    with open(path, 'wb') as f:
+        f.writelines(lines)
+
+    reopened = HistoryLog(str(tmp_path))
+    assert [meta["id"] for meta in reopened.iter_entries()] == [4, 3, 1]
+    assert reopened.read(3)["data"] == {"n": 2}
+    assert reopened.read(2) is None
+    assert "Error reading history record" in capsys.readouterr().out
+
+    assert append(reopened, 1, start=4) == [5]
+    assert [meta["id"] for meta in HistoryLog(str(tmp_path)).iter_entries()] == [5, 4, 3, 1]
+
+
+def test_final_line_without_newline_is_torn(tmp_path):
+    log = HistoryLog(str(tmp_path))
+    append(log, 2)
+    path = os.path.join(str(tmp_path), segment_files(str(tmp_path))[-1])
+    # Parses as JSON, but the write never finished
+    with open(path, 'ab') as f:
+        f.write(b'{"id": 3, "filename": "h2.json", "title": "T2"}')
+
+    reopened = HistoryLog(str(tmp_path))
+    assert [meta["id"] for meta in reopened.iter_entries()] == [2, 1]
+    append(reopened, 1, start=2)
+
+    with open(path, 'rb') as f:
+        lines = f.read().split(b"\n")
+    assert lines[-1] == b""
+    assert [meta["id"] for meta in HistoryLog(str(tmp_path)).iter_entries()] == [3, 2, 1]
+
+
+def test_two_writers_get_distinct_ids(tmp_path):
+    first = HistoryLog(str(tmp_path), segment_size=3)
+    second = HistoryLog(str(tmp_path), segment_size=3)
+
+    ids = []
+    for i in range(8):
+        writer = first if i % 2 == 0 else second
+        ids += append(writer, 1, start=i)
+
+    assert ids == list(range(1, 9))
+    for log in (first, second, HistoryLog(str(tmp_path), segment_size=3)):
+        for record_id in ids:
+            assert log.read(record_id)["data"] == {"n": record_id - 1}
+
+
+def test_read_checks_the_id_it_found(tmp_path):
+    log = HistoryLog(str(tmp_path))
+    # A log written before appends were locked may repeat or skip ids
+    for record_id in (1, 2, 2, 5):
+        log.append({"filename": f"h{record_id}.json", "title": "T"}, {"data": record_id})
+    path = os.path.join(str(tmp_path), segment_files(str(tmp_path))[-1])
+    with open(path, 'wb') as f:
+        for record_id in (1, 2, 2, 5):
+            f.write(f'{{"id": {record_id}, "data": {record_id}}}\n'.encode("utf-8"))
+
+    reopened = HistoryLog(str(tmp_path))
+    assert reopened.read(5)["data"] == 5
+    assert reopened.read(2)["data"] == 2
+    assert reopened.read(4) is None
+
+
+def append_in_process(directory, start):
+    append(HistoryLog(directory, segment_size=7), 25, start=start)
+
+
+def test_concurrent_processes(tmp_path):
+    processes = [
+        multiprocessing.Process(target=append_in_process, args=(str(tmp_path), start))
+        for start in (0, 100, 200)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    log = HistoryLog(str(tmp_path), segment_size=7)
+    assert [meta["id"] for meta in log.iter_stored()] == list(range(1, 76))
+    assert sorted(log.read(record_id)["data"]["n"] for record_id in range(1, 76)) == \
+        sorted(n for start in (0, 100, 200) for n in range(start, start + 25))
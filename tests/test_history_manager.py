@@ -0,0 +1,79 @@
+"""
+Tests for the journaled HistoryManager.
+"""
+
+import pytest
+
+from prompt_generator.utils.history_manager import HistoryManager
+
+
+@pytest.fixture
+def history_file(tmp_path):
+    return str(tmp_path / "prompt_history.json")
+
+
+def titles(manager):
+    return [item["title"] for item in manager.get_history()]
+
+
+def test_changes_survive_a_restart(history_file):
+    manager = HistoryManager(history_file)
+    for i in range(3):
+        manager.add_to_history({"title": f"a{i}"})
+    manager.remove_from_history(1)
+
+    assert titles(HistoryManager(history_file)) == ["a2", "a0"]
+
+
+def test_torn_journal_tail_is_truncated(history_file):
+    manager = HistoryManager(history_file)
+    for i in range(3):
+        manager.add_to_history({"title": f"a{i}"})
+
+    # Simulate a crash in the middle of writing an operation
+    with open(manager.journal_file, 'a') as f:
+        f.write('{"op": "add", "item": {"title": "lo')
+
+    restarted = HistoryManager(history_file)
+    assert titles(restarted) == ["a2", "a1", "a0"]
+    restarted.add_to_history({"title": "after1"})
+    restarted.add_to_history({"title": "after2"})
+    assert titles(restarted) == ["after2", "after1", "a2", "a1", "a0"]
+
+    # Operations recorded after the crash must not merge into the torn line
+    assert titles(HistoryManager(history_file)) == ["after2", "after1", "a2", "a1", "a0"]
+
+
+def test_line_without_newline_counts_as_torn(history_file):
+    manager = HistoryManager(history_file)
+    manager.add_to_history({"title": "a0"})
+    with open(manager.journal_file, 'a') as f:
+        f.write('{"op": "clear", "seq": 2}')
+
+    restarted = HistoryManager(history_file)
+    assert titles(restarted) == ["a0"]
+    restarted.add_to_history({"title": "a1"})
+    assert titles(HistoryManager(history_file)) == ["a1", "a0"]
+
+
+def test_compaction_folds_the_journal(history_file):
+    manager = HistoryManager(history_file)
+    manager.compact_threshold = 5
+    for i in range(12):
+        manager.add_to_history({"title": f"a{i}"})
+    manager.compact()
+
+    expected = [f"a{i}" for i in reversed(range(12))]
+    assert titles(manager) == expected
+    assert titles(HistoryManager(history_file)) == expected
+
+
+def test_limit_and_clear(history_file, settings_file):
+    manager = HistoryManager(history_file)
+    manager.set_max_items(2)
+    for i in range(4):
+        manager.add_to_history({"title": f"a{i}"})
+    assert titles(HistoryManager(history_file)) == ["a3", "a2"]
+
+    manager.clear_history()
+    assert titles(HistoryManager(history_file)) == []
@@ -0,0 +1,173 @@
+"""
+Import-time regression tests for the Prompt Generator package.
+
+Each import runs in a fresh interpreter with -X importtime, and the test
+fails if a module that the import should leave unloaded shows up, i.e.
+if an eager import creeps back into a package __init__ or a start-up path.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+HAS_PYQT5 = importlib.util.find_spec("PyQt5") is not None
+
+# Modules that only the library features, not start-up, need
+STORAGE_MODULES = (
+    "prompt_generator.models.prompt_manager",
+    "prompt_generator.models.storage",
+    "prompt_generator.models.search_index",
+    "prompt_generator.models.bulk_import",
+    "prompt_generator.models.archive",
+    "sqlite3",
+)
+
+
+# Cumulative import time allowed for the command-line module, in microseconds
+CLI_IMPORT_BUDGET = 100000
+
+
+def import_times(statement):
+    """Get the cumulative import time in microseconds of each module loaded
+    by running a statement in a new interpreter."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC_DIR, env.get("PYTHONPATH")]))
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        universal_newlines=True, check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith("import time:") and line.count("|") == 2:
+            _, cumulative, name = line.split("|")
+            name = name.strip()
+            if name != "imported package":
+                times[name] = int(cumulative)
+    return times
+
+
+def imported_modules(statement):
+    """Get the modules loaded by running a statement in a new interpreter."""
+    return set(import_times(statement))
+
+
+def assert_not_imported(statement, forbidden):
+    """Fail if running a statement loads any of the forbidden modules."""
+    modules = imported_modules(statement)
+    assert "prompt_generator" in modules
+    for name in forbidden:
+        loaded = sorted(
+            module for module in modules
+            if module == name or module.startswith(name + ".")
+        )
+        assert not loaded, f"{statement!r} imported {', '.join(loaded)}"
+
+
+def test_package():
+    assert_not_imported("import prompt_generator", (
+        "PyQt5",
+        "prompt_generator.app",
+        "prompt_generator.models",
+        "prompt_generator.ui",
+        "prompt_generator.utils",
+    ))
+
+
+def test_models_package():
+    assert_not_imported(
+        "import prompt_generator.models",
+        ("PyQt5", "prompt_generator.models.prompt") + STORAGE_MODULES
+    )
+
+
+def test_prompt_models():
+    assert_not_imported(
+        "from prompt_generator.models import PersonaPrompt",
+        ("PyQt5",) + STORAGE_MODULES
+    )
+
+
+def test_ui_package():
+    assert_not_imported("import prompt_generator.ui", (
+        "PyQt5",
+        "prompt_generator.ui.content",
+        "prompt_generator.ui.prompt_forms",
+    ))
+
+
+def test_utils_package():
+    assert_not_imported("import prompt_generator.utils", (
+        "PyQt5",
+        "prompt_generator.utils.settings",
+        "prompt_generator.utils.stylesheets",
+    ))
+
+
+def test_cli():
+    assert_not_imported("import prompt_generator.cli", (
+        "PyQt5",
+        "prompt_generator.app",
+        "prompt_generator.ui",
+        "prompt_generator.utils.export_renderers",
+    ) + STORAGE_MODULES)
+
+
+def test_cli_generate():
+    # A new prompt needs no library, so generating one loads none of it
+    assert_not_imported(
+        "import io, contextlib, prompt_generator.cli as cli\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    cli.main(['generate', 'cot', '--title', 'Cold start'])",
+        ("PyQt5", "multiprocessing") + STORAGE_MODULES
+    )
+
+
+def test_cli_cold_start():
+    # Best of a few runs, so a busy machine does not fail the test
+    cumulative = min(
+        import_times("import prompt_generator.cli")["prompt_generator.cli"]
+        for _ in range(3)
+    )
+    assert cumulative < CLI_IMPORT_BUDGET, (
+        f"importing prompt_generator.cli took {cumulative / 1000:.1f} ms"
+    )
+
+
+@pytest.mark.skipif(not HAS_PYQT5, reason="PyQt5 is not installed")
+def test_application():
+    assert_not_imported("import prompt_generator.app", STORAGE_MODULES + (
+        "prompt_generator.utils.export_manager",
+        "prompt_generator.utils.history_manager",
+        "prompt_generator.utils.template_manager",
+    ))
+
+
+def test_lazy_names_resolve():
+    packages = ["prompt_generator.models", "prompt_generator.utils"]
+    if HAS_PYQT5:
+        packages += ["prompt_generator", "prompt_generator.ui"]
+
+    statement = "; ".join(
+        f"import {package}; [getattr({package}, name) for name in {package}.__all__]"
+        for package in packages
+    )
+    imported_modules(statement)
+
+
+def test_lazy_attributes():
+    import prompt_generator.models as models
+
+    assert "PromptManager" in dir(models)
+    assert models.PersonaPrompt is vars(models)["PersonaPrompt"]
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        models.missing
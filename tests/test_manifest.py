@@ -0,0 +1,113 @@
+"""
+Tests for the per-directory listing manifest.
+"""
+
+import json
+import os
+
+from prompt_generator.models.manifest import DirectoryManifest, MANIFEST_NAME
+
+
+def write_prompt(directory, filename, title, mtime_ns=None):
+    path = os.path.join(directory, filename)
+    with open(path, 'w') as f:
+        json.dump({"title": title, "type": "cot", "created_at": "", "updated_at": ""}, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def titles(manifest):
+    return sorted(entry["title"] for entry in manifest.iter_entries())
+
+
+def test_lists_json_files_only(tmp_path):
+    write_prompt(str(tmp_path), "a.json", "A")
+    (tmp_path / "notes.txt").write_text("not a prompt")
+    (tmp_path / "broken.json").write_text("{")
+
+    manifest = DirectoryManifest(str(tmp_path))
+    assert titles(manifest) == ["A"]
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+
+def test_changed_file_is_reparsed(tmp_path):
+    directory = str(tmp_path)
+    write_prompt(directory, "a.json", "A", mtime_ns=1_000_000_000)
+    manifest = DirectoryManifest(directory)
+    assert titles(manifest) == ["A"]
+
+    write_prompt(directory, "a.json", "A renamed", mtime_ns=2_000_000_000)
+    assert titles(manifest) == ["A renamed"]
+
+
+def test_unchanged_file_is_not_reparsed(tmp_path):
+    directory = str(tmp_path)
+    write_prompt(directory, "a.json", "A")
+    DirectoryManifest(directory).refresh()
+
+    manifest = DirectoryManifest(directory)
+    parsed = []
+    original = manifest._parse
+    manifest._parse = lambda filename: parsed.append(filename) or original(filename)
+    assert titles(manifest) == ["A"]
+    assert parsed == []
+
+
+def test_deleted_and_added_files(tmp_path):
+    directory = str(tmp_path)
+    first = write_prompt(directory, "a.json", "A")
+    manifest = DirectoryManifest(directory)
+    assert titles(manifest) == ["A"]
+
+    os.remove(first)
+    write_prompt(directory, "b.json", "B")
+    assert titles(manifest) == ["B"]
+
+    # A fresh manifest read from disk agrees
+    assert titles(DirectoryManifest(directory)) == ["B"]
+
+
+def test_corrupt_or_old_manifest_is_rebuilt(tmp_path):
+    directory = str(tmp_path)
+    write_prompt(directory, "a.json", "A")
+
+    (tmp_path / MANIFEST_NAME).write_text("not json")
+    assert titles(DirectoryManifest(directory)) == ["A"]
+
+    (tmp_path / MANIFEST_NAME).write_text(json.dumps({"version": 0, "entries": {"x.json": {}}}))
+    assert titles(DirectoryManifest(directory)) == ["A"]
+
+
+def test_watched_manifest_skips_the_rescan(tmp_path):
+    directory = str(tmp_path)
+    write_prompt(directory, "a.json", "A")
+    manifest = DirectoryManifest(directory)
+    manifest.refresh()
+    manifest.watched = True
+
+    write_prompt(directory, "b.json", "B")
+    assert titles(manifest) == ["A"]
+
+    manifest.update("b.json")
+    assert titles(manifest) == ["A", "B"]
+
+    os.remove(os.path.join(directory, "a.json"))
+    manifest.update("a.json")
+    assert titles(manifest) == ["B"]
+
+
+def test_record_and_discard(tmp_path):
+    directory = str(tmp_path)
+    manifest = DirectoryManifest(directory)
+    manifest.watched = True
+    manifest.refresh()
+
+    data = {"title": "A", "type": "cot", "created_at": "", "updated_at": ""}
+    with open(os.path.join(directory, "a.json"), 'w') as f:
+        json.dump(data, f)
+    manifest.record("a.json", data)
+    assert titles(manifest) == ["A"]
+
+    manifest.discard("a.json")
+    assert titles(manifest) == []
@@ -0,0 +1,133 @@
+"""
+Tests for sorted pages, cursors and streaming listings.
+"""
+
+import pytest
+
+from prompt_generator.models.manifest import DirectoryManifest
+from prompt_generator.models.pagination import page_cursor, select_page
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.models.prompt_manager import PromptManager
+
+
+def entries(count):
+    # Several entries share each sort value so the filename breaks ties
+    return [
+        {"filename": f"p{i:03d}.json", "title": f"T{i % 7}", "updated_at": f"2024-01-{i % 5 + 1:02d}"}
+        for i in range(count)
+    ]
+
+
+def full_order(items, sort_key, reverse):
+    return sorted(items, key=lambda entry: (entry[sort_key], entry["filename"]), reverse=reverse)
+
+
+@pytest.mark.parametrize("sort_key", ["title", "updated_at", "filename"])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_cursor_pages_cover_everything_once(sort_key, reverse):
+    items = entries(53)
+    pages = []
+    cursor = None
+    while True:
+        page = select_page(items, sort_key, reverse, after_key=cursor, limit=10)
+        pages.extend(page)
+        if len(page) < 10:
+            break
+        cursor = page_cursor(page[-1], sort_key)
+
+    assert pages == full_order(items, sort_key, reverse)
+
+
+def test_offset_and_limit():
+    items = entries(20)
+    expected = full_order(items, "title", False)
+    assert select_page(items, "title", False, offset=5, limit=4) == expected[5:9]
+    assert select_page(items, "title", False, offset=18) == expected[18:]
+
+
+def test_unknown_sort_key():
+    with pytest.raises(ValueError):
+        select_page(entries(3), "topic")
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def manager(request, tmp_path):
+    manager = PromptManager(str(tmp_path), storage=request.param)
+    items = []
+    for i in range(45):
+        prompt = ChainOfThoughtPrompt(f"Prompt {i % 9}")
+        prompt.updated_at = f"2024-02-{i % 4 + 1:02d}T00:00:00"
+        items.append((f"prompt_{i:02d}.json", prompt.to_dict()))
+    manager.save_many(items)
+    yield manager
+    manager.close()
+
+
+def test_list_pages_follow_cursors(manager):
+    expected = manager.list_prompts()
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = manager.list_prompts_page(after_key=cursor, page_size=10)
+        pages.extend(page)
+        if cursor is None:
+            break
+
+    assert [entry["filename"] for entry in pages] == [entry["filename"] for entry in expected]
+
+
+@pytest.mark.parametrize("sort_key", ["title", "updated_at"])
+def test_iter_prompts_matches_full_listing(manager, sort_key):
+    expected = manager.storage.query("prompts", None, sort_key, False)
+    streamed = list(manager.iter_prompts(sort_key=sort_key, reverse=False, page_size=7))
+    assert streamed == expected
+    assert len(streamed) == 45
+
+
+def test_iter_prompts_refreshes_the_manifest_once(tmp_path, monkeypatch):
+    manager = PromptManager(str(tmp_path))
+    manager.save_many([
+        (f"p{i}.json", ChainOfThoughtPrompt(f"P{i}").to_dict()) for i in range(30)
+    ])
+
+    refreshes = []
+    original = DirectoryManifest.refresh
+    monkeypatch.setattr(
+        DirectoryManifest, "refresh",
+        lambda self: refreshes.append(self.directory) or original(self)
+    )
+    assert len(list(manager.iter_prompts(page_size=5))) == 30
+    assert len(refreshes) == 1
+
+
+def test_history_pages(manager):
+    for i in range(25):
+        prompt = ChainOfThoughtPrompt(f"History {i}")
+        manager.save_prompt(prompt)
+
+    expected = manager.get_history(limit=100, include_content=False)
+    assert len(expected) == 25
+    assert [entry["id"] for entry in manager.iter_history(page_size=4)] == [
+        entry["id"] for entry in expected
+    ]
+
+
+def test_history_log_cursor_spans_segments(tmp_path):
+    from prompt_generator.models.history_log import HistoryLog
+
+    log = HistoryLog(str(tmp_path), segment_size=4)
+    ids = [log.append({"filename": f"h{i}.json", "updated_at": ""}, {}) for i in range(14)]
+    log.max_entries = 10
+
+    newest = ids[::-1][:10]
+    assert [meta["id"] for meta in log.latest()] == newest
+
+    pages = []
+    before_id = None
+    while True:
+        page = log.latest(3, before_id)
+        pages.extend(meta["id"] for meta in page)
+        if len(page) < 3:
+            break
+        before_id = page[-1]["id"]
+    assert pages == newest
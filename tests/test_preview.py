@@ -0,0 +1,92 @@
+"""
+Tests for incremental updates of the prompt preview.
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt, PersonaPrompt
+from prompt_generator.ui.preview import PreviewWidget
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def preview(app):
+    widget = PreviewWidget()
+    yield widget
+    widget.deleteLater()
+
+
+def shown(preview):
+    return preview.preview_text.toPlainText()
+
+
+def test_changed_parts_are_replaced(preview):
+    prompt = ChainOfThoughtPrompt("Preview")
+    preview.set_preview_parts(prompt.text_parts())
+    assert shown(preview) == prompt.generate_text()
+
+    edits = [
+        ("topic", "Photosynthesis"),
+        ("steps", "1. Light\n2. Water\n3. Sugar"),
+        ("steps", "1. Light"),
+        ("audience", ""),
+        ("topic", "Photo"),
+        ("length", "500 words"),
+    ]
+    for field, value in edits:
+        setattr(prompt, field, value)
+        preview.set_preview_parts(prompt.text_parts())
+        assert shown(preview) == prompt.generate_text()
+
+
+def test_characters_outside_the_bmp(preview):
+    prompt = PersonaPrompt("Emoji")
+    prompt.topic = "Emoji 😀 in 𝔘𝔫𝔦𝔠𝔬𝔡𝔢"
+    preview.set_preview_parts(prompt.text_parts())
+
+    # Earlier parts with surrogate pairs shift the positions of later ones
+    for value in ("🎉", "plain", "🎉🎉🎉 and more 🚀", ""):
+        prompt.role = value
+        prompt.style = value + " style"
+        preview.set_preview_parts(prompt.text_parts())
+        assert shown(preview) == prompt.generate_text()
+
+    prompt.topic = "short"
+    preview.set_preview_parts(prompt.text_parts())
+    assert shown(preview) == prompt.generate_text()
+
+
+def test_carriage_returns_fall_back_to_full_text(preview):
+    prompt = ChainOfThoughtPrompt("Returns")
+    preview.set_preview_parts(prompt.text_parts())
+
+    prompt.steps = "one\r\ntwo"
+    preview.set_preview_parts(prompt.text_parts())
+    assert preview.parts is None
+
+    prompt.steps = "one\ntwo"
+    preview.set_preview_parts(prompt.text_parts())
+    prompt.topic = "after"
+    preview.set_preview_parts(prompt.text_parts())
+    assert shown(preview) == prompt.generate_text()
+
+
+def test_switching_prompt_types(preview):
+    preview.set_preview_parts(ChainOfThoughtPrompt("A").text_parts())
+    prompt = PersonaPrompt("B")
+    prompt.role = "teacher"
+    preview.set_preview_parts(prompt.text_parts())
+    assert shown(preview) == prompt.generate_text()
+
+    preview.set_preview_text("plain")
+    preview.set_preview_parts(prompt.text_parts())
+    assert shown(preview) == prompt.generate_text()
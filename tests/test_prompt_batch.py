@@ -0,0 +1,67 @@
+"""
+Tests for rendering columnar prompt batches.
+"""
+
+import io
+
+import pytest
+
+from prompt_generator.models.prompt import PROMPT_TYPES
+from prompt_generator.models.prompt_batch import PromptBatch, batch_fields
+
+
+def make_prompts(cls, count):
+    prompts = []
+    for index in range(count):
+        prompt = cls(f"Prompt {index}")
+        for field in cls.template_fields:
+            # Leave some fields empty and use characters outside ASCII
+            if (index + len(field)) % 3:
+                setattr(prompt, field, f"{field} {index} ünïcode 😀 {{x}}")
+        prompts.append(prompt)
+    return prompts
+
+
+@pytest.mark.parametrize("prompt_type, cls", sorted(PROMPT_TYPES.items()))
+def test_render_matches_generate_text(prompt_type, cls):
+    prompts = make_prompts(cls, 7)
+    expected = [prompt.generate_text() for prompt in prompts]
+
+    batch = PromptBatch.from_prompts(prompts)
+    assert batch.render() == expected
+    assert batch.render(2, 5) == expected[2:5]
+    assert list(batch.iter_text(chunk_size=3)) == expected
+
+    rows = [prompt.to_dict() for prompt in prompts]
+    assert PromptBatch.from_rows(cls, rows).render() == expected
+
+    f = io.StringIO()
+    assert batch.write(f, separator="\n--\n", chunk_size=2) == 7
+    assert f.getvalue() == "".join(text + "\n--\n" for text in expected)
+
+
+@pytest.mark.parametrize("prompt_type, cls", sorted(PROMPT_TYPES.items()))
+def test_missing_columns_render_empty(prompt_type, cls):
+    batch = PromptBatch(cls, {"title": ["a", "b"]})
+    assert batch.render() == [cls("a").generate_text(), cls("b").generate_text()]
+    assert batch.prompt(1).title == "b"
+
+
+def test_invalid_columns():
+    cls = PROMPT_TYPES["cot"]
+    with pytest.raises(ValueError, match="no field"):
+        PromptBatch(cls, {"role": ["x"]})
+    with pytest.raises(ValueError, match="same length"):
+        PromptBatch(cls, {"topic": ["x"], "title": []})
+    assert "type" not in batch_fields(cls)
+
+
+@pytest.mark.parametrize("prompt_type, cls", sorted(PROMPT_TYPES.items()))
+def test_render_array(prompt_type, cls):
+    np = pytest.importorskip("numpy")
+    prompts = make_prompts(cls, 5)
+    batch = PromptBatch.from_prompts(prompts)
+
+    texts = batch.render_array()
+    assert isinstance(texts, np.ndarray)
+    assert texts.tolist() == [prompt.generate_text() for prompt in prompts]
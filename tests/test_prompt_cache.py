@@ -0,0 +1,101 @@
+"""
+Tests for the parsed prompt cache and its invalidation.
+"""
+
+import json
+import os
+
+import pytest
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.models.prompt_cache import PromptCache
+from prompt_generator.models.prompt_manager import PromptManager
+
+
+def make_prompt(title="Cached", topic="original"):
+    prompt = ChainOfThoughtPrompt(title)
+    prompt.topic = topic
+    return prompt
+
+
+def test_lru_eviction_and_stats():
+    cache = PromptCache(max_entries=2)
+    for name in ("a", "b", "c"):
+        cache.put(("prompts", name), 1, make_prompt(name))
+
+    assert cache.get(("prompts", "a"), 1) is None
+    assert cache.get(("prompts", "c"), 1).title == "c"
+    assert cache.get(("prompts", "c"), 2) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 2, 1, 2)
+
+
+def test_copies_are_independent():
+    cache = PromptCache()
+    prompt = make_prompt()
+    cache.put(("prompts", "p"), 1, prompt)
+    prompt.topic = "changed after put"
+
+    first = cache.get(("prompts", "p"), 1)
+    first.topic = "changed"
+
+    second = cache.get(("prompts", "p"), 1)
+    assert second.topic == "original"
+    assert second is not first
+
+
+def test_disabled_cache():
+    cache = PromptCache(max_entries=0)
+    cache.put(("prompts", "p"), 1, make_prompt())
+    assert cache.get(("prompts", "p"), 1) is None
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def manager(request, tmp_path):
+    manager = PromptManager(str(tmp_path / "library"), storage=request.param)
+    manager.save_prompt(make_prompt())
+    yield manager
+    manager.close()
+
+
+def test_repeated_loads_hit(manager):
+    first = manager.load_prompt("Cached.json")
+    first.topic = "not saved"
+    second = manager.load_prompt("Cached.json")
+
+    assert second.topic == "original"
+    assert manager.cache_stats()["hits"] == 1
+
+
+def test_save_and_delete_invalidate(manager):
+    manager.load_prompt("Cached.json")
+    manager.save_prompt(make_prompt(topic="updated"))
+    assert manager.load_prompt("Cached.json").topic == "updated"
+
+    manager.delete_prompt("Cached.json")
+    assert manager.load_prompt("Cached.json") is None
+
+
+def test_save_many_invalidates(manager):
+    manager.load_prompt("Cached.json")
+    manager.save_many([("Cached.json", make_prompt(topic="bulk").to_dict())])
+    assert manager.load_prompt("Cached.json").topic == "bulk"
+
+
+def test_outside_edit_is_a_miss(tmp_path):
+    manager = PromptManager(str(tmp_path / "library"))
+    try:
+        manager.save_prompt(make_prompt())
+        assert manager.load_prompt("Cached.json").topic == "original"
+
+        path = os.path.join(manager.prompts_dir, "Cached.json")
+        with open(path) as f:
+            data = json.load(f)
+        data["topic"] = "edited outside the application"
+        with open(path, "w") as f:
+            json.dump(data, f)
+
+        assert manager.load_prompt("Cached.json").topic == "edited outside the application"
+    finally:
+        manager.close()
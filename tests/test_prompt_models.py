@@ -0,0 +1,98 @@
+"""
+Tests for the schema-generated prompt models and their lazily parsed timestamps.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from prompt_generator.models.prompt import PROMPT_TYPES, ChainOfThoughtPrompt, PersonaPrompt
+
+
+STORED = {"title": "Stored", "type": "cot", "topic": "t",
+          "created_at": "2024-01-02T03:04:05", "updated_at": "2024-05-06T07:08:09"}
+
+
+def test_round_trip_keeps_valid_strings():
+    prompt = ChainOfThoughtPrompt.from_dict(STORED)
+    data = prompt.to_dict()
+
+    assert data["created_at"] == "2024-01-02T03:04:05"
+    assert data["updated_at"] == "2024-05-06T07:08:09"
+    assert prompt.created_at == datetime(2024, 1, 2, 3, 4, 5)
+    assert prompt.to_dict() == data
+
+
+@pytest.mark.parametrize("value", ["garbage", "", None, 12345])
+def test_unparsable_timestamps_are_replaced(value):
+    before = datetime.now()
+    prompt = ChainOfThoughtPrompt.from_dict(dict(STORED, created_at=value))
+    saved = prompt.to_dict()["created_at"]
+
+    assert before <= datetime.fromisoformat(saved) <= datetime.now()
+    # The replacement is kept, so later saves and reads agree
+    assert prompt.to_dict()["created_at"] == saved
+    assert prompt.created_at.isoformat() == saved
+
+
+def test_assigned_strings_are_checked_when_stored():
+    prompt = ChainOfThoughtPrompt("Assigned")
+    prompt.created_at = "2024-01-02T03:04:05"
+    assert prompt._created_at == "2024-01-02T03:04:05"
+    assert prompt.to_dict()["created_at"] == "2024-01-02T03:04:05"
+
+    prompt.updated_at = "not a timestamp"
+    assert isinstance(prompt._updated_at, datetime)
+    assert prompt.to_dict()["updated_at"] == prompt.updated_at.isoformat()
+
+
+def test_assigned_timestamps():
+    prompt = PersonaPrompt("New")
+    prompt.updated_at = datetime(2030, 1, 1)
+    data = prompt.to_dict()
+
+    assert data["updated_at"] == "2030-01-01T00:00:00"
+    assert isinstance(prompt.created_at, datetime)
+    assert data["type"] == "persona"
+
+
+@pytest.mark.parametrize("prompt_type, cls", sorted(PROMPT_TYPES.items()))
+def test_slot_layout(prompt_type, cls):
+    prompt = cls("Slotted")
+
+    assert not hasattr(prompt, "__dict__")
+    assert cls.field_names[:4] == ("title", "type", "created_at", "updated_at")
+    assert set(cls.__slots__) == set(cls.field_names[4:])
+    assert len(set(cls.field_names)) == len(cls.field_names)
+    with pytest.raises(AttributeError):
+        prompt.not_a_field = "x"
+
+
+@pytest.mark.parametrize("prompt_type, cls", sorted(PROMPT_TYPES.items()))
+def test_generated_round_trip(prompt_type, cls):
+    prompt = cls("Round trip")
+    for index, field in enumerate(cls.field_names[4:]):
+        setattr(prompt, field, f"{field} value {index}")
+
+    data = prompt.to_dict()
+    assert tuple(data) == cls.field_names
+    assert data["type"] == prompt_type
+    assert data["title"] == "Round trip"
+    assert data["created_at"] == data["updated_at"]
+    datetime.fromisoformat(data["created_at"])
+
+    loaded = cls.from_dict(data)
+    assert type(loaded) is cls
+    assert loaded.to_dict() == data
+    assert loaded.generate_text() == prompt.generate_text()
+
+
+@pytest.mark.parametrize("prompt_type, cls", sorted(PROMPT_TYPES.items()))
+def test_unknown_and_missing_keys(prompt_type, cls):
+    loaded = cls.from_dict({"title": "Partial", "type": prompt_type, "unknown": "ignored"})
+    data = loaded.to_dict()
+
+    assert "unknown" not in data
+    assert not hasattr(loaded, "unknown")
+    assert all(data[field] == "" for field in cls.field_names[4:])
+    assert isinstance(loaded.created_at, datetime)
@@ -0,0 +1,118 @@
+"""
+Tests for compiled prompt text templates and their part cache.
+"""
+
+import pytest
+
+from prompt_generator.models.prompt import PROMPT_TYPES
+
+
+# The hand-written text of each prompt type before templates were compiled
+def cot_text(p):
+    return (
+        f"Topic: {p.topic}\n\n"
+        f"For {p.audience}, I need a detailed explanation on {p.topic} that achieves the following learning objective:\n"
+        f"{p.objective}\n\n"
+        f"Please use a Chain-of-Thought approach to break down this topic into the following logical steps:\n"
+        f"{p.steps}\n\n"
+        f"The content should be in {p.format} format and approximately {p.length} in length."
+    )
+
+
+def tot_text(p):
+    return (
+        f"Topic: {p.topic}\n\n"
+        f"For {p.audience}, I need an exploration of {p.topic} that achieves the following learning objective:\n"
+        f"{p.objective}\n\n"
+        f"Please use a Tree-of-Thoughts approach to explore these different solution paths:\n"
+        f"{p.branches}\n\n"
+        f"Evaluate each path using these criteria:\n"
+        f"{p.evaluation}\n\n"
+        f"The content should be in {p.format} format and approximately {p.length} in length."
+    )
+
+
+def active_text(p):
+    return (
+        f"Topic: {p.topic}\n\n"
+        f"For {p.audience}, I need an interactive learning experience on {p.topic} that achieves the following learning objective:\n"
+        f"{p.objective}\n\n"
+        f"Begin with this initial question:\n"
+        f"{p.initial_question}\n\n"
+        f"Then use these follow-up prompts to guide the learning process:\n"
+        f"{p.followups}\n\n"
+        f"The content should be in {p.format} format and approximately {p.length} in length."
+    )
+
+
+def persona_text(p):
+    return (
+        f"Topic: {p.topic}\n\n"
+        f"For {p.audience}, I need content on {p.topic} that achieves the following learning objective:\n"
+        f"{p.objective}\n\n"
+        f"Please respond as if you are a {p.expertise} {p.role} with the following specific knowledge:\n"
+        f"{p.knowledge}\n\n"
+        f"Use a {p.style} communication style.\n\n"
+        f"The content should be in {p.format} format and approximately {p.length} in length."
+    )
+
+
+REFERENCE_TEXT = {"cot": cot_text, "tot": tot_text, "active": active_text, "persona": persona_text}
+
+TYPES = sorted(PROMPT_TYPES)
+
+
+def filled(prompt_type, marker="value"):
+    prompt = PROMPT_TYPES[prompt_type]("Text")
+    for field in prompt.template_fields:
+        setattr(prompt, field, f"{field} {marker} {{braces}} 🙂")
+    return prompt
+
+
+@pytest.mark.parametrize("prompt_type", TYPES)
+def test_matches_hand_written_text(prompt_type):
+    for prompt in (PROMPT_TYPES[prompt_type]("Empty"), filled(prompt_type)):
+        assert prompt.generate_text() == REFERENCE_TEXT[prompt_type](prompt)
+        assert "".join(prompt.text_parts()) == prompt.generate_text()
+        assert "".join(prompt.iter_text()) == prompt.generate_text()
+
+
+@pytest.mark.parametrize("prompt_type", TYPES)
+def test_render_template_matches_objects(prompt_type):
+    prompt = filled(prompt_type)
+    cls = PROMPT_TYPES[prompt_type]
+    values = [getattr(prompt, field) for field in cls.template_fields]
+    assert cls.render_template(*values) == prompt.generate_text()
+
+
+@pytest.mark.parametrize("prompt_type", TYPES)
+def test_assigning_any_field_invalidates_the_text(prompt_type):
+    prompt = filled(prompt_type)
+    for field in prompt.template_fields:
+        before = prompt.generate_text()
+        cached = prompt._text_cache
+        setattr(prompt, field, f"new {field}")
+
+        text = prompt.generate_text()
+        assert text != before
+        assert prompt._text_cache is not cached
+        assert text == REFERENCE_TEXT[prompt_type](prompt)
+        assert "".join(prompt.text_parts()) == text
+
+
+def test_unchanged_parts_are_reused():
+    prompt = filled("cot")
+    first = prompt.text_parts()
+    prompt.steps = "1. one\n2. two"
+    second = prompt.text_parts()
+
+    changed = [index for index, part in enumerate(second) if part is not first[index]]
+    assert [second[index] for index in changed] == ["1. one\n2. two"]
+    assert prompt.text_parts() is second
+
+
+def test_non_string_values_are_formatted():
+    prompt = filled("cot")
+    prompt.length = 500
+    assert prompt.generate_text() == cot_text(prompt)
+    assert "approximately 500 in length" in prompt.generate_text()
@@ -0,0 +1,90 @@
+"""
+Tests for delta-compressed history revisions.
+"""
+
+import pytest
+
+from prompt_generator.models.content_store import content_digest, strip_timestamps
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.models.revision_store import (
+    DELTA_KEY, apply_delta, diff_lines, make_delta, patch_lines
+)
+from prompt_generator.models.storage import JSONFileStorage, SQLiteStorage
+
+
+@pytest.mark.parametrize("base, text", [
+    ("a\nb\nc\n", "a\nb\nc\n"),
+    ("a\nb\nc\n", "a\nx\nc\n"),
+    ("a\nb\nc", "a\nb\nc\nd"),
+    ("", "new\ntext"),
+    ("old\ntext\n", ""),
+    ("no newline", "no newline at all"),
+])
+def test_line_diff_round_trip(base, text):
+    assert patch_lines(base, diff_lines(base, text)) == text
+
+
+def test_delta_round_trip():
+    base = {"title": "A", "topic": "x\ny\n", "steps": "1\n2\n3\n", "old": "gone", "count": 1}
+    content = {"title": "A", "topic": "x\nz\n", "steps": "1\n2\n3\n4\n", "count": 2}
+    delta = make_delta(base, content)
+
+    assert "title" not in delta["changes"]
+    assert delta["removed"] == ["old"]
+    assert apply_delta(base, delta) == content
+
+
+def revisions(count):
+    steps = [f"step {n}: " + "detail " * 10 for n in range(40)]
+    for i in range(count):
+        steps[i % len(steps)] = f"step {i % len(steps)} revised {i}"
+        prompt = ChainOfThoughtPrompt("Long prompt")
+        prompt.steps = "\n".join(steps)
+        data = prompt.to_dict()
+        data["updated_at"] = f"2024-01-01T00:00:{i:02d}"
+        yield data
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        backend = JSONFileStorage(str(tmp_path))
+    else:
+        backend = SQLiteStorage(str(tmp_path / "library.sqlite3"))
+    backend.keyframe_interval = 4
+    yield backend
+    backend.close()
+
+
+def test_revisions_rebuild_past_keyframes(storage):
+    saved = list(revisions(11))
+    for i, data in enumerate(saved):
+        storage.add_history(f"cot_{i}.json", data)
+
+    entries = list(storage.iter_history_entries())
+    assert len(entries) == len(saved)
+    for entry, data in zip(entries, reversed(saved)):
+        assert storage.load_history(entry["id"]) == data
+
+    # Every fourth revision is a full copy, the rest are short deltas
+    kinds = []
+    for data in saved:
+        blob = storage.get_blob(content_digest(data))
+        kinds.append(blob[DELTA_KEY]["depth"] if DELTA_KEY in blob else 0)
+    assert kinds == [0, 1, 2, 3, 0, 1, 2, 3, 0, 1, 2]
+
+
+def test_rebuild_without_the_revision_cache(storage):
+    saved = list(revisions(6))
+    for i, data in enumerate(saved):
+        storage.add_history(f"cot_{i}.json", data)
+
+    # A fresh process has no cached bases and rebuilds them from storage
+    storage._revision_cache = None
+    more = list(revisions(9))[6:]
+    for i, data in enumerate(more, 6):
+        storage.add_history(f"cot_{i}.json", data)
+
+    for data in saved + more:
+        assert storage.load_revision(content_digest(data)) == strip_timestamps(data)
+
@@ -0,0 +1,165 @@
+"""
+Tests for the full-text search index and its query language.
+"""
+
+import pytest
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt, PersonaPrompt
+from prompt_generator.models.prompt_manager import PromptManager
+from prompt_generator.models.search_index import SearchIndex, tokenize
+
+
+DOCS = {
+    "py_intro.json": {"type": "cot", "title": "Python intro", "topic": "python basics",
+                      "audience": "beginners", "updated_at": "1"},
+    "py_loops.json": {"type": "cot", "title": "Loops draft", "topic": "python loops",
+                      "audience": "students", "updated_at": "1"},
+    "ruby.json": {"type": "tot", "title": "Ruby", "topic": "ruby blocks",
+                  "audience": "managers", "updated_at": "1"},
+    "mentor.json": {"type": "persona", "title": "Mentor", "topic": "leadership",
+                    "audience": "python managers", "updated_at": "1"},
+}
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    for filename, data in DOCS.items():
+        index.add(filename, data)
+    return index
+
+
+def found(index, query, prompt_type=None):
+    return sorted(entry["filename"] for entry in index.search(query, prompt_type))
+
+
+def test_tokenize():
+    assert tokenize("Hello, World! foo_bar 42") == ["hello", "world", "foo_bar", "42"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("python", ["mentor.json", "py_intro.json", "py_loops.json"]),
+    ("python loops", ["py_loops.json"]),
+    ("python AND loops", ["py_loops.json"]),
+    ("ruby OR leadership", ["mentor.json", "ruby.json"]),
+    ("python -draft", ["mentor.json", "py_intro.json"]),
+    ("python NOT draft", ["mentor.json", "py_intro.json"]),
+    ("NOT python", ["ruby.json"]),
+    ("topic:python", ["py_intro.json", "py_loops.json"]),
+    ("audience:python", ["mentor.json"]),
+    ("TOPIC:Python", ["py_intro.json", "py_loops.json"]),
+    ("lead*", ["mentor.json"]),
+    ("topic:py*", ["py_intro.json", "py_loops.json"]),
+    ("(ruby OR loops) managers", ["ruby.json"]),
+    ("managers (ruby OR leadership) -blocks", ["mentor.json"]),
+    ("haskell", []),
+    ("", []),
+])
+def test_query_semantics(index, query, expected):
+    assert found(index, query) == expected
+
+
+def test_timestamps_are_not_indexed(index):
+    assert found(index, "1") == []
+
+
+def test_type_filter(index):
+    assert found(index, "python", "cot") == ["py_intro.json", "py_loops.json"]
+
+
+def test_add_replaces_and_remove_hides(index):
+    index.add("ruby.json", dict(DOCS["ruby.json"], topic="python gems"))
+    assert "ruby.json" in found(index, "python")
+    assert found(index, "blocks") == []
+
+    assert index.remove("ruby.json")
+    assert not index.remove("ruby.json")
+    assert "ruby.json" not in found(index, "python")
+    assert len(index) == 3
+
+
+def test_save_and_load_round_trip(tmp_path, index):
+    index.path = str(tmp_path / "index.json")
+    index._dirty = True
+    index.remove("py_loops.json")
+    index.save()
+
+    loaded = SearchIndex(index.path)
+    assert len(loaded) == 3
+    assert found(loaded, "python") == ["mentor.json", "py_intro.json"]
+    assert found(loaded, "topic:py*") == ["py_intro.json"]
+
+
+def test_compaction_keeps_results(tmp_path):
+    index = SearchIndex(str(tmp_path / "index.json"))
+    for i in range(300):
+        index.add(f"p{i}.json", {"type": "cot", "topic": f"topic{i} shared", "updated_at": "1"})
+    for i in range(250):
+        index.remove(f"p{i}.json")
+    index.save()
+
+    assert len(index.docs) == 50
+    assert found(SearchIndex(index.path), "shared") == sorted(f"p{i}.json" for i in range(250, 300))
+
+
+def test_sync_with_library(index):
+    entries = [
+        {"filename": "py_intro.json", "updated_at": "1"},
+        {"filename": "ruby.json", "updated_at": "2"},
+        {"filename": "new.json", "updated_at": "1"},
+    ]
+    library = {
+        "ruby.json": dict(DOCS["ruby.json"], topic="crystal", updated_at="2"),
+        "new.json": {"type": "cot", "topic": "golang", "updated_at": "1"},
+    }
+
+    # ruby.json and new.json are (re)indexed, py_loops and mentor are dropped
+    assert index.sync(entries, library.get) == 4
+    assert found(index, "crystal") == ["ruby.json"]
+    assert found(index, "golang") == ["new.json"]
+    assert found(index, "python") == ["py_intro.json"]
+
+
+def test_sorted_top_k(index):
+    index.add("later.json", {"type": "cot", "title": "Later", "topic": "python", "updated_at": "3"})
+    index.add("middle.json", {"type": "cot", "title": "Middle", "topic": "python", "updated_at": "2"})
+
+    newest = [entry["filename"] for entry in index.search("python", sort_key="updated_at")]
+    assert newest == ["later.json", "middle.json", "py_loops.json", "py_intro.json", "mentor.json"]
+    oldest = [entry["filename"] for entry in index.search("python", sort_key="updated_at", reverse=False)]
+    assert oldest == newest[::-1]
+
+    top = index.search("python", sort_key="updated_at", limit=2)
+    assert [entry["filename"] for entry in top] == newest[:2]
+    top[0]["title"] = "changed"
+    assert index.entry("later.json")["title"] == "Later"
+
+    assert [entry["title"] for entry in index.search("python", "cot", "title", False, 1)] == ["Later"]
+    assert len(index.search("python", limit=3)) == 3
+    with pytest.raises(ValueError):
+        index.search("python", sort_key="topic")
+
+
+def test_prompt_manager_search(tmp_path):
+    manager = PromptManager(str(tmp_path))
+    first = ChainOfThoughtPrompt("Python basics")
+    first.topic = "python"
+    manager.save_prompt(first)
+    second = PersonaPrompt("Coach")
+    second.topic = "python"
+    second.role = "coach"
+    manager.save_prompt(second)
+
+    assert {entry["title"] for entry in manager.search("python")} == {"Python basics", "Coach"}
+    assert [entry["title"] for entry in manager.search("python", "persona")] == ["Coach"]
+
+    # Prompts saved after the index is built are found too
+    third = ChainOfThoughtPrompt("Later")
+    third.topic = "python"
+    manager.save_prompt(third)
+    assert len(manager.search("topic:python")) == 3
+    manager.close()
+
+    reopened = PromptManager(str(tmp_path))
+    assert len(reopened.search("topic:python", limit=2)) == 2
+    reopened.close()
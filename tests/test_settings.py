@@ -0,0 +1,169 @@
+"""
+Tests for in-memory settings with write-behind to the store.
+"""
+
+import json
+import time
+
+import pytest
+
+from prompt_generator.utils import settings as settings_module
+from prompt_generator.utils.settings import (
+    JSONSettingsStore, Settings, get_settings, init_settings
+)
+
+
+class CountingStore(JSONSettingsStore):
+    """JSON store that counts the values written and the syncs."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.written = []
+        self.syncs = 0
+
+    def setValue(self, key, value):
+        self.written.append(key)
+        super().setValue(key, value)
+
+    def sync(self):
+        self.syncs += 1
+        super().sync()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CountingStore(str(tmp_path / "settings.json"))
+
+
+@pytest.fixture
+def settings(store, monkeypatch):
+    # Only explicit flushes write, unless a test shortens the delay
+    monkeypatch.setattr(Settings, "flush_delay", 3600)
+    settings = Settings(store)
+    store.written.clear()
+    store.syncs = 0
+    yield settings
+    settings.close()
+
+
+def stored(store):
+    with open(store.path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_defaults_are_written_once(store, monkeypatch):
+    monkeypatch.setattr(Settings, "flush_delay", 3600)
+    settings = Settings(store)
+    assert store.syncs == 1
+    assert sorted(store.written) == sorted(settings.default_settings)
+    assert settings._timer is None
+    settings.close()
+
+
+def test_coalesced_writes(settings, store):
+    for size in range(11, 21):
+        settings.set("font_size", size)
+    settings.set("theme", "dark")
+    settings.set("theme", "dark")
+
+    assert settings.get("font_size") == 20
+    assert store.syncs == 0
+    assert settings._timer is not None
+
+    settings.flush()
+    assert store.syncs == 1
+    assert sorted(store.written) == ["font_size", "theme"]
+    assert stored(store)["font_size"] == 20
+    assert settings._timer is None
+
+    settings.flush()
+    assert store.syncs == 1
+
+
+def test_timer_flushes(settings, store):
+    settings.flush_delay = 0.01
+    settings.set("sidebar_width", 300)
+    settings.set("auto_save", False)
+
+    deadline = time.monotonic() + 5
+    while store.syncs == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.syncs == 1
+    assert stored(store)["sidebar_width"] == 300
+    assert stored(store)["auto_save"] is False
+
+
+def test_unchanged_values_are_not_written(settings, store):
+    settings.set("theme", settings.get("theme"))
+    assert settings._timer is None
+    assert settings.set("not_a_setting", 1) is False
+    settings.flush()
+    assert store.syncs == 0
+
+
+def test_subscribers(settings):
+    changes = []
+    themes = []
+
+    def record(key, value):
+        changes.append((key, value))
+
+    settings.subscribe(record)
+    settings.subscribe(lambda key, value: themes.append(value), key="theme")
+
+    settings.set("theme", "dark")
+    settings.set("font_size", 14)
+    settings.set("font_size", 14)
+
+    assert changes == [("theme", "dark"), ("font_size", 14)]
+    assert themes == ["dark"]
+
+    def failing(key, value):
+        raise RuntimeError("subscriber failed")
+
+    settings.subscribe(failing)
+    settings.unsubscribe(record)
+    assert settings.set("theme", "light")
+    assert themes == ["dark", "light"]
+    assert len(changes) == 2
+
+
+def test_values_are_copied(settings):
+    formats = settings.get("export_formats")
+    formats.append("pdf")
+    assert "pdf" not in settings.get("export_formats")
+
+
+def test_close_flushes_and_cancels_the_timer(settings, store, monkeypatch):
+    settings.set("theme", "dark")
+    timer = settings._timer
+    assert timer.is_alive()
+
+    unregistered = []
+    monkeypatch.setattr(settings_module.atexit, "unregister", unregistered.append)
+    settings.close()
+
+    assert settings._timer is None
+    assert timer.finished.is_set()
+    timer.join(5)
+    assert not timer.is_alive()
+    assert store.syncs == 1
+    assert stored(store)["theme"] == "dark"
+    assert unregistered == [settings.flush]
+
+
+def test_init_settings_replaces_the_singleton(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "flush_delay", 3600)
+    first_store = CountingStore(str(tmp_path / "first.json"))
+    first = init_settings(first_store)
+    assert get_settings() is first
+
+    first.set("theme", "dark")
+    second = init_settings(JSONSettingsStore(str(tmp_path / "second.json")))
+
+    assert get_settings() is second
+    assert second is not first
+    # The replaced instance's pending change was written, and its timer stopped
+    assert stored(first_store)["theme"] == "dark"
+    assert first._timer is None
+    assert second.get("theme") == "light"
@@ -0,0 +1,127 @@
+"""
+Tests for the JSON and SQLite storage backends.
+"""
+
+import pytest
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt, PersonaPrompt
+from prompt_generator.models.prompt_manager import PromptManager
+from prompt_generator.models.storage import (
+    JSONFileStorage, SQLiteStorage, PROMPTS, TEMPLATES, migrate_json_to_sqlite
+)
+
+
+def make_prompt(title, topic="python"):
+    prompt = ChainOfThoughtPrompt(title)
+    prompt.topic = topic
+    prompt.audience = "developers"
+    return prompt
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    if request.param == "json":
+        backend = JSONFileStorage(str(tmp_path))
+    else:
+        backend = SQLiteStorage(str(tmp_path / "library.sqlite3"))
+    yield backend
+    backend.close()
+
+
+def test_save_load_round_trip(storage):
+    data = make_prompt("Intro").to_dict()
+    storage.save(PROMPTS, "Intro.json", data)
+
+    assert storage.load(PROMPTS, "Intro.json") == data
+    assert storage.load(TEMPLATES, "Intro.json") is None
+    assert storage.load(PROMPTS, "Missing.json") is None
+
+
+def test_save_many_and_iter_items(storage):
+    items = [(f"P{i}.json", make_prompt(f"P{i}").to_dict()) for i in range(5)]
+    storage.save_many(PROMPTS, items)
+
+    assert sorted(storage.iter_items(PROMPTS)) == sorted(items)
+    assert list(storage.iter_items(TEMPLATES)) == []
+
+
+def test_delete(storage):
+    storage.save(PROMPTS, "Intro.json", make_prompt("Intro").to_dict())
+
+    assert storage.delete(PROMPTS, "Intro.json")
+    assert not storage.delete(PROMPTS, "Intro.json")
+    assert storage.load(PROMPTS, "Intro.json") is None
+
+
+def test_entries_filter_by_type(storage):
+    storage.save(PROMPTS, "A.json", make_prompt("A").to_dict())
+    storage.save(PROMPTS, "B.json", PersonaPrompt("B").to_dict())
+
+    entries = list(storage.iter_entries(PROMPTS, "persona"))
+    assert [entry["filename"] for entry in entries] == ["B.json"]
+    assert entries[0]["title"] == "B"
+
+
+def test_history_round_trip(storage):
+    first = make_prompt("Intro", "one").to_dict()
+    second = make_prompt("Intro", "two").to_dict()
+    assert storage.add_history("cot_1.json", first)
+    assert storage.add_history("cot_2.json", second)
+
+    entries = list(storage.iter_history_entries())
+    assert [entry["filename"] for entry in entries] == ["cot_2.json", "cot_1.json"]
+    assert storage.load_history(entries[0]["id"]) == second
+    assert storage.load_history(entries[1]["id"]) == first
+
+
+def test_sqlite_reopen_keeps_data(tmp_path):
+    path = str(tmp_path / "library.sqlite3")
+    storage = SQLiteStorage(path)
+    data = make_prompt("Intro").to_dict()
+    storage.save(PROMPTS, "Intro.json", data)
+    storage.close()
+
+    storage = SQLiteStorage(path)
+    assert storage.load(PROMPTS, "Intro.json") == data
+    storage.close()
+
+
+def test_migrate_json_to_sqlite_runs_once(tmp_path):
+    source = JSONFileStorage(str(tmp_path))
+    prompt = make_prompt("Intro")
+    source.save(PROMPTS, "Intro.json", prompt.to_dict())
+    source.save(TEMPLATES, "Base.json", make_prompt("Base").to_dict())
+    source.add_history("cot_1.json", prompt.to_dict())
+
+    target = SQLiteStorage(str(tmp_path / "library.sqlite3"))
+    assert migrate_json_to_sqlite(source, target) == 3
+    assert target.load(PROMPTS, "Intro.json") == prompt.to_dict()
+    assert target.load(TEMPLATES, "Base.json") is not None
+    assert [entry["filename"] for entry in target.iter_history_entries()] == ["cot_1.json"]
+
+    # A second run must not copy anything again
+    source.save(PROMPTS, "Later.json", make_prompt("Later").to_dict())
+    assert migrate_json_to_sqlite(source, target) == 0
+    assert target.load(PROMPTS, "Later.json") is None
+    target.close()
+
+
+def test_prompt_manager_sqlite_backend(tmp_path):
+    manager = PromptManager(str(tmp_path), storage="json")
+    manager.save_prompt(make_prompt("Existing"))
+    manager.close()
+
+    manager = PromptManager(str(tmp_path), storage="sqlite")
+    assert [entry["title"] for entry in manager.list_prompts()] == ["Existing"]
+
+    manager.save_prompt(make_prompt("New"))
+    loaded = manager.load_prompt("New.json")
+    assert isinstance(loaded, ChainOfThoughtPrompt)
+    assert loaded.topic == "python"
+    assert len(manager.get_history()) == 2
+    manager.close()
+
+
+def test_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        PromptManager(str(tmp_path), storage="csv")
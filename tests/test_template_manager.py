@@ -0,0 +1,122 @@
+"""
+Tests for the lazily loaded template library.
+"""
+
+import json
+
+import pytest
+
+from prompt_generator.models.manifest import DirectoryManifest
+from prompt_generator.utils.template_manager import TemplateManager
+
+
+def write_template(directory, template_id, **fields):
+    data = dict({"id": template_id, "title": template_id.title(), "type": "cot"}, **fields)
+    with open(directory / f"{template_id}.json", "w") as f:
+        json.dump(data, f)
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    for index in range(5):
+        write_template(directory, f"t{index}", topic=f"topic {index}")
+    return directory
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Record the template bodies read from disk."""
+    read = []
+    original = TemplateManager._read_template
+
+    def record(self, template_id, token):
+        read.append(template_id)
+        return original(self, template_id, token)
+
+    monkeypatch.setattr(TemplateManager, "_read_template", record)
+    return read
+
+
+def test_listing_reads_only_the_manifest(templates_dir, reads, monkeypatch):
+    TemplateManager(str(templates_dir))
+
+    # A second start finds every file in the manifest and parses none of them
+    parsed = []
+    monkeypatch.setattr(DirectoryManifest, "_parse", lambda self, name: parsed.append(name))
+    manager = TemplateManager(str(templates_dir))
+
+    listing = manager.list_templates()
+    assert sorted(entry["id"] for entry in listing) == ["t0", "t1", "t2", "t3", "t4"]
+    assert {entry["title"] for entry in listing} == {"T0", "T1", "T2", "T3", "T4"}
+
+    templates = manager.get_all_templates()
+    assert len(templates) == 5
+    assert "t3" in templates and "missing" not in templates
+    assert sorted(templates) == ["t0", "t1", "t2", "t3", "t4"]
+
+    assert parsed == []
+    assert reads == []
+    assert len(manager.loaded) == 0
+
+    assert templates["t3"]["topic"] == "topic 3"
+    assert reads == ["t3"]
+    with pytest.raises(KeyError):
+        templates["missing"]
+
+
+def test_lru_evicts_at_capacity(templates_dir, reads):
+    manager = TemplateManager(str(templates_dir))
+    manager.max_loaded = 3
+
+    for template_id in ("t0", "t1", "t2"):
+        manager.get_template(template_id)
+    manager.get_template("t0")              # t1 is now least recently used
+    manager.get_template("t3")
+
+    assert list(manager.loaded) == ["t2", "t0", "t3"]
+    assert reads == ["t0", "t1", "t2", "t3"]
+
+    manager.get_template("t0")
+    manager.get_template("t1")
+    assert reads == ["t0", "t1", "t2", "t3", "t1"]
+    assert len(manager.loaded) == 3
+
+
+def test_preload_warms_the_cache(templates_dir, reads):
+    manager = TemplateManager(str(templates_dir))
+    templates = manager.preload(["t1", "t2", "missing"])
+
+    assert sorted(templates) == ["t1", "t2"]
+    assert list(manager.loaded) == ["t1", "t2"]
+
+    assert manager.get_template("t1") is templates["t1"]
+    assert reads == ["t1", "t2"]
+    assert len(manager.preload()) == 5
+
+
+def test_change_on_disk_invalidates(templates_dir, reads):
+    manager = TemplateManager(str(templates_dir))
+    assert manager.get_template("t0")["topic"] == "topic 0"
+
+    write_template(templates_dir, "t0", topic="edited outside the application")
+    assert manager.get_template("t0")["topic"] == "edited outside the application"
+    assert manager.get_template("t0")["topic"] == "edited outside the application"
+    assert reads == ["t0", "t0"]
+
+    (templates_dir / "t0.json").unlink()
+    assert manager.get_template("t0") is None
+    assert "t0" not in manager.loaded
+
+
+def test_saved_templates_are_cached(templates_dir, reads):
+    manager = TemplateManager(str(templates_dir))
+    template_id = manager.save_template({"id": "new", "title": "New", "type": "persona"})
+
+    assert manager.get_template(template_id)["title"] == "New"
+    assert manager.update_template("new", {"title": "Renamed", "type": "persona"})
+    assert manager.get_template("new")["title"] == "Renamed"
+    assert manager.delete_template("new")
+    assert manager.get_template("new") is None
+    assert reads == []
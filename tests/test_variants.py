@@ -0,0 +1,118 @@
+"""
+Tests for generating every combination of alternative field values.
+"""
+
+import itertools
+import json
+
+import pytest
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt, PersonaPrompt
+from prompt_generator.models.variants import VariantGenerator
+
+
+VALUES = {
+    "length": ["short", "long"],
+    "topic": ["Rivers", "Tides", "Clouds"],
+    "audience": ["children", "adults"],
+}
+
+
+def base_prompt():
+    prompt = ChainOfThoughtPrompt("Base")
+    prompt.objective = "understand"
+    prompt.format = "essay"
+    return prompt
+
+
+def product_texts(base, values):
+    """Render every combination the slow way, in itertools.product order."""
+    # Fields vary in template order, whatever order they were given in
+    fields = [field for field in type(base).template_fields if field in values]
+    texts = []
+    for combination in itertools.product(*(values[field] for field in fields)):
+        prompt = ChainOfThoughtPrompt.from_dict(base.to_dict())
+        for field, value in zip(fields, combination):
+            setattr(prompt, field, value)
+        texts.append(prompt.generate_text())
+    return texts
+
+
+@pytest.fixture
+def generator():
+    return VariantGenerator(base_prompt(), VALUES)
+
+
+def test_matches_product_order(generator):
+    expected = product_texts(base_prompt(), VALUES)
+    assert len(generator) == 12
+    assert [text for _, text in generator.generate()] == expected
+    assert [generator[index] for index in range(len(generator))] == expected
+    assert [generator.prompt(index).generate_text() for index in range(12)] == expected
+
+
+def test_combinations_are_mixed_radix(generator):
+    fields = [f for f in ChainOfThoughtPrompt.template_fields if f in VALUES]
+    combinations = list(itertools.product(*(VALUES[field] for field in fields)))
+    for index, combination in enumerate(combinations):
+        assert generator.combination(index) == dict(zip(fields, combination))
+
+
+def test_negative_and_out_of_range_indices(generator):
+    assert generator[-1] == generator[11]
+    assert generator[-12] == generator[0]
+    for index in (12, -13, 1000):
+        with pytest.raises(IndexError):
+            generator[index]
+    for index in (12, -1):
+        with pytest.raises(IndexError):
+            generator.render(index)
+        with pytest.raises(IndexError):
+            generator.combination(index)
+    with pytest.raises(TypeError):
+        generator["0"]
+
+
+def test_slicing(generator):
+    texts = [generator[index] for index in range(12)]
+    for key in (slice(None), slice(2, 7), slice(None, None, 5), slice(-3, None),
+                slice(None, None, -1), slice(10, 100), slice(5, 2)):
+        assert generator[key] == texts[key]
+
+
+def test_repeated_values_are_dropped():
+    generator = VariantGenerator(PersonaPrompt, {"role": ["a", "b", "a"]})
+    assert len(generator) == 2
+    assert [generator.combination(i)["role"] for i in range(2)] == ["a", "b"]
+
+
+def test_empty_axes():
+    # Varying nothing leaves the single empty combination, as in product()
+    generator = VariantGenerator(base_prompt(), {})
+    assert len(generator) == 1 == len(list(itertools.product()))
+    assert generator[0] == base_prompt().generate_text()
+    assert generator.combination(0) == {}
+
+    with pytest.raises(ValueError, match="no values given"):
+        VariantGenerator(base_prompt(), {"topic": []})
+    with pytest.raises(ValueError, match="cannot vary"):
+        VariantGenerator(base_prompt(), {"title": ["x"]})
+
+
+def test_sample_and_write(generator, tmp_path):
+    indices = generator.indices(sample=5, seed=1)
+    assert indices == generator.indices(sample=5, seed=1)
+    assert len(set(indices)) == 5 and indices == sorted(indices)
+    assert generator.indices(sample=50) == range(12)
+
+    path = tmp_path / "variants.jsonl"
+    assert generator.write(str(path), output_format="jsonl", sample=5, seed=1) == 5
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["variant"] for record in records] == list(indices)
+    assert all(record["text"] == generator[record["variant"]] for record in records)
+
+
+def test_workers_keep_order(generator):
+    generator.workers = 2
+    generator.chunk_size = 5
+    assert [text for _, text in generator.generate()] == generator[:]
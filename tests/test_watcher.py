@@ -0,0 +1,128 @@
+"""
+Tests for watching the library for changes made outside the application.
+"""
+
+import json
+import os
+
+import pytest
+
+from prompt_generator.models.prompt import ChainOfThoughtPrompt
+from prompt_generator.models.prompt_manager import PromptManager
+from prompt_generator.models.watcher import (
+    ADDED, DELETED, MODIFIED, ChangeEvent, DirectoryScanner, PollingWatcher
+)
+
+
+def prompt_data(title, topic):
+    prompt = ChainOfThoughtPrompt(title)
+    prompt.topic = topic
+    return prompt.to_dict()
+
+
+def write(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def test_scanner_reports_each_kind(tmp_path):
+    write(tmp_path / "keep.json", {"a": 1})
+    write(tmp_path / "change.json", {"a": 1})
+    write(tmp_path / "remove.json", {"a": 1})
+    scanner = DirectoryScanner("prompts", str(tmp_path))
+
+    write(tmp_path / "change.json", {"a": "longer value"})
+    os.remove(tmp_path / "remove.json")
+    write(tmp_path / "new.json", {})
+    write(tmp_path / ".hidden.json", {})
+    write(tmp_path / "notes.txt", {})
+
+    assert sorted(scanner.scan()) == sorted([
+        ChangeEvent(MODIFIED, "prompts", "change.json"),
+        ChangeEvent(DELETED, "prompts", "remove.json"),
+        ChangeEvent(ADDED, "prompts", "new.json"),
+    ])
+    assert scanner.scan() == []
+
+
+def test_polling_watcher_queues_and_notifies(tmp_path):
+    prompts = tmp_path / "prompts"
+    templates = tmp_path / "templates"
+    prompts.mkdir()
+    templates.mkdir()
+    watcher = PollingWatcher({"prompts": str(prompts), "templates": str(templates)})
+    batches = []
+    watcher.subscribe(batches.append)
+
+    write(prompts / "a.json", {})
+    write(templates / "b.json", {})
+    events = watcher.poll()
+
+    assert sorted(events) == [
+        ChangeEvent(ADDED, "prompts", "a.json"),
+        ChangeEvent(ADDED, "templates", "b.json"),
+    ]
+    assert batches == [events]
+    assert watcher.drain() == events
+    assert watcher.drain() == []
+    assert watcher.poll() == []
+    assert len(batches) == 1
+
+
+def test_start_and_stop(tmp_path):
+    watcher = PollingWatcher({"prompts": str(tmp_path)}, interval=0.01)
+    watcher.start()
+    write(tmp_path / "a.json", {})
+    watcher.stop(timeout=5)
+    watcher.poll()
+    assert ChangeEvent(ADDED, "prompts", "a.json") in watcher.drain()
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = PromptManager(str(tmp_path / "library"))
+    first = ChainOfThoughtPrompt("First")
+    first.topic = "gardening"
+    manager.save_prompt(first)
+    manager.load_prompt("First.json")
+    yield manager
+    manager.close()
+
+
+def test_outside_changes_are_applied(manager):
+    watcher = manager.watch(interval=3600)
+    assert isinstance(watcher, PollingWatcher)
+
+    write(os.path.join(manager.prompts_dir, "Second.json"), prompt_data("Second", "astronomy"))
+    write(os.path.join(manager.prompts_dir, "First.json"), prompt_data("First", "woodworking and more"))
+    watcher.poll()
+
+    titles = {entry["title"] for entry in manager.list_prompts()}
+    assert titles == {"First", "Second"}
+    assert manager.load_prompt("First.json").topic == "woodworking and more"
+    assert [entry["filename"] for entry in manager.search("topic:astronomy")] == ["Second.json"]
+    assert manager.search("topic:gardening") == []
+
+    os.remove(os.path.join(manager.prompts_dir, "Second.json"))
+    watcher.poll()
+    assert {entry["title"] for entry in manager.list_prompts()} == {"First"}
+    assert manager.search("topic:astronomy") == []
+
+
+def test_unwatch_goes_back_to_rescanning(manager):
+    watcher = manager.watch(interval=3600)
+    manager.unwatch()
+    assert manager.watcher is None
+    assert watcher._thread is None
+
+    # Without a watcher the listing rescans the directory itself
+    write(os.path.join(manager.prompts_dir, "Later.json"), prompt_data("Later", "x"))
+    assert {entry["title"] for entry in manager.list_prompts()} == {"First", "Later"}
+
+
+def test_sqlite_has_nothing_to_watch(tmp_path):
+    manager = PromptManager(str(tmp_path / "library"), storage="sqlite")
+    try:
+        assert manager.watch() is None
+    finally:
+        manager.close()